@@ -0,0 +1,217 @@
+import os
+import gzip
+import json
+import shutil
+import sqlite3
+import asyncio
+import hashlib
+import logging
+from enum import Enum
+from typing import Optional
+from datetime import datetime
+from dataclasses import dataclass
+
+import aiosqlite
+
+
+class AuraCityBackupStatus(Enum):
+    WRITTEN = "written"
+    UNCHANGED = "unchanged"  # Seit dem letzten Backup nichts geändert, keine Datei geschrieben
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class AuraCityBackupResult:
+    status: AuraCityBackupStatus
+    path: Optional[str] = None  # Nur bei WRITTEN
+    reason: Optional[str] = None  # Nur bei FAILED
+
+
+class AuraCityDatabaseBackupEngine:
+    """Online-Backups der SQLite-Datenbank, die den Bot nicht ausbremsen.
+
+    Die Datenbank wird seitenweise kopiert (zwischen den Schritten kommen Writer zum Zug), in einem
+    Worker-Thread geprüft und gzip-komprimiert. Unveränderte Datenbanken werden übersprungen und alte
+    Backups nach Tages-/Wochen-/Monats-Generationen aufgeräumt.
+    """
+
+    TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+    BACKUP_SUFFIX = ".db.gz"
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, db_path: str, backup_path: str, logger: logging.Logger, pages_per_step: int = 256,
+                 step_sleep: float = 0.005, keep_daily: int = 7, keep_weekly: int = 4, keep_monthly: int = 12) -> None:
+        self.db_path = db_path
+        self.backup_path = backup_path  # Präfix, der Zeitstempel wird angehängt
+        self.backup_dir = os.path.dirname(backup_path) or "."
+        self.backup_prefix = os.path.basename(backup_path)
+        self.manifest_path = os.path.join(self.backup_dir, f"{self.backup_prefix}_manifest.json")
+        self.logger = logger
+        self.pages_per_step = max(1, pages_per_step)
+        self.step_sleep = step_sleep
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+        self.keep_monthly = keep_monthly
+
+        self._source: Optional[aiosqlite.Connection] = None
+        self._last_data_version: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    async def close(self) -> None:
+        if self._source is not None:
+            await self._source.close()
+            self._source = None
+
+    async def _data_version(self) -> int:
+        """PRAGMA data_version ändert sich, sobald eine andere Verbindung etwas committet hat."""
+        if self._source is None:
+            self._source = await aiosqlite.connect(self.db_path)
+        async with self._source.execute("PRAGMA data_version") as cursor:
+            row = await cursor.fetchone()
+        return row[0]
+
+    async def backup(self, force: bool = False) -> AuraCityBackupResult:
+        """Erstellt ein Backup; das Ergebnis unterscheidet geschrieben, unverändert und fehlgeschlagen."""
+        async with self._lock:
+            data_version = await self._data_version()
+            if not force and data_version == self._last_data_version:
+                self.logger.debug("💤 Database unchanged since last backup, skipping")
+                return AuraCityBackupResult(AuraCityBackupStatus.UNCHANGED)
+
+            os.makedirs(self.backup_dir, exist_ok=True)
+            timestamp = datetime.now().strftime(self.TIMESTAMP_FORMAT)
+            snapshot_path = os.path.join(self.backup_dir, f"{self.backup_prefix}_{timestamp}.db.tmp")
+            backup_file = os.path.join(self.backup_dir, f"{self.backup_prefix}_{timestamp}{self.BACKUP_SUFFIX}")
+
+            try:
+                async with aiosqlite.connect(snapshot_path) as target:
+                    await self._source.backup(target, pages=self.pages_per_step, sleep=self.step_sleep)
+
+                integrity = await asyncio.to_thread(self._integrity_check, snapshot_path)
+                if integrity != "ok":
+                    self.logger.error(f"🚨 Backup snapshot failed integrity check: {integrity}")
+                    return AuraCityBackupResult(AuraCityBackupStatus.FAILED, reason=f"integrity check: {integrity}")
+
+                digest = await asyncio.to_thread(self._compress, snapshot_path, backup_file)
+            finally:
+                if os.path.exists(snapshot_path):
+                    os.remove(snapshot_path)
+
+            manifest = self._load_manifest()
+            if not force and manifest.get("last_sha256") == digest:
+                # Inhalt identisch mit dem letzten Backup (z.B. nach einem Neustart ohne Änderungen)
+                os.remove(backup_file)
+                self._last_data_version = data_version
+                self.logger.debug("💤 Database content identical to last backup, skipping")
+                return AuraCityBackupResult(AuraCityBackupStatus.UNCHANGED)
+
+            manifest["last_sha256"] = digest
+            manifest.setdefault("backups", {})[os.path.basename(backup_file)] = {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "sha256": digest,
+                "size": os.path.getsize(backup_file)
+            }
+            self._last_data_version = data_version
+
+            removed = self._apply_retention(manifest)
+            self._save_manifest(manifest)
+            self.logger.debug(f"💾 Database backed up to {backup_file} ({len(removed)} old backups removed)")
+            return AuraCityBackupResult(AuraCityBackupStatus.WRITTEN, path=backup_file)
+
+    @staticmethod
+    def _integrity_check(path: str) -> str:
+        connection = sqlite3.connect(path)
+        try:
+            rows = connection.execute("PRAGMA integrity_check").fetchall()
+        finally:
+            connection.close()
+        return "; ".join(row[0] for row in rows)
+
+    def _compress(self, source_path: str, target_path: str) -> str:
+        """Komprimiert die Datei blockweise und gibt den SHA-256 des unkomprimierten Inhalts zurück."""
+        digest = hashlib.sha256()
+        temp_path = f"{target_path}.tmp"
+        try:
+            # mtime=0, damit identische Inhalte auch identische Archive ergeben
+            with open(source_path, "rb") as source, open(temp_path, "wb") as raw_target, \
+                    gzip.GzipFile(fileobj=raw_target, mode="wb", compresslevel=6, mtime=0) as target:
+                while chunk := source.read(self.CHUNK_SIZE):
+                    digest.update(chunk)
+                    target.write(chunk)
+            os.replace(temp_path, target_path)
+        except BaseException:
+            # Z.B. Platte voll: keine halbe .tmp-Datei liegen lassen, _list_backups räumt sie nicht auf
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return digest.hexdigest()
+
+    def _list_backups(self) -> list[tuple[datetime, str]]:
+        """Alle Backups dieses Präfixes (auch alte unkomprimierte .db), neueste zuerst."""
+        backups = []
+        for filename in os.listdir(self.backup_dir):
+            if not filename.startswith(f"{self.backup_prefix}_"):
+                continue
+            stem = filename[len(self.backup_prefix) + 1:]
+            for suffix in (self.BACKUP_SUFFIX, ".db"):
+                if stem.endswith(suffix):
+                    try:
+                        created = datetime.strptime(stem[:-len(suffix)], self.TIMESTAMP_FORMAT)
+                    except ValueError:
+                        break
+                    backups.append((created, filename))
+                    break
+        return sorted(backups, reverse=True)
+
+    def _apply_retention(self, manifest: dict) -> list[str]:
+        """Behält das neueste Backup je Tag, Woche und Monat innerhalb der Limits, löscht den Rest."""
+        backups = self._list_backups()
+        keep = {filename for _, filename in backups[:1]}
+
+        for limit, bucket_of in (
+            (self.keep_daily, lambda created: created.date()),
+            (self.keep_weekly, lambda created: created.isocalendar()[:2]),
+            (self.keep_monthly, lambda created: (created.year, created.month)),
+        ):
+            seen = set()
+            for created, filename in backups:
+                bucket = bucket_of(created)
+                if bucket in seen:
+                    continue
+                if len(seen) >= limit:
+                    break
+                seen.add(bucket)
+                keep.add(filename)
+
+        removed = []
+        for _, filename in backups:
+            if filename in keep:
+                continue
+            try:
+                os.remove(os.path.join(self.backup_dir, filename))
+                manifest.get("backups", {}).pop(filename, None)
+                removed.append(filename)
+            except OSError as e:
+                self.logger.warning(f"Could not remove old backup {filename}: {e}")
+        return removed
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self, manifest: dict) -> None:
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(temp_path, self.manifest_path)
+
+    @staticmethod
+    def restore(backup_file: str, target_path: str) -> None:
+        """Entpackt ein Backup nach target_path (Bot vorher stoppen)."""
+        with gzip.open(backup_file, "rb") as source, open(target_path, "wb") as target:
+            shutil.copyfileobj(source, target)
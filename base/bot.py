@@ -1,12 +1,21 @@
 import os
 import asyncio
+import functools
 
 import discord
 
 from base.database import AuraCityDatabase
 from base.logger import AuraCityLogger, AuraCityLoggingUtils, CrashReportHandler
 from base.config import AuraCityBotConfig
+from base.services import AuraCityServiceRegistry
 from base.utils.utilities import AuraCityUtils
+from base.utils.http import AuraCityHttpClient
+from base.utils.timeseries import AuraCityPlayerCountSeries
+from base.utils.players import AuraCityPlayerTracker, FiveMPlayerChanges
+from base.utils.counters import AuraCityCounterChannelUpdater
+from base.utils.outbound import AuraCityOutboundScheduler
+from base.utils.raid import AuraCityRaidMode
+from base.utils.channel_content import AuraCityChannelContentReconciler
 
 # Verwende ein Emoji in den Logger-Nachrichten
 logger = AuraCityLogger("AuraCityBot").get_logger()
@@ -15,12 +24,107 @@ class AuraCityBot(discord.Bot):
     PRESENCE_UPDATE_INTERVAL = 120
 
     def __init__(self):
-        self.crash_report_handler = CrashReportHandler()
-        self.config = AuraCityBotConfig()
-        self.utils = AuraCityUtils()
-        self.database = AuraCityDatabase()
-        self.logger_utils = AuraCityLoggingUtils()
+        self.services = self.create_services()
+        self.crash_report_handler = self.services.get("crash_report_handler")
+        self.config = self.services.get("config")
+        self.utils = self.services.get("utils")
+        self.database = self.services.get("database")
+        self.logger_utils = self.services.get("logger_utils")
+        self.services.get("player_tracker").add_listener(self.publish_player_changes)
+        self._background_tasks_started = False
+        self._shutdown_lock = asyncio.Lock()  # close() kann mehrfach laufen (Signal-Handler und main.py)
         super().__init__(intents=discord.Intents.all(), debug_guilds=[int(self.config.GUILD_ID_ACSD), int(self.config.GUILD_ID_AC_LOGS)])
+        self.services.register(
+            "counter_channels",
+            self._create_counter_channels,
+            start=lambda updater: updater.start(),
+            stop=lambda updater: updater.close()
+        )
+        self.services.register(
+            "raid_mode",
+            lambda registry: AuraCityRaidMode(
+                self, registry.get("config"), registry.get("database"), registry.get("outbound"),
+                registry.get("crash_report_handler")
+            ),
+            stop=lambda raid_mode: raid_mode.close()
+        )
+        self.services.register(
+            "channel_content",
+            lambda registry: AuraCityChannelContentReconciler(self, registry.get("config"), registry.get("database"))
+        )
+
+    @staticmethod
+    def create_services() -> AuraCityServiceRegistry:
+        """Registers the shared services; they are started in this order and stopped in reverse."""
+        services = AuraCityServiceRegistry()
+        services.register("config", lambda registry: AuraCityBotConfig())
+        services.register("crash_report_handler", lambda registry: CrashReportHandler())
+        services.register("logger_utils", lambda registry: AuraCityLoggingUtils())
+        services.register(
+            "database",
+            lambda registry: AuraCityDatabase(registry.get("config"), registry.get("crash_report_handler")),
+            start=lambda database: database.create_database(),
+            stop=lambda database: database.close_connection()
+        )
+        services.register(
+            "http",
+            lambda registry: AuraCityHttpClient.from_config(registry.get("config")),
+            start=lambda http: http.open(),
+            stop=lambda http: http.close()
+        )
+        services.register(
+            "outbound",
+            lambda registry: AuraCityOutboundScheduler(
+                registry.get("config").OUTBOUND_WORKERS, registry.get("config").OUTBOUND_QUEUE_SIZE
+            ),
+            start=lambda outbound: outbound.start(),
+            stop=lambda outbound: outbound.close()
+        )
+        services.register(
+            "utils",
+            lambda registry: AuraCityUtils(registry.get("config"), registry.get("http"), registry.get("outbound")),
+            stop=lambda utils: utils.AuraCityUtilities.close()
+        )
+        services.register(
+            "player_series",
+            AuraCityBot._create_player_series,
+            stop=lambda series: series.close()
+        )
+        services.register(
+            "player_tracker",
+            AuraCityBot._create_player_tracker,
+            start=lambda tracker: tracker.restore()
+        )
+        return services
+
+    @staticmethod
+    def _create_player_tracker(registry: AuraCityServiceRegistry) -> AuraCityPlayerTracker:
+        """Creates the join/leave tracker and feeds it the player list of every FiveM server."""
+        servers = registry.get("utils").AuraCityUtilities.servers
+        tracker = AuraCityPlayerTracker(registry.get("database"), servers)
+        for name, monitor in servers.items():
+            monitor.status_snapshot.add_listener(functools.partial(tracker.update, name))
+        return tracker
+
+    def _create_counter_channels(self, registry: AuraCityServiceRegistry) -> AuraCityCounterChannelUpdater:
+        """Creates the LSPD/LSMD counter-channel updater; it recounts whenever a FiveM snapshot changes."""
+        utilities = registry.get("utils").AuraCityUtilities
+        updater = AuraCityCounterChannelUpdater(self, registry.get("config"), utilities)
+        for monitor in utilities.servers.values():
+            monitor.status_snapshot.add_listener(updater.on_status)
+        return updater
+
+    @staticmethod
+    def _create_player_series(registry: AuraCityServiceRegistry) -> AuraCityPlayerCountSeries:
+        """Creates the player-count time series; it records the total of all FiveM servers once per monitor poll."""
+        series = AuraCityPlayerCountSeries(registry.get("config").FIVEM_PLAYER_SERIES_PATH)
+        registry.get("utils").AuraCityUtilities.add_poll_listener(series.record_poll)
+        return series
+
+    async def start(self, token: str, *, reconnect: bool = True) -> None:
+        """Starts all services before connecting to Discord."""
+        await self.services.start_all()
+        await super().start(token, reconnect=reconnect)
 
     def create_coroutine_task(self, *coros) -> None:
         """Creates and schedules coroutine tasks."""
@@ -48,6 +152,14 @@ class AuraCityBot(discord.Bot):
         if is_root:
             logger.info("🎉 All Cogs Loaded Successfully.")
 
+    async def close(self) -> None:
+        """Stops the bot and shuts down all services in reverse start order; safe to call more than once."""
+        async with self._shutdown_lock:
+            try:
+                await super().close()
+            finally:
+                await self.services.stop_all()
+
     async def on_ready(self) -> None:
         logger.info("=" * 50)
         logger.info(f"🤖 Bot Name      : {self.user.name}")
@@ -74,24 +186,36 @@ class AuraCityBot(discord.Bot):
                 logger.info(f" - 🐞 Debug Guild ID: {debug_guild}")
             logger.info("=" * 50)
 
-        logger.info("🔧 Creating presence update task...")
-        self.create_coroutine_task(
-            self.presence(),
-            self.utils.AuraCityUtilities.monitor_server_and_download(),
-            self.database.create_database(),
-            self.database.backup_database(),
-            self.database.schedule_backup(),
-            self.logger_utils.schedule_log_backup()
-        )
-        self.loop.create_task(self.utils.AuraCityUtilities.handle_channel_content(self))
+        # on_ready läuft nach jedem Reconnect erneut, die Hintergrund-Tasks dürfen aber nur einmal laufen
+        if not self._background_tasks_started:
+            self._background_tasks_started = True
+            logger.info("🔧 Creating presence update task...")
+            self.create_coroutine_task(
+                self.presence(),
+                self.utils.AuraCityUtilities.monitor_server_and_download(),
+                self.sync_members(),
+                self.database.backup_database(),
+                self.database.schedule_backup(),
+                self.logger_utils.schedule_log_backup(),
+                self.services.get("channel_content").reconcile()
+            )
 
         logger.info("🚀 All tasks created successfully.")
         logger.info("=" * 50)
 
+    async def publish_player_changes(self, changes: FiveMPlayerChanges) -> None:
+        """Publishes FiveM joins and leaves as the internal event on_fivem_players_changed."""
+        self.dispatch("fivem_players_changed", changes)
+
+    async def sync_members(self) -> None:
+        """Adds members who joined while the bot was offline (the schema is migrated in start())."""
+        for guild in self.guilds:
+            await self.database.sync_guild_members(guild)
+
     async def presence(self) -> None:
         """Updates the bot's presence based on online players."""
         while True:
-            players_online = await self.utils.AuraCityUtilities.players_online()
+            players_online = await self.utils.AuraCityUtilities.players_online(self.config.FIVEM_PRESENCE_SERVER or None)
             await self.change_presence(
                 activity=discord.Activity(
                     type=discord.ActivityType.watching,
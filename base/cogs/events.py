@@ -1,24 +1,24 @@
-import asyncio
-
 import discord
 from discord.ext import commands
 
-from base.config import AuraCityBotConfig
-from base.database import AuraCityDatabase
-from base.logger import CrashReportHandler
-from base.utils.utilities import AuraCityUtils
+from base.utils.outbound import AuraCityPriority
 
 
 class Events(commands.Cog):
     def __init__(self, bot: discord.Bot):
-        self.crash_report_handler = CrashReportHandler()
-        self.database = AuraCityDatabase()
-        self.utils = AuraCityUtils()
-        self.config = AuraCityBotConfig()
+        self.crash_report_handler = bot.services.get("crash_report_handler")
+        self.database = bot.services.get("database")
+        self.utils = bot.services.get("utils")
+        self.config = bot.services.get("config")
+        self.outbound = bot.services.get("outbound")
+        self.raid_mode = bot.services.get("raid_mode")
         self.bot = bot
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
+        if self.raid_mode.handle_join(member):
+            return  # Wird gesammelt im nächsten Raid-Batch verarbeitet
+
         try:
             if member.bot:
                 await self.utils.AuraCityUtilities.ban_bot(member)
@@ -29,29 +29,28 @@ class Events(commands.Cog):
             # Überprüfen, ob der User in der Datenbank ist
             if await self.database.get_user(member.id) is None:
                 await self.database.add_user(member.id, member.discriminator)  # User zur Datenbank hinzufügen
-                self.queue.add_to_queue(welcome_channel.send(f"Willkommen auf dem Server, {member.mention}!"))
-                self.queue.add_to_queue(logs_join_channel.send(f"{member.mention} is joined the server (first time)."))  # Log-Nachricht
+                await self.outbound.send(welcome_channel, f"Willkommen auf dem Server, {member.mention}!", priority=AuraCityPriority.INTERACTION)
+                await self.outbound.send(logs_join_channel, f"{member.mention} is joined the server (first time).", priority=AuraCityPriority.LOG)  # Log-Nachricht
             else:
-                self.queue.add_to_queue(welcome_channel.send(f"Willkommen zurück, {member.mention}!"))  # Rückkehrer begrüßen
-                self.queue.add_to_queue(logs_join_channel.send(f"{member.mention} is joined the server (returning)."))  # Log-Nachricht
+                await self.outbound.send(welcome_channel, f"Willkommen zurück, {member.mention}!", priority=AuraCityPriority.INTERACTION)  # Rückkehrer begrüßen
+                await self.outbound.send(logs_join_channel, f"{member.mention} is joined the server (returning).", priority=AuraCityPriority.LOG)  # Log-Nachricht
 
         except Exception as e:
             error_channel = self.bot.get_channel(self.config.ERROR_LOGS_CHANNEL_ID)
             await self.crash_report_handler.save_error(e)
-            self.queue.add_to_queue(error_channel.send(f"Ein Fehler ist aufgetreten, als {member.mention} dem Server beigetreten ist: {str(e)}"))
+            await self.outbound.send(error_channel, f"Ein Fehler ist aufgetreten, als {member.mention} dem Server beigetreten ist: {str(e)}")
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
         try:
             channel = self.bot.get_channel(self.config.LEAVE_LOGS_CHANNEL_ID)
-            self.queue.add_to_queue(channel.send(f"Has left the server: {member.mention}"))
-            await asyncio.sleep(3)
+            await self.outbound.send(channel, f"Has left the server: {member.mention}", priority=AuraCityPriority.LOG)
 
         except Exception as e:
             error_channel = self.bot.get_channel(self.config.ERROR_LOGS_CHANNEL_ID)
             await self.crash_report_handler.save_error(e)
-            self.queue.add_to_queue(error_channel.send(
-                f"Ein Fehler ist aufgetreten, als {member.mention} den Server verlassen hat: {str(e)}"))
+            await self.outbound.send(error_channel,
+                f"Ein Fehler ist aufgetreten, als {member.mention} den Server verlassen hat: {str(e)}")
 
 
 def setup(bot: discord.Bot):
@@ -0,0 +1,126 @@
+import time
+from typing import Optional
+
+import discord
+from discord.ext import commands
+from discord.commands import slash_command, Option
+
+from base.utils.players import FiveMPlayer, FiveMPlayerChanges
+from base.utils.outbound import AuraCityPriority
+
+# Zeitraum-Auswahl -> (Beginn relativ zu heute 0 Uhr in Tagen, Ende relativ zu heute 0 Uhr in Tagen)
+PERIODS = {
+    "Heute": (0, None),
+    "Gestern": (-1, 0),
+    "Letzte 7 Tage": (-7, None),
+    "Letzte 30 Tage": (-30, None),
+}
+
+
+class FiveM(commands.Cog):
+    EMBED_DESCRIPTION_LIMIT = 4000  # Discord erlaubt 4096 Zeichen
+    EMBEDS_PER_MESSAGE = 10
+
+    def __init__(self, bot: discord.Bot):
+        self.crash_report_handler = bot.services.get("crash_report_handler")
+        self.player_series = bot.services.get("player_series")
+        self.database = bot.services.get("database")
+        self.config = bot.services.get("config")
+        self.outbound = bot.services.get("outbound")
+        self.bot = bot
+
+    @staticmethod
+    def _format_player(prefix: str, player: FiveMPlayer) -> str:
+        mention = f" (<@{player.discord_id}>)" if player.discord_id else ""
+        server_id = f" [ID {player.server_id}]" if player.server_id else ""
+        return f"{prefix} {discord.utils.escape_markdown(player.name)}{server_id}{mention}"
+
+    def _build_change_embeds(self, changes: FiveMPlayerChanges) -> list[discord.Embed]:
+        """Fasst alle Beitritte und Abgänge eines Polls in möglichst wenigen Embeds zusammen."""
+        lines = [self._format_player("🟢", player) for player in changes.joined]
+        lines += [self._format_player("🔴", player) for player in changes.left]
+
+        descriptions, current = [], ""
+        for line in lines:
+            if len(current) + len(line) + 1 > self.EMBED_DESCRIPTION_LIMIT:
+                descriptions.append(current)
+                current = ""
+            current += line + "\n"
+        descriptions.append(current)
+
+        title = f"🎮 {changes.server}: +{len(changes.joined)} / -{len(changes.left)} ({changes.online} online)"
+        return [
+            discord.Embed(title=title if i == 0 else None, description=description, color=discord.Color.blue(),
+                          timestamp=discord.utils.utcnow() if i == len(descriptions) - 1 else None)
+            for i, description in enumerate(descriptions)
+        ]
+
+    @commands.Cog.listener()
+    async def on_fivem_players_changed(self, changes: FiveMPlayerChanges):
+        """Postet die Beitritte und Abgänge eines Polls gesammelt in den Log-Channel (eine Nachricht pro Poll)."""
+        if not self.config.FIVEM_PLAYER_LOGS_CHANNEL_ID:
+            return
+        channel = self.bot.get_channel(self.config.FIVEM_PLAYER_LOGS_CHANNEL_ID)
+        if channel is None:
+            return
+
+        embeds = self._build_change_embeds(changes)
+        for start in range(0, len(embeds), self.EMBEDS_PER_MESSAGE):
+            # Log-Priorität: bei voller Outbound-Queue wird verworfen statt den Listener zu blockieren
+            await self.outbound.send(channel, embeds=embeds[start:start + self.EMBEDS_PER_MESSAGE],
+                                     priority=AuraCityPriority.LOG)
+
+    def _period_bounds(self, period: str) -> tuple[int, int]:
+        now = int(time.time())
+        midnight = now - ((now + self.player_series.utc_offset) % 86400)
+        start_days, end_days = PERIODS[period]
+        end = now + 1 if end_days is None else midnight + end_days * 86400
+        return midnight + start_days * 86400, end
+
+    @slash_command(name="spieler_statistik", description="Zeigt Min/Max/Durchschnitt der Spieleranzahl für einen Zeitraum.")
+    async def player_statistics(self, ctx: discord.ApplicationContext,
+                                zeitraum: Option(str, "Zeitraum", choices=list(PERIODS), default="Heute"),
+                                stunde: Option(int, "Durchschnitt zu dieser Uhrzeit (0-23)", min_value=0, max_value=23,
+                                               required=False, default=None)):
+        start, end = self._period_bounds(zeitraum)
+        stats = self.player_series.stats(start, end)
+        if stats is None:
+            await ctx.respond(f"Für den Zeitraum '{zeitraum}' liegen noch keine Daten vor.", ephemeral=True)
+            return
+
+        embed = discord.Embed(title=f"📊 Spieleranzahl – {zeitraum}", color=discord.Color.blue())
+        embed.add_field(name="Minimum", value=str(stats.min))
+        embed.add_field(name="Maximum", value=str(stats.max))
+        embed.add_field(name="Durchschnitt", value=f"{stats.avg:.1f}")
+        embed.add_field(name="Median (ca.)", value=f"{stats.percentiles.get(50, 0):.1f}")
+        embed.add_field(name="95. Perzentil (ca.)", value=f"{stats.percentiles.get(95, 0):.1f}")
+
+        if stunde is not None:
+            hour_average: Optional[float] = self.player_series.hour_of_day_average(start, end, stunde)
+            value = "Keine Daten" if hour_average is None else f"{hour_average:.1f}"
+            embed.add_field(name=f"Ø um {stunde:02d} Uhr", value=value)
+
+        embed.set_footer(text=f"{stats.samples} Messungen, Auflösung: {stats.resolution}")
+        await ctx.respond(embed=embed)
+
+    @slash_command(name="spielzeit", description="Zeigt die Spielzeit eines Mitglieds auf den FiveM-Servern.")
+    async def playtime(self, ctx: discord.ApplicationContext,
+                       mitglied: Option(discord.Member, "Mitglied"),
+                       zeitraum: Option(str, "Zeitraum", choices=list(PERIODS), default="Letzte 7 Tage")):
+        start, end = self._period_bounds(zeitraum)
+        seconds = await self.database.get_playtime(start, end, discord_id=mitglied.id)
+        hours, minutes = divmod(seconds // 60, 60)
+        await ctx.respond(f"⏱️ {mitglied.mention} hat ({zeitraum}) {hours} Std. {minutes} Min. gespielt.")
+
+    @playtime.error
+    async def on_playtime_error(self, ctx: discord.ApplicationContext, error: discord.DiscordException):
+        await self.crash_report_handler.save_error(error)
+        await ctx.respond("Es ist ein Fehler aufgetreten. Bitte kontaktiere den ")
+
+    @player_statistics.error
+    async def on_player_statistics_error(self, ctx: discord.ApplicationContext, error: discord.DiscordException):
+        await self.crash_report_handler.save_error(error)
+        await ctx.respond("Es ist ein Fehler aufgetreten. Bitte kontaktiere den ")
+
+def setup(bot: discord.Bot):
+    bot.add_cog(FiveM(bot))
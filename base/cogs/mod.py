@@ -1,26 +1,67 @@
+from typing import Optional
+from datetime import datetime, timedelta
+
 import discord
 from discord.ext import commands
-from discord.commands import slash_command, default_permissions
+from discord.commands import slash_command, default_permissions, Option
 
-from base.database import AuraCityDatabase
-from base.logger import CrashReportHandler
+from base.backup import AuraCityBackupStatus
+from base.utils.purge import AuraCityPurgeEngine, AuraCityPurgeFilter, AuraCityPurgeProgress
 
 class Mod(commands.Cog):
     def __init__(self, bot: discord.Bot):
-        self.crash_report_handler = CrashReportHandler()
-        self.database = AuraCityDatabase()
+        self.crash_report_handler = bot.services.get("crash_report_handler")
+        self.database = bot.services.get("database")
         self.bot = bot
 
     @slash_command(name="clear", description="/clear <amount> - Löscht eine bestimmte Anzahl von Nachrichten.")
-    async def clear(self, ctx: discord.ApplicationContext, amount: int):
-        await ctx.channel.purge(limit=amount + 1, check=lambda m: not m.pinned)
-        await ctx.respond(f"Successfully cleared {amount} messages.", delete_after=5)
+    async def clear(self, ctx: discord.ApplicationContext,
+                    amount: Option(int, "Anzahl der zu löschenden Nachrichten", min_value=1),
+                    mitglied: Option(discord.Member, "Nur Nachrichten dieses Mitglieds", required=False, default=None),
+                    enthaelt: Option(str, "Nur Nachrichten, die diesen Text enthalten", required=False, default=None),
+                    nur_anhaenge: Option(bool, "Nur Nachrichten mit Anhängen", required=False, default=False),
+                    von: Option(str, "Ab diesem Tag (TT.MM.JJJJ)", required=False, default=None),
+                    bis: Option(str, "Bis einschließlich diesem Tag (TT.MM.JJJJ)", required=False, default=None)):
+        await ctx.defer(ephemeral=True)  # Große Löschvorgänge dauern länger als die 3 Sekunden bis zum Interaction-Timeout
+        try:
+            after = self._parse_day(von)
+            before = self._parse_day(bis) + timedelta(days=1) if bis else None
+        except ValueError:
+            await ctx.edit(content="Bitte gib Daten im Format TT.MM.JJJJ an.")
+            return
+
+        purge_filter = AuraCityPurgeFilter(
+            user_id=mitglied.id if mitglied else None,
+            contains=enthaelt,
+            attachments_only=nur_anhaenge,
+            after=after,
+            before=before,
+        )
+
+        async def report(progress: AuraCityPurgeProgress) -> None:
+            state = "✅ Fertig" if progress.done else "🧹 Lösche..."
+            failed = f", {progress.failed} fehlgeschlagen" if progress.failed else ""
+            await ctx.edit(content=f"{state} {progress.deleted}/{amount} Nachrichten gelöscht "
+                                   f"({progress.scanned} durchsucht{failed}).")
+
+        await AuraCityPurgeEngine(ctx.channel, amount, purge_filter, on_progress=report).run()
+
+    @staticmethod
+    def _parse_day(value: Optional[str]) -> Optional[datetime]:
+        """TT.MM.JJJJ als lokale Mitternacht; discord.py rechnet naive Zeiten als Ortszeit in Snowflakes um."""
+        return datetime.strptime(value.strip(), "%d.%m.%Y") if value else None
 
     @slash_command(name="backup_database", description="Erstellt ein Backup der Datenbank.")
     @default_permissions(administrator=True)
     async def backup_database(self, ctx: discord.ApplicationContext):
-        await self.database.backup_database()
-        await ctx.respond("Backup created successfully.")
+        await ctx.defer()
+        result = await self.database.backup_database()
+        if result.status is AuraCityBackupStatus.UNCHANGED:
+            await ctx.respond("No changes since the last backup, nothing to do.")
+        elif result.status is AuraCityBackupStatus.FAILED:
+            await ctx.respond(f"Backup failed: {result.reason}")
+        else:
+            await ctx.respond("Backup created successfully.")
 
     @backup_database.error
     async def on_backup_database_error(self, ctx: discord.ApplicationContext, error: discord.DiscordException):
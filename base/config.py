@@ -1,4 +1,6 @@
 import os
+import re
+import json
 
 from dotenv import load_dotenv
 from functools import lru_cache
@@ -116,6 +118,12 @@ class AuraCityBotConfig(AuraCityBotConfigHandler):
     def LEAVE_LOGS_CHANNEL_ID(self) -> int:
         return self._get_channel_id("LEAVE_LOGS")
 
+    @property
+    @lru_cache(maxsize=None)
+    def FIVEM_PLAYER_LOGS_CHANNEL_ID(self) -> int:
+        """Channel for FiveM join/leave logs; 0 disables them."""
+        return int(self._get_optional_env_variable("FIVEM_PLAYER_LOGS", "0"))
+
     @property
     @lru_cache(maxsize=None)
     def ERROR_LOGS_CHANNEL_ID(self) -> int:
@@ -150,18 +158,224 @@ class AuraCityBotConfig(AuraCityBotConfigHandler):
         """Returns the FiveM dynamic URL."""
         return self._get_env_variable("FIVEM_DYNAMIC_URL")
 
+    @property
+    @lru_cache(maxsize=None)
+    def HTTP_CONNECTION_LIMIT(self) -> int:
+        """Returns the maximum number of open connections of the shared HTTP client."""
+        return int(self._get_optional_env_variable("HTTP_CONNECTION_LIMIT", "100"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def HTTP_CONNECTION_LIMIT_PER_HOST(self) -> int:
+        """Returns the maximum number of connections per host (0 = only the global limit)."""
+        return int(self._get_optional_env_variable("HTTP_CONNECTION_LIMIT_PER_HOST", "0"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def HTTP_KEEPALIVE_TIMEOUT(self) -> float:
+        """Returns how long idle connections are kept open, in seconds."""
+        return float(self._get_optional_env_variable("HTTP_KEEPALIVE_TIMEOUT", "60"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def HTTP_DNS_CACHE_TTL(self) -> int:
+        """Returns how long resolved host names are cached, in seconds."""
+        return int(self._get_optional_env_variable("HTTP_DNS_CACHE_TTL", "300"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def HTTP_TIMEOUT(self) -> float:
+        """Returns the default total timeout of an HTTP request, in seconds."""
+        return float(self._get_optional_env_variable("HTTP_TIMEOUT", "30"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def HTTP_CONNECT_TIMEOUT(self) -> float:
+        """Returns the default connect timeout of an HTTP request, in seconds."""
+        return float(self._get_optional_env_variable("HTTP_CONNECT_TIMEOUT", "5"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def OUTBOUND_WORKERS(self) -> int:
+        """Returns the number of workers sending queued Discord calls; calls on one channel always run in order."""
+        return int(self._get_optional_env_variable("OUTBOUND_WORKERS", "4"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def OUTBOUND_QUEUE_SIZE(self) -> int:
+        """Returns the maximum number of queued Discord calls; when full, log messages are dropped and others wait."""
+        return int(self._get_optional_env_variable("OUTBOUND_QUEUE_SIZE", "1000"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def RAID_JOIN_THRESHOLD(self) -> int:
+        """Returns the number of joins within RAID_JOIN_WINDOW above which raid mode is enabled."""
+        return int(self._get_optional_env_variable("RAID_JOIN_THRESHOLD", "10"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def RAID_JOIN_WINDOW(self) -> float:
+        """Returns the window in seconds over which the join rate is measured."""
+        return float(self._get_optional_env_variable("RAID_JOIN_WINDOW", "10"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def RAID_BATCH_WINDOW(self) -> float:
+        """Returns how long joins are buffered in raid mode before they are processed as one batch, in seconds."""
+        return float(self._get_optional_env_variable("RAID_BATCH_WINDOW", "5"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def RAID_BAN_CONCURRENCY(self) -> int:
+        """Returns the maximum number of ban requests running at the same time in raid mode."""
+        return int(self._get_optional_env_variable("RAID_BAN_CONCURRENCY", "2"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def FIVEM_SERVERS(self) -> list[dict]:
+        """Returns the monitored FiveM servers.
+
+        FIVEM_SERVERS is a JSON list of objects with name, server_url, player_url and optional info_url/dynamic_url.
+        Without it, the single server from the FIVEM_*_URL variables is monitored under the name "main".
+        """
+        raw = os.getenv("FIVEM_SERVERS")
+        if not raw:
+            return [{
+                "name": "main",
+                "server_url": self.FIVEM_SERVER_URL,
+                "player_url": self.FIVEM_PLAYER_URL,
+                "info_url": self.FIVEM_INFO_URL,
+                "dynamic_url": self.FIVEM_DYNAMIC_URL,
+            }]
+
+        try:
+            servers = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ConfigError(f"FIVEM_SERVERS ist kein gültiges JSON: {e}")
+        if not isinstance(servers, list) or not servers:
+            raise ConfigError("FIVEM_SERVERS muss eine nicht-leere JSON-Liste sein")
+
+        allowed = {"name", "server_url", "player_url", "info_url", "dynamic_url"}
+        names = set()
+        for server in servers:
+            if not isinstance(server, dict) or not {"name", "server_url", "player_url"} <= server.keys():
+                raise ConfigError(f"FIVEM_SERVERS: name, server_url und player_url sind Pflicht: {server}")
+            if set(server) - allowed:
+                raise ConfigError(f"FIVEM_SERVERS: Unbekannte Felder {sorted(set(server) - allowed)}")
+            # Der Name wird als Verzeichnisname für den Cache verwendet
+            if not re.fullmatch(r"[A-Za-z0-9_-]+", str(server["name"])) or server["name"] in names:
+                raise ConfigError(f"FIVEM_SERVERS: Ungültiger oder doppelter Servername '{server['name']}'")
+            names.add(server["name"])
+        return servers
+
+    @property
+    @lru_cache(maxsize=None)
+    def FIVEM_MAX_CONCURRENT_REQUESTS(self) -> int:
+        """Returns the maximum number of concurrent FiveM requests across all servers."""
+        return int(self._get_optional_env_variable("FIVEM_MAX_CONCURRENT_REQUESTS", "16"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def FIVEM_PRESENCE_SERVER(self) -> str:
+        """Returns the server shown in the bot presence; empty shows the total over all servers."""
+        return self._get_optional_env_variable("FIVEM_PRESENCE_SERVER", "")
+
+    @property
+    @lru_cache(maxsize=None)
+    def FIVEM_CACHE_DIR(self) -> str:
+        """Returns the directory for the per-server FiveM cache files."""
+        return self._get_optional_env_variable("FIVEM_CACHE_DIR", "base/cache/fivem")
+
+    @property
+    @lru_cache(maxsize=None)
+    def FIVEM_CACHE_PRETTY_JSON(self) -> bool:
+        """Returns whether cached FiveM JSON files are re-written with indentation."""
+        return self._get_optional_env_variable("FIVEM_CACHE_PRETTY_JSON", "False").lower() == "true"
+
+    @property
+    @lru_cache(maxsize=None)
+    def FIVEM_PLAYER_SERIES_PATH(self) -> str:
+        """Returns the path of the memory-mapped player-count time series."""
+        return self._get_optional_env_variable("FIVEM_PLAYER_SERIES_PATH", "base/cache/fivem_player_counts.bin")
+
     @property
     @lru_cache(maxsize=None)
     def DATABASE_PATH(self) -> str:
         """Returns the database path."""
         return self._get_env_variable("DATABASE_PATH")
 
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_POOL_SIZE(self) -> int:
+        """Returns the number of reader connections kept in the database pool."""
+        return int(self._get_optional_env_variable("DATABASE_POOL_SIZE", "4"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_WRITE_BEHIND(self) -> bool:
+        """Returns whether database writes are queued and committed in batches (off by default, needs a clean shutdown)."""
+        return self._get_optional_env_variable("DATABASE_WRITE_BEHIND", "False").lower() == "true"
+
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_WRITE_BATCH_INTERVAL_MS(self) -> int:
+        """Returns the maximum time in milliseconds a queued write waits for its batch."""
+        return int(self._get_optional_env_variable("DATABASE_WRITE_BATCH_INTERVAL_MS", "50"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_WRITE_BATCH_SIZE(self) -> int:
+        """Returns the maximum number of queued writes committed in one transaction."""
+        return int(self._get_optional_env_variable("DATABASE_WRITE_BATCH_SIZE", "200"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_WRITE_QUEUE_SIZE(self) -> int:
+        """Returns the maximum number of writes waiting in the write-behind queue."""
+        return int(self._get_optional_env_variable("DATABASE_WRITE_QUEUE_SIZE", "5000"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_CACHE_SIZE(self) -> int:
+        """Returns the maximum number of entries per database lookup cache."""
+        return int(self._get_optional_env_variable("DATABASE_CACHE_SIZE", "10000"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_CACHE_TTL(self) -> float:
+        """Returns the time in seconds a cached database lookup stays valid."""
+        return float(self._get_optional_env_variable("DATABASE_CACHE_TTL", "300"))
+
     @property
     @lru_cache(maxsize=None)
     def DATABASE_BACKUP_PATH(self) -> str:
         """Returns the database backup path."""
         return self._get_env_variable("DATABASE_BACKUP_PATH")
 
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_BACKUP_PAGES_PER_STEP(self) -> int:
+        """Returns the number of database pages copied per online backup step."""
+        return int(self._get_optional_env_variable("DATABASE_BACKUP_PAGES_PER_STEP", "256"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_BACKUP_KEEP_DAILY(self) -> int:
+        """Returns the number of daily database backups to keep."""
+        return int(self._get_optional_env_variable("DATABASE_BACKUP_KEEP_DAILY", "7"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_BACKUP_KEEP_WEEKLY(self) -> int:
+        """Returns the number of weekly database backups to keep."""
+        return int(self._get_optional_env_variable("DATABASE_BACKUP_KEEP_WEEKLY", "4"))
+
+    @property
+    @lru_cache(maxsize=None)
+    def DATABASE_BACKUP_KEEP_MONTHLY(self) -> int:
+        """Returns the number of monthly database backups to keep."""
+        return int(self._get_optional_env_variable("DATABASE_BACKUP_KEEP_MONTHLY", "12"))
+
     @property
     @lru_cache(maxsize=None)
     def DISCORD_BACKUP_PATH(self) -> str:
@@ -397,4 +611,12 @@ class AuraCityBotConfig(AuraCityBotConfigHandler):
         value = os.getenv(key)
         if not value:
             raise ConfigError(f"Die Umgebungsvariable '{key}' konnte nicht geladen werden")
-        return value
\ No newline at end of file
+        return value
+
+    @staticmethod
+    def _get_optional_env_variable(key: str, default: str) -> str:
+        """Fetches an optional environment variable and falls back to the default if not set."""
+        value = os.getenv(key)
+        if not value:
+            return default
+        return value
@@ -1,126 +1,328 @@
 import os
+import time
 import asyncio
+import logging
 
+import discord
 import aiosqlite
-from typing import Optional, Any
-from datetime import datetime, timedelta
+from typing import Optional, Any, AsyncIterator, Iterable
+from datetime import date, datetime, timedelta
 from contextlib import asynccontextmanager
 
 from base.logger import AuraCityLogger, CrashReportHandler
 from base.config import AuraCityBotConfig
+from base.backup import AuraCityDatabaseBackupEngine, AuraCityBackupResult, AuraCityBackupStatus
+from base.migrations import AuraCityMigrationRunner
+from base.models import (UserRow, BanRow, BlacklistRow, DeregistrationRow, ComplaintRow, PlayerSessionRow,
+                         ChannelMessageRow, columns, row_factory, to_dict)
+from base.utils.cache import AuraCityLRUCache
+
+
+class AuraCityDatabaseConnectionPool:
+    """Hält langlebige SQLite-Verbindungen im WAL-Modus: einen Writer und mehrere Reader."""
+
+    PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",  # Im WAL-Modus sicher, spart ein fsync pro Commit
+        "PRAGMA busy_timeout=5000",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-16000",  # ~16 MB Page-Cache pro Verbindung
+        "PRAGMA mmap_size=134217728",  # 128 MB Memory-Mapped I/O
+    )
+
+    def __init__(self, db_path: str, pool_size: int, logger: logging.Logger) -> None:
+        self.db_path = db_path
+        self.pool_size = max(1, pool_size)
+        self.logger = logger
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._writer_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    async def _connect(self, read_only: bool) -> aiosqlite.Connection:
+        connection = await aiosqlite.connect(self.db_path)
+        if not read_only:
+            # WAL muss einmalig vom Writer gesetzt werden, danach ist der Modus in der Datei persistent
+            await connection.execute("PRAGMA journal_mode=WAL")
+        for pragma in self.PRAGMAS:
+            await connection.execute(pragma)
+        if read_only:
+            await connection.execute("PRAGMA query_only=1")
+        return connection
+
+    async def open(self) -> None:
+        """Öffnet den Writer und alle Reader, falls noch nicht geschehen."""
+        if self.is_open:
+            return
+
+        async with self._open_lock:
+            if self.is_open:
+                return
+
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+
+            writer = await self._connect(read_only=False)
+            readers = []
+            try:
+                for _ in range(self.pool_size):
+                    readers.append(await self._connect(read_only=True))
+            except aiosqlite.Error:
+                for connection in [writer, *readers]:
+                    await connection.close()
+                raise
+
+            self._readers = readers
+            for reader in readers:
+                self._idle_readers.put_nowait(reader)
+            self._writer = writer
+            self.logger.debug(f"🔌 Opened connection pool (1 writer, {self.pool_size} readers) for {self.db_path}")
+
+    async def close(self) -> None:
+        """Wartet auf laufende Abfragen und schließt alle Verbindungen."""
+        async with self._open_lock:
+            if not self.is_open:
+                return
+
+            async with self._writer_lock:
+                # Alle Reader einsammeln, damit keine Verbindung mitten in einer Abfrage geschlossen wird
+                for _ in range(len(self._readers)):
+                    await self._idle_readers.get()
+                for reader in self._readers:
+                    await reader.close()
+                await self._writer.close()
+
+                self._readers = []
+                self._writer = None
+                self.logger.debug(f"🔒 Closed connection pool for {self.db_path}")
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Leiht eine Reader-Verbindung aus dem Pool aus."""
+        await self.open()
+        connection = await self._idle_readers.get()
+        try:
+            yield connection
+        finally:
+            self._idle_readers.put_nowait(connection)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Exklusiver Zugriff auf die einzige Writer-Verbindung."""
+        await self.open()
+        async with self._writer_lock:
+            try:
+                yield self._writer
+            finally:
+                # Nicht abgeschlossene Transaktionen dürfen nicht in den nächsten Aufruf hineinragen
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+
+
+WriteStatement = tuple[str, tuple]
+
+
+class AuraCityDatabaseWriteQueue:
+    """Write-Behind-Queue: sammelt Schreibzugriffe und schreibt sie gebündelt in einer Transaktion.
+
+    Jeder Eintrag besteht aus einer Liste von Statements, die atomar (in einem SAVEPOINT) ausgeführt
+    werden. Der Aufrufer erhält ein Future, das nach dem gemeinsamen Commit erfüllt wird.
+    """
+
+    def __init__(self, pool: AuraCityDatabaseConnectionPool, logger: logging.Logger, flush_interval_ms: int = 50,
+                 max_batch_size: int = 200, max_queue_size: int = 5000) -> None:
+        self.pool = pool
+        self.logger = logger
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue: asyncio.Queue[Optional[tuple[list[WriteStatement], asyncio.Future]]] = asyncio.Queue(maxsize=max_queue_size)
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def submit(self, statements: list[WriteStatement]) -> asyncio.Future:
+        """Reiht einen Schreibzugriff ein. Wartet, solange die Queue voll ist (Backpressure)."""
+        if self._closing:
+            raise RuntimeError("Write queue is shutting down")
+
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((statements, future))
+        return future
+
+    async def close(self) -> None:
+        """Schreibt alle ausstehenden Einträge und beendet den Flusher."""
+        if self._closing:
+            return
+        self._closing = True
+
+        if self._flusher is not None:
+            await self._queue.put(None)  # Sentinel: alles davor wird noch geschrieben
+            await self._flusher
+            self._flusher = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stop = False
+
+        while not stop:
+            entry = await self._queue.get()
+            if entry is None:
+                break
+
+            batch = [entry]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    entry = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[list[WriteStatement], asyncio.Future]]) -> None:
+        results: list[Optional[Exception]] = []
+
+        try:
+            async with self.pool.writer() as connection:
+                await connection.execute("BEGIN")
+                for statements, _ in batch:
+                    # Ein fehlerhafter Eintrag soll nicht den ganzen Batch verwerfen
+                    await connection.execute("SAVEPOINT write_item")
+                    try:
+                        for sql, params in statements:
+                            await connection.execute(sql, params)
+                    except aiosqlite.Error as e:
+                        await connection.execute("ROLLBACK TO write_item")
+                        results.append(e)
+                    else:
+                        results.append(None)
+                    await connection.execute("RELEASE write_item")
+                await connection.commit()
+        except Exception as e:
+            self.logger.error(f"🚨 Error while flushing {len(batch)} queued writes", exc_info=e)
+            results = [e] * len(batch)
+        else:
+            self.logger.debug(f"💾 Flushed {len(batch)} queued writes in one transaction")
+
+        for (_, future), error in zip(batch, results):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
 
 
 class AuraCityDatabaseConnectionHandler:
-    def __init__(self) -> None:
-        self.config = AuraCityBotConfig()
-        self.crash_report_handler = CrashReportHandler()
+    def __init__(self, config: Optional[AuraCityBotConfig] = None,
+                 crash_report_handler: Optional[CrashReportHandler] = None) -> None:
+        self.config = config or AuraCityBotConfig()
+        # Der Bot teilt seinen Crash-Reporter (Service "crash_report_handler"); ohne ihn (z.B. im Benchmark) ein eigener
+        self.crash_report_handler = crash_report_handler or CrashReportHandler()
         self.conn_database_logger = AuraCityLogger("AuraCityDatabaseConnection").get_logger()
         self.db = self.config.DATABASE_PATH
-        self.connection: Optional[aiosqlite.Connection] = None
+        self.pool = AuraCityDatabaseConnectionPool(self.db, self.config.DATABASE_POOL_SIZE, self.conn_database_logger)
+        self.write_queue: Optional[AuraCityDatabaseWriteQueue] = None
+        if self.config.DATABASE_WRITE_BEHIND:
+            self.write_queue = AuraCityDatabaseWriteQueue(
+                self.pool,
+                self.conn_database_logger,
+                flush_interval_ms=self.config.DATABASE_WRITE_BATCH_INTERVAL_MS,
+                max_batch_size=self.config.DATABASE_WRITE_BATCH_SIZE,
+                max_queue_size=self.config.DATABASE_WRITE_QUEUE_SIZE
+            )
+        self.migration_runner = AuraCityMigrationRunner(self.conn_database_logger)
+        self.backup_engine = AuraCityDatabaseBackupEngine(
+            self.db,
+            self.config.DATABASE_BACKUP_PATH,
+            self.conn_database_logger,
+            pages_per_step=self.config.DATABASE_BACKUP_PAGES_PER_STEP,
+            keep_daily=self.config.DATABASE_BACKUP_KEEP_DAILY,
+            keep_weekly=self.config.DATABASE_BACKUP_KEEP_WEEKLY,
+            keep_monthly=self.config.DATABASE_BACKUP_KEEP_MONTHLY
+        )
         self.backup_interval = 86400  # 1 day
 
     async def create_database(self) -> None:
-        await self.create_connection()
-        try:
-            async with self.connection.cursor() as cursor:
-                created_tables = []  # Liste für erstellte Tabellen
-
-                # Definieren der Tabellen
-                tables = [
-                    ("users", """
-                        CREATE TABLE IF NOT EXISTS users (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            discord_id INTEGER UNIQUE NOT NULL,
-                            discriminator TEXT NOT NULL
-                        )
-                    """),
-                    ("bans", """
-                        CREATE TABLE IF NOT EXISTS bans (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            discord_id INTEGER NOT NULL,
-                            reason TEXT NOT NULL,
-                            FOREIGN KEY (discord_id) REFERENCES users(discord_id)
-                        )
-                    """),
-                    ("blacklist", """
-                        CREATE TABLE IF NOT EXISTS blacklist (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            discord_id INTEGER NOT NULL,
-                            reason TEXT NOT NULL,
-                            FOREIGN KEY (discord_id) REFERENCES users(discord_id)
-                        )
-                    
-                    """),
-                    ("deregistrations", """
-                        CREATE TABLE IF NOT EXISTS deregistrations (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            discord_id INTEGER NOT NULL,
-                            time_stamp TIMESTAMP NOT NULL,
-                            deregistration_count INTEGER NOT NULL,
-                            reason TEXT NOT NULL,
-                            message TEXT NOT NULL,
-                            FOREIGN KEY (discord_id) REFERENCES users(discord_id)
-                        )
-                    """),
-                    ("complaints", """
-                        CREATE TABLE IF NOT EXISTS complaints (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            discord_id INTEGER NOT NULL,
-                            message TEXT NOT NULL,
-                            category TEXT NOT NULL,
-                            complaint TEXT,  -- Content of the message
-                            FOREIGN KEY (discord_id) REFERENCES users(discord_id)
-                        )
-                    """)
-                ]
-
-                total_tables = len(tables)
-
-                for i, (table_name, create_sql) in enumerate(tables):
-                    await cursor.execute(create_sql)
-                    created_tables.append(f"{i + 1}/{total_tables} - 🧑‍💻 {table_name.capitalize()}")
-
-                    progress = ((i + 1) / total_tables) * 100
-                    self.conn_database_logger.debug("Creating tables: {:.2f}% completed".format(progress))
-
-                self.conn_database_logger.debug(f"Tables created successfully: {', '.join(created_tables)}")
-                self.conn_database_logger.debug(f"🎉 Database created successfully at: {self.db}")
+        """Bringt das Schema per Migrationen auf den neuesten Stand und prüft die Query-Pläne."""
+        async with self.get_write_connection() as connection:
+            try:
+                applied = await self.migration_runner.migrate(connection)
+                await self.migration_runner.analyze(connection, full=applied > 0)
+                await self.migration_runner.check_query_plans(connection)
+                self.conn_database_logger.debug(f"🎉 Database ready at: {self.db}")
+            except aiosqlite.Error as e:
+                await self.crash_report_handler.save_error(e)
+                self.conn_database_logger.error("🚨 Error while creating database", exc_info=e)
 
-        except aiosqlite.Error as e:
-            await self.crash_report_handler.save_error(e)
-            self.conn_database_logger.error("🚨 Error while creating database", exc_info=e)
+    @asynccontextmanager
+    async def get_read_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Reader-Verbindung aus dem Pool für SELECT-Abfragen."""
+        async with self.pool.reader() as connection:
+            try:
+                yield connection
+            except aiosqlite.Error as e:
+                await self.crash_report_handler.save_error(e)
+                self.conn_database_logger.error(f"🚨 Error on read connection {e}")
 
     @asynccontextmanager
-    async def get_db_connection(self):
-        try:
-            await self.create_connection()
+    async def get_write_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Exklusive Writer-Verbindung aus dem Pool für schreibende Abfragen."""
+        async with self.pool.writer() as connection:
             try:
-                yield self.connection
-            finally:
-                await self.close_connection()
+                yield connection
+            except aiosqlite.Error as e:
+                await self.crash_report_handler.save_error(e)
+                self.conn_database_logger.error(f"🚨 Error on write connection {e}")
+
+    async def create_connection(self) -> None:
+        try:
+            await self.pool.open()
         except aiosqlite.Error as e:
             await self.crash_report_handler.save_error(e)
-            self.conn_database_logger.error(f"🚨 Error while getting database connection {e}")
+            self.conn_database_logger.error("🚨 Error while connecting to database", exc_info=e)
 
-    async def create_connection(self) -> None:
+    async def _execute_write(self, statements: list[WriteStatement], error_message: str) -> bool:
+        """Führt die Statements atomar aus, im Write-Behind-Modus über die Queue (Group-Commit)."""
         try:
-            if self.connection is None:
-                self.connection = await aiosqlite.connect(self.db)
-                self.conn_database_logger.debug(f"🔌 Connected to database {self.db}")
+            if self.write_queue is not None:
+                await (await self.write_queue.submit(statements))
             else:
-                self.conn_database_logger.debug(f"⚡ Connection already exists at: {self.db}")
+                async with self.pool.writer() as connection:
+                    for sql, params in statements:
+                        await connection.execute(sql, params)
+                    await connection.commit()
+            return True
         except aiosqlite.Error as e:
             await self.crash_report_handler.save_error(e)
-            self.conn_database_logger.error("🚨 Error while connecting to database", exc_info=e)
+            self.conn_database_logger.error(error_message, exc_info=e)
+            return False
 
     async def close_connection(self) -> None:
         try:
-            if self.connection:
-                await self.connection.close()
-                self.conn_database_logger.debug(f"🔒 Closed connection to database: {self.db}")
-                self.connection = None
-            else:
-                self.conn_database_logger.debug(f"❌ No connection to close: {self.db}")
+            if self.write_queue is not None:
+                await self.write_queue.close()  # Ausstehende Schreibzugriffe vor dem Schließen committen
+            await self.backup_engine.close()
+            await self.pool.close()
         except aiosqlite.Error as e:
             await self.crash_report_handler.save_error(e)
             self.conn_database_logger.error("🚨 Error closing connection", exc_info=e)
@@ -157,334 +359,551 @@ class AuraCityDatabaseConnectionHandler:
             # Führe das Datenbank-Backup durch
             await self.backup_database()
 
-    async def backup_database(self) -> None:
-        """Creates a backup of the current database."""
+    async def backup_database(self, force: bool = False) -> AuraCityBackupResult:
+        """Creates a backup of the current database, skipped if nothing changed since the last one."""
         try:
-            backup_path = f"{self.config.DATABASE_BACKUP_PATH}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-            os.makedirs(os.path.dirname(backup_path), exist_ok=True)  # Create backup directory if it doesn't exist
-            async with aiosqlite.connect(self.db) as source_conn:
-                async with aiosqlite.connect(backup_path) as backup_conn:
-                    await source_conn.backup(backup_conn)
-            self.conn_database_logger.debug(f"💾 Database backed up successfully to {backup_path}")
+            return await self.backup_engine.backup(force=force)
         except Exception as e:
             await self.crash_report_handler.save_error(e)
             self.conn_database_logger.error("🚨 Error during database backup", exc_info=e)
+            return AuraCityBackupResult(AuraCityBackupStatus.FAILED, reason=str(e))
 
 class AuraCityDatabase(AuraCityDatabaseConnectionHandler):
-    def __init__(self) -> None:
-        super().__init__()
-        self.logger = AuraCityLogger("AuraCityDatabase").get_logger()
+    BULK_CHUNK_SIZE = 500  # Bleibt sicher unter SQLITE_MAX_VARIABLE_NUMBER älterer SQLite-Versionen
 
-    async def add_user(self, discord_id: int, discriminator: str) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        INSERT INTO users (discord_id, discriminator)
-                        VALUES (?, ?)
-                        """,
-                        (discord_id, discriminator)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error adding user to database", exc_info=e)
-
-    async def get_user_dict(self, discord_id: int) -> Optional[dict]:
-        async with (self.get_db_connection() as conn):
+    def __init__(self, config: Optional[AuraCityBotConfig] = None,
+                 crash_report_handler: Optional[CrashReportHandler] = None) -> None:
+        super().__init__(config, crash_report_handler)
+        self.logger = AuraCityLogger("AuraCityDatabase").get_logger()
+        self.user_cache = AuraCityLRUCache(self.config.DATABASE_CACHE_SIZE, self.config.DATABASE_CACHE_TTL)
+        self.ban_cache = AuraCityLRUCache(self.config.DATABASE_CACHE_SIZE, self.config.DATABASE_CACHE_TTL)
+        self.blacklist_cache = AuraCityLRUCache(self.config.DATABASE_CACHE_SIZE, self.config.DATABASE_CACHE_TTL)
+
+    def cache_stats(self) -> dict[str, dict]:
+        """Hit-/Miss-Zähler der Lookup-Caches zum Tunen von Größe und TTL."""
+        return {
+            "users": self.user_cache.stats(),
+            "bans": self.ban_cache.stats(),
+            "blacklist": self.blacklist_cache.stats()
+        }
+
+    async def _fetch_one(self, model: type, table: str, discord_id: int, label: str, on_error: Any = None) -> Any | None:
+        """Erste Zeile der Tabelle zur discord_id als Modellinstanz, bei einem Datenbankfehler on_error."""
+        async with self.get_read_connection() as conn:
             async with conn.cursor() as cursor:
+                cursor.row_factory = row_factory(model)
                 try:
                     await cursor.execute(
-                        """
-                        SELECT * FROM users
+                        f"""
+                        SELECT {columns(model)} FROM {table}
                         WHERE discord_id = ?
+                        ORDER BY id
+                        LIMIT 1
                         """,
                         (discord_id,)
                     )
                     row = await cursor.fetchone()
-                    if row:
-                        return {
-                            "discord_id": row[1],
-                            "username": row[2],
-                            "discriminator": row[3]
-                        }
-                    else:
-                        self.logger.debug(f"🔍 User with discord_id {discord_id} not found")
-                        return None
+                    if row is None:
+                        self.logger.debug(f"🔍 {label} with discord_id {discord_id} not found")
+                    return row
                 except aiosqlite.Error as e:
                     await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error getting user from database", exc_info=e)
-                    return None
+                    self.logger.error(f"🚨 Error getting {label.lower()} from database", exc_info=e)
+                    return on_error
+        return on_error  # Fehler beim Öffnen der Verbindung, bereits von get_read_connection protokolliert
+
+    async def _iter_rows(self, model: type, table: str, key_columns: tuple[str, ...], page_size: int,
+                         where: Optional[str] = None, params: tuple = ()) -> AsyncIterator[Any]:
+        """Keyset-Pagination: lädt immer nur eine Seite und gibt die Reader-Verbindung zwischen den Seiten frei."""
+        order_by = ", ".join(key_columns)
+        keyset = f"({order_by}) > ({', '.join('?' * len(key_columns))})"
+        last_key: Optional[tuple] = None
+
+        while True:
+            conditions = [condition for condition in (where, keyset if last_key is not None else None) if condition]
+            sql = f"SELECT {columns(model)} FROM {table}"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += f" ORDER BY {order_by} LIMIT ?"
+
+            rows = []
+            async with self.get_read_connection() as conn:
+                async with conn.cursor() as cursor:
+                    cursor.row_factory = row_factory(model)
+                    await cursor.execute(sql, (*params, *(last_key or ()), page_size))
+                    rows = await cursor.fetchall()
+
+            for row in rows:
+                yield row
+
+            if len(rows) < page_size:
+                return
+            last_key = tuple(getattr(rows[-1], column) for column in key_columns)
+
+    async def iter_users(self, page_size: int = 1000) -> AsyncIterator[UserRow]:
+        async for row in self._iter_rows(UserRow, "users", ("id",), page_size):
+            yield row
+
+    async def iter_bans(self, page_size: int = 1000) -> AsyncIterator[BanRow]:
+        async for row in self._iter_rows(BanRow, "bans", ("id",), page_size):
+            yield row
+
+    async def iter_blacklist(self, page_size: int = 1000) -> AsyncIterator[BlacklistRow]:
+        async for row in self._iter_rows(BlacklistRow, "blacklist", ("id",), page_size):
+            yield row
+
+    async def add_user(self, discord_id: int, discriminator: str) -> None:
+        await self._execute_write(
+            [(
+                """
+                INSERT INTO users (discord_id, discriminator)
+                VALUES (?, ?)
+                """,
+                (discord_id, discriminator)
+            )],
+            "🚨 Error adding user to database"
+        )
+        self.user_cache.invalidate(discord_id)
+
+    async def get_user_dict(self, discord_id: int) -> Optional[dict]:
+        user = await self._fetch_one(UserRow, "users", discord_id, "User")
+        return to_dict(user) if user else None
 
     async def get_user(self, discord_id: int) -> Any | None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        SELECT discord_id FROM users
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
+        """Read-Through über den User-Cache, auch "nicht gefunden" wird kurz gecacht."""
+        return await self.user_cache.get_or_load(discord_id, lambda: self._fetch_user(discord_id))
+
+    async def _fetch_user(self, discord_id: int) -> Any | None:
+        user = await self._fetch_one(UserRow, "users", discord_id, "User", on_error=AuraCityLRUCache.LOAD_FAILED)
+        if user is AuraCityLRUCache.LOAD_FAILED:
+            return user
+        return user.discord_id if user else None
+
+    async def add_users_many(self, users: Iterable[tuple[int, str]]) -> int:
+        """Fügt viele User in einer Transaktion hinzu, bereits vorhandene werden übersprungen.
+
+        Gibt die Anzahl der neu eingetragenen User zurück.
+        """
+        users = list(users)
+        if not users:
+            return 0
+
+        inserted = 0
+        async with self.get_write_connection() as conn:
+            try:
+                changes_before = conn.total_changes
+                await conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO users (discord_id, discriminator)
+                    VALUES (?, ?)
+                    """,
+                    users
+                )
+                await conn.commit()
+                inserted = conn.total_changes - changes_before
+            except aiosqlite.Error as e:
+                await self.crash_report_handler.save_error(e)
+                self.logger.error("🚨 Error adding users to database", exc_info=e)
+                return 0
+
+        for discord_id, _ in users:
+            self.user_cache.invalidate(discord_id)
+        return inserted
+
+    async def get_users_many(self, discord_ids: Iterable[int]) -> dict[int, str]:
+        """Holt viele User auf einmal und gibt {discord_id: discriminator} der gefundenen zurück.
+
+        Das Ergebnis wärmt gleichzeitig den User-Cache (auch für nicht gefundene IDs).
+        """
+        discord_ids = list(dict.fromkeys(discord_ids))
+        found: dict[int, str] = {}
+        loaded = False
+
+        async with self.get_read_connection() as conn:
+            for start in range(0, len(discord_ids), self.BULK_CHUNK_SIZE):
+                chunk = discord_ids[start:start + self.BULK_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                async with conn.execute(
+                    f"SELECT discord_id, discriminator FROM users WHERE discord_id IN ({placeholders})",
+                    chunk
+                ) as cursor:
+                    async for discord_id, discriminator in cursor:
+                        found[discord_id] = discriminator
+            loaded = True  # Bei einem Fehler bricht get_read_connection den Block vorher ab
+
+        if not loaded:
+            return found  # Unvollständiges Ergebnis, fehlende IDs nicht als "nicht gefunden" cachen
+        for discord_id in discord_ids:
+            self.user_cache.set(discord_id, discord_id if discord_id in found else None)
+        return found
+
+    async def sync_guild_members(self, guild: discord.Guild) -> dict[str, int]:
+        """Gleicht die Mitgliederliste der Guild in einem Durchgang mit der users-Tabelle ab.
+
+        Fehlende Mitglieder (z.B. während der Bot offline war) werden in einer Transaktion nachgetragen.
+        """
+        started = time.perf_counter()
+        members = [(member.id, member.discriminator) for member in guild.members if not member.bot]
+        added_ids: list[int] = []
+
+        async with self.get_write_connection() as conn:
+            try:
+                await conn.execute(
+                    """
+                    CREATE TEMP TABLE IF NOT EXISTS sync_members (
+                        discord_id INTEGER PRIMARY KEY,
+                        discriminator TEXT NOT NULL
                     )
-                    row = await cursor.fetchone()
-                    if row:
-                        return row[0]
-                    else:
-                        self.logger.debug(f"🔍 User with discord_id {discord_id} not found")
-                        return None
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error getting user from database", exc_info=e)
-                    return None
-
+                    """
+                )
+                await conn.execute("DELETE FROM sync_members")
+                await conn.executemany("INSERT OR IGNORE INTO sync_members (discord_id, discriminator) VALUES (?, ?)", members)
+
+                async with conn.execute(
+                    """
+                    SELECT s.discord_id FROM sync_members s
+                    WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.discord_id = s.discord_id)
+                    """
+                ) as cursor:
+                    added_ids = [row[0] for row in await cursor.fetchall()]
+
+                await conn.execute(
+                    """
+                    INSERT OR IGNORE INTO users (discord_id, discriminator)
+                    SELECT s.discord_id, s.discriminator FROM sync_members s
+                    WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.discord_id = s.discord_id)
+                    """
+                )
+                await conn.execute("DELETE FROM sync_members")
+                await conn.commit()
+            except aiosqlite.Error as e:
+                await self.crash_report_handler.save_error(e)
+                self.logger.error(f"🚨 Error syncing members of guild {guild.id}", exc_info=e)
+                return {"members": len(members), "added": 0}
+
+        for discord_id in added_ids:
+            self.user_cache.invalidate(discord_id)
+
+        self.logger.debug(
+            f"👥 Synced {len(members)} members of {guild.name}: {len(added_ids)} added "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return {"members": len(members), "added": len(added_ids)}
 
     async def delete_user(self, discord_id: int) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        DELETE FROM users
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error deleting user from database", exc_info=e)
+        await self._execute_write(
+            [(
+                """
+                DELETE FROM users
+                WHERE discord_id = ?
+                """,
+                (discord_id,)
+            )],
+            "🚨 Error deleting user from database"
+        )
+        self.user_cache.invalidate(discord_id)
 
     async def add_ban(self, discord_id: int, reason: str) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        INSERT INTO bans (discord_id, reason)
-                        VALUES (?, ?)
-                        """,
-                        (discord_id, reason)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error adding ban to database", exc_info=e)
-
-    async def get_ban(self, discord_id: int) -> Optional[dict]:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        SELECT * FROM bans
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
-                    )
-                    row = await cursor.fetchone()
-                    if row:
-                        return {
-                            "discord_id": row[1],
-                            "reason": row[2]
-                        }
-                    else:
-                        self.logger.debug(f"🔍 Ban with discord_id {discord_id} not found")
-                        return None
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error getting ban from database", exc_info=e)
-                    return None
+        await self._execute_write(
+            [(
+                """
+                INSERT INTO bans (discord_id, reason)
+                VALUES (?, ?)
+                """,
+                (discord_id, reason)
+            )],
+            "🚨 Error adding ban to database"
+        )
+        self.ban_cache.invalidate(discord_id)
+
+    async def get_ban(self, discord_id: int) -> Optional[BanRow]:
+        """Read-Through über den Ban-Cache, auch "nicht gefunden" wird kurz gecacht."""
+        return await self.ban_cache.get_or_load(discord_id, lambda: self._fetch_ban(discord_id))
+
+    async def _fetch_ban(self, discord_id: int) -> Optional[BanRow]:
+        return await self._fetch_one(BanRow, "bans", discord_id, "Ban", on_error=AuraCityLRUCache.LOAD_FAILED)
 
     async def delete_ban(self, discord_id: int) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        DELETE FROM bans
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error deleting ban from database", exc_info=e)
+        await self._execute_write(
+            [(
+                """
+                DELETE FROM bans
+                WHERE discord_id = ?
+                """,
+                (discord_id,)
+            )],
+            "🚨 Error deleting ban from database"
+        )
+        self.ban_cache.invalidate(discord_id)
 
     async def add_blacklist(self, discord_id: int, reason: str) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        INSERT INTO blacklist (discord_id, reason)
-                        VALUES (?, ?)
-                        """,
-                        (discord_id, reason)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error adding blacklist to database", exc_info=e)
-
-    async def get_blacklist(self, discord_id: int) -> Optional[dict]:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        SELECT * FROM blacklist
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
-                    )
-                    row = await cursor.fetchone()
-                    if row:
-                        return {
-                            "discord_id": row[1],
-                            "reason": row[2]
-                        }
-                    else:
-                        self.logger.debug(f"🔍 Blacklist with discord_id {discord_id} not found")
-                        return None
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error getting blacklist from database", exc_info=e)
-                    return None
+        await self._execute_write(
+            [(
+                """
+                INSERT INTO blacklist (discord_id, reason)
+                VALUES (?, ?)
+                """,
+                (discord_id, reason)
+            )],
+            "🚨 Error adding blacklist to database"
+        )
+        self.blacklist_cache.invalidate(discord_id)
+
+    async def get_blacklist(self, discord_id: int) -> Optional[BlacklistRow]:
+        """Read-Through über den Blacklist-Cache, auch "nicht gefunden" wird kurz gecacht."""
+        return await self.blacklist_cache.get_or_load(discord_id, lambda: self._fetch_blacklist(discord_id))
+
+    async def _fetch_blacklist(self, discord_id: int) -> Optional[BlacklistRow]:
+        return await self._fetch_one(BlacklistRow, "blacklist", discord_id, "Blacklist",
+                                     on_error=AuraCityLRUCache.LOAD_FAILED)
 
     async def delete_blacklist(self, discord_id: int) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        DELETE FROM blacklist
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error deleting blacklist from database", exc_info=e)
-
-    async def add_deregistration(self, discord_id: int, time_stamp: str, deregistration_count: int, reason: str, message: str) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        INSERT INTO deregistrations (discord_id, time_stamp, deregistration_count, reason, message)
-                        VALUES (?, ?, ?, ?, ?)
-                        """,
-                        (discord_id, time_stamp, deregistration_count, reason, message)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error adding deregistration to database", exc_info=e)
-
-    async def get_deregistration(self, discord_id: int) -> Optional[dict]:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        SELECT * FROM deregistrations
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
-                    )
-                    row = await cursor.fetchone()
-                    if row:
-                        return {
-                            "discord_id": row[1],
-                            "time_stamp": row[2],
-                            "deregistration_count": row[3],
-                            "reason": row[4],
-                            "message": row[5]
-                        }
-                    else:
-                        self.logger.debug(f"🔍 Deregistration with discord_id {discord_id} not found")
-                        return None
-                except aiosqlite.Error as e:
-                    self.logger.error("🚨 Error getting deregistration from database", exc_info=e)
-                    return None
+        await self._execute_write(
+            [(
+                """
+                DELETE FROM blacklist
+                WHERE discord_id = ?
+                """,
+                (discord_id,)
+            )],
+            "🚨 Error deleting blacklist from database"
+        )
+        self.blacklist_cache.invalidate(discord_id)
+
+    async def add_deregistration(self, discord_id: int, time_stamp: str, deregistration_count: Optional[int], reason: str,
+                                 message: str, department: str = "") -> None:
+        """Trägt eine Abmeldung ein und zählt die Zähler in derselben Transaktion hoch.
+
+        Ist deregistration_count None, wird der laufende Zähler des Users in der Abteilung + 1 verwendet.
+        """
+        await self._execute_write(
+            [
+                (
+                    """
+                    INSERT INTO deregistrations (discord_id, time_stamp, deregistration_count, reason, message, department)
+                    VALUES (?, ?, COALESCE(?, (
+                        SELECT count + 1 FROM deregistration_counters
+                        WHERE discord_id = ? AND department = ?
+                    ), 1), ?, ?, ?)
+                    """,
+                    (discord_id, time_stamp, deregistration_count, discord_id, department, reason, message, department)
+                ),
+                (
+                    """
+                    INSERT INTO deregistration_counters (discord_id, department, count)
+                    VALUES (?, ?, 1)
+                    ON CONFLICT (discord_id, department) DO UPDATE SET count = count + 1
+                    """,
+                    (discord_id, department)
+                ),
+                (
+                    """
+                    INSERT INTO deregistration_daily_counts (discord_id, department, day, count)
+                    VALUES (?, ?, COALESCE(date(?), date('now')), 1)
+                    ON CONFLICT (discord_id, department, day) DO UPDATE SET count = count + 1
+                    """,
+                    (discord_id, department, time_stamp)
+                )
+            ],
+            "🚨 Error adding deregistration to database"
+        )
+
+    async def get_deregistration_count(self, discord_id: int, department: Optional[str] = None) -> int:
+        """Aktuelle Anzahl der Abmeldungen eines Users (optional nur einer Abteilung), ohne Tabellenscan."""
+        sql = "SELECT COALESCE(SUM(count), 0) FROM deregistration_counters WHERE discord_id = ?"
+        params: tuple = (discord_id,)
+        if department is not None:
+            sql += " AND department = ?"
+            params += (department,)
+
+        async with self.get_read_connection() as conn:
+            async with conn.execute(sql, params) as cursor:
+                row = await cursor.fetchone()
+                return row[0]
+        return 0
+
+    async def get_deregistration_count_between(self, discord_id: int, start: date | str, end: date | str,
+                                               department: Optional[str] = None) -> int:
+        """Anzahl der Abmeldungen eines Users im Zeitraum [start, end] (tagesgenau) aus den Tageszählern."""
+        sql = """
+            SELECT COALESCE(SUM(count), 0) FROM deregistration_daily_counts
+            WHERE discord_id = ? AND day BETWEEN date(?) AND date(?)
+        """
+        params: tuple = (discord_id, str(start), str(end))
+        if department is not None:
+            sql += " AND department = ?"
+            params += (department,)
+
+        async with self.get_read_connection() as conn:
+            async with conn.execute(sql, params) as cursor:
+                row = await cursor.fetchone()
+                return row[0]
+        return 0
+
+    async def get_deregistration(self, discord_id: int) -> Optional[DeregistrationRow]:
+        return await self._fetch_one(DeregistrationRow, "deregistrations", discord_id, "Deregistration")
+
+    async def iter_deregistrations(self, discord_id: int, page_size: int = 500) -> AsyncIterator[DeregistrationRow]:
+        """Alle Abmeldungen eines Users in zeitlicher Reihenfolge, seitenweise geladen."""
+        async for row in self._iter_rows(DeregistrationRow, "deregistrations", ("time_stamp", "id"), page_size,
+                                         "discord_id = ?", (discord_id,)):
+            yield row
 
     async def delete_deregistration(self, discord_id: int) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        DELETE FROM deregistrations
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error deleting deregistration from database", exc_info=e)
-
+        await self._execute_write(
+            [
+                (
+                    """
+                    DELETE FROM deregistrations
+                    WHERE discord_id = ?
+                    """,
+                    (discord_id,)
+                ),
+                ("DELETE FROM deregistration_counters WHERE discord_id = ?", (discord_id,)),
+                ("DELETE FROM deregistration_daily_counts WHERE discord_id = ?", (discord_id,))
+            ],
+            "🚨 Error deleting deregistration from database"
+        )
 
     async def add_complaint(self, discord_id: int, message: str, category: str, complaint: str) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        INSERT INTO complaints (discord_id, message, category, complaint)
-                        VALUES (?, ?, ?, ?)
-                        """,
-                        (discord_id, message, category, complaint)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error adding complaint to database", exc_info=e)
-
-    async def get_complaint(self, discord_id: int) -> Optional[dict]:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        SELECT * FROM complaints
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
-                    )
-                    row = await cursor.fetchone()
-                    if row:
-                        return {
-                            "discord_id": row[1],
-                            "message": row[2],
-                            "category": row[3],
-                            "complaint": row[4]
-                        }
-                    else:
-                        self.logger.debug(f"🔍 Complaint with discord_id {discord_id} not found")
-                        return None
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error getting complaint from database", exc_info=e)
-                    return None
+        await self._execute_write(
+            [(
+                """
+                INSERT INTO complaints (discord_id, message, category, complaint)
+                VALUES (?, ?, ?, ?)
+                """,
+                (discord_id, message, category, complaint)
+            )],
+            "🚨 Error adding complaint to database"
+        )
+
+    async def get_complaint(self, discord_id: int) -> Optional[ComplaintRow]:
+        return await self._fetch_one(ComplaintRow, "complaints", discord_id, "Complaint")
+
+    async def iter_complaints(self, discord_id: Optional[int] = None, page_size: int = 500) -> AsyncIterator[ComplaintRow]:
+        """Alle Beschwerden (optional nur die eines Users), seitenweise geladen."""
+        where, params = ("discord_id = ?", (discord_id,)) if discord_id is not None else (None, ())
+        async for row in self._iter_rows(ComplaintRow, "complaints", ("id",), page_size, where, params):
+            yield row
 
     async def delete_complaint(self, discord_id: int) -> None:
-        async with self.get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                try:
-                    await cursor.execute(
-                        """
-                        DELETE FROM complaints
-                        WHERE discord_id = ?
-                        """,
-                        (discord_id,)
-                    )
-                    await conn.commit()
-                except aiosqlite.Error as e:
-                    await self.crash_report_handler.save_error(e)
-                    self.logger.error("🚨 Error deleting complaint from database", exc_info=e)
+        await self._execute_write(
+            [(
+                """
+                DELETE FROM complaints
+                WHERE discord_id = ?
+                """,
+                (discord_id,)
+            )],
+            "🚨 Error deleting complaint from database"
+        )
+
+    async def record_player_changes(self, server: str, joined: Iterable[tuple[str, Optional[int], str]],
+                                    left: Iterable[str], timestamp: int) -> bool:
+        """Öffnet Sessions für beigetretene und schließt die der gegangenen Spieler in einer Transaktion.
+
+        joined enthält (identifier, discord_id, name), left die Identifier.
+        """
+        statements = [
+            (
+                """
+                INSERT INTO player_sessions (server, identifier, discord_id, name, started_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (server, identifier, discord_id, name, timestamp)
+            )
+            for identifier, discord_id, name in joined
+        ]
+        statements += [
+            (
+                """
+                UPDATE player_sessions SET ended_at = ?
+                WHERE server = ? AND identifier = ? AND ended_at IS NULL
+                """,
+                (timestamp, server, identifier)
+            )
+            for identifier in left
+        ]
+        if not statements:
+            return True
+        return await self._execute_write(statements, "🚨 Error recording player sessions in database")
+
+    async def close_player_sessions(self, server: str, timestamp: int) -> bool:
+        """Beendet alle offenen Sessions eines Servers."""
+        return await self._execute_write(
+            [(
+                """
+                UPDATE player_sessions SET ended_at = ?
+                WHERE server = ? AND ended_at IS NULL
+                """,
+                (timestamp, server)
+            )],
+            "🚨 Error closing player sessions in database"
+        )
+
+    async def get_open_player_sessions(self) -> list[PlayerSessionRow]:
+        try:
+            async with self.get_read_connection() as conn:
+                async with conn.cursor() as cursor:
+                    cursor.row_factory = row_factory(PlayerSessionRow)
+                    await cursor.execute(f"SELECT {columns(PlayerSessionRow)} FROM player_sessions WHERE ended_at IS NULL")
+                    return await cursor.fetchall()
+        except aiosqlite.Error as e:
+            await self.crash_report_handler.save_error(e)
+            self.logger.error("🚨 Error fetching open player sessions from database", exc_info=e)
+            return []
+
+    async def get_channel_messages(self) -> dict[str, ChannelMessageRow]:
+        """Vom Bot gepostete Info-Nachrichten, nach Schlüssel."""
+        try:
+            async with self.get_read_connection() as conn:
+                async with conn.cursor() as cursor:
+                    cursor.row_factory = row_factory(ChannelMessageRow)
+                    await cursor.execute(f"SELECT {columns(ChannelMessageRow)} FROM channel_messages")
+                    return {row.key: row for row in await cursor.fetchall()}
+        except aiosqlite.Error as e:
+            await self.crash_report_handler.save_error(e)
+            self.logger.error("🚨 Error fetching channel messages from database", exc_info=e)
+            return {}
+
+    async def set_channel_message(self, key: str, channel_id: int, message_id: int, content_hash: str) -> bool:
+        return await self._execute_write(
+            [(
+                """
+                INSERT INTO channel_messages (key, channel_id, message_id, content_hash)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    channel_id = excluded.channel_id,
+                    message_id = excluded.message_id,
+                    content_hash = excluded.content_hash
+                """,
+                (key, channel_id, message_id, content_hash)
+            )],
+            "🚨 Error saving channel message to database"
+        )
+
+    async def get_playtime(self, start: int, end: int, discord_id: Optional[int] = None,
+                           identifier: Optional[str] = None) -> int:
+        """Spielzeit in Sekunden im Zeitraum [start, end) über alle Server, laufende Sessions zählen bis jetzt.
+
+        Sessions werden auf den Zeitraum zugeschnitten, es werden nur die Sessions des Spielers gelesen.
+        """
+        if (discord_id is None) == (identifier is None):
+            raise ValueError("Either discord_id or identifier must be given")
+
+        key_column, key = ("discord_id", discord_id) if discord_id is not None else ("identifier", identifier)
+        now = int(time.time())
+        sql = f"""
+            SELECT COALESCE(SUM(MAX(0, MIN(COALESCE(ended_at, ?), ?) - MAX(started_at, ?))), 0)
+            FROM player_sessions
+            WHERE {key_column} = ? AND started_at < ? AND (ended_at IS NULL OR ended_at > ?)
+        """
+        try:
+            async with self.get_read_connection() as conn:
+                async with conn.execute(sql, (now, end, start, key, end, start)) as cursor:
+                    row = await cursor.fetchone()
+                    return row[0]
+        except aiosqlite.Error as e:
+            await self.crash_report_handler.save_error(e)
+            self.logger.error("🚨 Error fetching playtime from database", exc_info=e)
+            return 0
@@ -0,0 +1,215 @@
+import logging
+from dataclasses import dataclass
+
+import aiosqlite
+
+
+@dataclass(frozen=True)
+class AuraCityMigration:
+    version: int
+    description: str
+    statements: tuple[str, ...]
+
+
+# Neue Schemaänderungen immer hinten mit der nächsten Versionsnummer anhängen, bestehende nie ändern.
+MIGRATIONS: tuple[AuraCityMigration, ...] = (
+    AuraCityMigration(1, "Create base tables", (
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            discord_id INTEGER UNIQUE NOT NULL,
+            discriminator TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS bans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            discord_id INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            FOREIGN KEY (discord_id) REFERENCES users(discord_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS blacklist (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            discord_id INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            FOREIGN KEY (discord_id) REFERENCES users(discord_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS deregistrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            discord_id INTEGER NOT NULL,
+            time_stamp TIMESTAMP NOT NULL,
+            deregistration_count INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            message TEXT NOT NULL,
+            FOREIGN KEY (discord_id) REFERENCES users(discord_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS complaints (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            discord_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            category TEXT NOT NULL,
+            complaint TEXT,  -- Content of the message
+            FOREIGN KEY (discord_id) REFERENCES users(discord_id)
+        )
+        """,
+    )),
+    AuraCityMigration(2, "Add discord_id indexes", (
+        "CREATE INDEX IF NOT EXISTS idx_bans_discord_id ON bans (discord_id)",
+        "CREATE INDEX IF NOT EXISTS idx_blacklist_discord_id ON blacklist (discord_id)",
+        "CREATE INDEX IF NOT EXISTS idx_deregistrations_discord_id_time_stamp ON deregistrations (discord_id, time_stamp)",
+        "CREATE INDEX IF NOT EXISTS idx_complaints_discord_id_category ON complaints (discord_id, category)",
+    )),
+    AuraCityMigration(3, "Add departments and deregistration counters", (
+        "ALTER TABLE deregistrations ADD COLUMN department TEXT NOT NULL DEFAULT ''",
+        """
+        CREATE TABLE deregistration_counters (
+            discord_id INTEGER NOT NULL,
+            department TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (discord_id, department)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE deregistration_daily_counts (
+            discord_id INTEGER NOT NULL,
+            department TEXT NOT NULL,
+            day TEXT NOT NULL,  -- YYYY-MM-DD
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (discord_id, department, day)
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT INTO deregistration_counters (discord_id, department, count)
+        SELECT discord_id, department, COUNT(*) FROM deregistrations
+        GROUP BY discord_id, department
+        """,
+        """
+        INSERT INTO deregistration_daily_counts (discord_id, department, day, count)
+        SELECT discord_id, department, COALESCE(date(time_stamp), date('now')), COUNT(*) FROM deregistrations
+        GROUP BY discord_id, department, COALESCE(date(time_stamp), date('now'))
+        """,
+    )),
+    AuraCityMigration(4, "Add FiveM player sessions", (
+        """
+        CREATE TABLE player_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            server TEXT NOT NULL,
+            identifier TEXT NOT NULL,
+            discord_id INTEGER,
+            name TEXT NOT NULL,
+            started_at INTEGER NOT NULL,  -- Unix-Zeitstempel
+            ended_at INTEGER  -- NULL = Session läuft noch
+        )
+        """,
+        "CREATE INDEX idx_player_sessions_discord_id_started_at ON player_sessions (discord_id, started_at)",
+        "CREATE INDEX idx_player_sessions_identifier_started_at ON player_sessions (identifier, started_at)",
+        # Nur offene Sessions: klein, und genau der Lookup beim Abgang eines Spielers
+        "CREATE INDEX idx_player_sessions_open ON player_sessions (server, identifier) WHERE ended_at IS NULL",
+    )),
+    AuraCityMigration(5, "Track posted info-channel messages", (
+        """
+        CREATE TABLE channel_messages (
+            key TEXT PRIMARY KEY,
+            channel_id INTEGER NOT NULL,
+            message_id INTEGER NOT NULL,
+            content_hash TEXT NOT NULL  -- SHA-256 des zuletzt geposteten Inhalts
+        ) WITHOUT ROWID
+        """,
+    )),
+)
+
+# Abfragen der Lookup-Pfade, deren Query-Plan nach der Migration geprüft wird
+PLAN_CHECK_QUERIES: tuple[tuple[str, tuple], ...] = (
+    ("SELECT * FROM users WHERE discord_id = ?", (0,)),
+    ("SELECT * FROM bans WHERE discord_id = ?", (0,)),
+    ("SELECT * FROM blacklist WHERE discord_id = ?", (0,)),
+    ("SELECT * FROM deregistrations WHERE discord_id = ?", (0,)),
+    ("SELECT * FROM complaints WHERE discord_id = ?", (0,)),
+    ("DELETE FROM users WHERE discord_id = ?", (0,)),
+    ("DELETE FROM bans WHERE discord_id = ?", (0,)),
+    ("DELETE FROM blacklist WHERE discord_id = ?", (0,)),
+    ("DELETE FROM deregistrations WHERE discord_id = ?", (0,)),
+    ("DELETE FROM complaints WHERE discord_id = ?", (0,)),
+    ("SELECT SUM(count) FROM deregistration_counters WHERE discord_id = ? AND department = ?", (0, "")),
+    ("SELECT SUM(count) FROM deregistration_daily_counts WHERE discord_id = ? AND day BETWEEN ? AND ?", (0, "", "")),
+    ("UPDATE player_sessions SET ended_at = ? WHERE server = ? AND identifier = ? AND ended_at IS NULL", (0, "", "")),
+    ("SELECT started_at, ended_at FROM player_sessions WHERE discord_id = ? AND started_at < ?", (0, 0)),
+)
+
+
+class AuraCityMigrationRunner:
+    def __init__(self, logger: logging.Logger, migrations: tuple[AuraCityMigration, ...] = MIGRATIONS) -> None:
+        self.logger = logger
+        self.migrations = sorted(migrations, key=lambda migration: migration.version)
+
+    @property
+    def latest_version(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    @staticmethod
+    async def get_version(connection: aiosqlite.Connection) -> int:
+        async with connection.execute("PRAGMA user_version") as cursor:
+            row = await cursor.fetchone()
+        return row[0]
+
+    async def migrate(self, connection: aiosqlite.Connection) -> int:
+        """Wendet alle ausstehenden Migrationen an, jede in einer eigenen Transaktion.
+
+        Gibt die Anzahl der angewendeten Migrationen zurück.
+        """
+        current_version = await self.get_version(connection)
+        pending = [migration for migration in self.migrations if migration.version > current_version]
+
+        if not pending:
+            self.logger.debug(f"📐 Database schema is up to date (version {current_version})")
+            return 0
+
+        for i, migration in enumerate(pending):
+            await connection.execute("BEGIN")
+            try:
+                for statement in migration.statements:
+                    await connection.execute(statement)
+                # PRAGMA erlaubt keine Parameter, die Version ist aber immer ein int aus MIGRATIONS
+                await connection.execute(f"PRAGMA user_version = {int(migration.version)}")
+                await connection.commit()
+            except aiosqlite.Error:
+                await connection.rollback()
+                self.logger.error(f"🚨 Migration {migration.version} ({migration.description}) failed, rolled back")
+                raise
+
+            progress = ((i + 1) / len(pending)) * 100
+            self.logger.debug(
+                f"📐 Applied migration {migration.version}: {migration.description} ({progress:.2f}% completed)"
+            )
+
+        self.logger.debug(f"📐 Database schema migrated from version {current_version} to {self.latest_version}")
+        return len(pending)
+
+    async def analyze(self, connection: aiosqlite.Connection, full: bool) -> None:
+        """Aktualisiert die Statistiken des Query-Planners."""
+        # Ein volles ANALYZE nur nach Schemaänderungen, sonst reicht das günstige PRAGMA optimize
+        await connection.execute("ANALYZE" if full else "PRAGMA optimize")
+        await connection.commit()
+
+    async def check_query_plans(self, connection: aiosqlite.Connection,
+                                queries: tuple[tuple[str, tuple], ...] = PLAN_CHECK_QUERIES) -> list[str]:
+        """Meldet alle Lookup-Abfragen, deren Plan noch eine komplette Tabelle scannt."""
+        full_scans = []
+        for sql, params in queries:
+            async with connection.execute(f"EXPLAIN QUERY PLAN {sql}", params) as cursor:
+                plan = await cursor.fetchall()
+            for row in plan:
+                detail = row[3]
+                if detail.startswith("SCAN"):
+                    full_scans.append(f"{sql} -> {detail}")
+                    self.logger.warning(f"🐢 Full table scan in query plan: {sql} -> {detail}")
+
+        if not full_scans:
+            self.logger.debug(f"🔎 Query plans checked, no full table scans in {len(queries)} lookups")
+        return full_scans
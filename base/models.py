@@ -0,0 +1,81 @@
+import sqlite3
+from typing import Any, Callable, Optional
+from dataclasses import dataclass, fields, asdict
+
+
+# Zeilen-Typen der Tabellen. Die Feldreihenfolge bestimmt die SELECT-Spaltenliste (siehe columns()).
+
+@dataclass(frozen=True, slots=True)
+class UserRow:
+    id: int
+    discord_id: int
+    discriminator: str
+
+
+@dataclass(frozen=True, slots=True)
+class BanRow:
+    id: int
+    discord_id: int
+    reason: str
+
+
+@dataclass(frozen=True, slots=True)
+class BlacklistRow:
+    id: int
+    discord_id: int
+    reason: str
+
+
+@dataclass(frozen=True, slots=True)
+class DeregistrationRow:
+    id: int
+    discord_id: int
+    time_stamp: str
+    deregistration_count: int
+    reason: str
+    message: str
+    department: str
+
+
+@dataclass(frozen=True, slots=True)
+class ComplaintRow:
+    id: int
+    discord_id: int
+    message: str
+    category: str
+    complaint: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerSessionRow:
+    id: int
+    server: str
+    identifier: str
+    discord_id: Optional[int]
+    name: str
+    started_at: int
+    ended_at: Optional[int]
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelMessageRow:
+    key: str
+    channel_id: int
+    message_id: int
+    content_hash: str
+
+
+def columns(model: type) -> str:
+    """Spaltenliste für SELECT in der Reihenfolge der Modellfelder."""
+    return ", ".join(field.name for field in fields(model))
+
+
+def row_factory(model: type) -> Callable[[sqlite3.Cursor, tuple], Any]:
+    """row_factory für aiosqlite-Cursor, die direkt Modellinstanzen erzeugt."""
+    def factory(_cursor: sqlite3.Cursor, row: tuple) -> Any:
+        return model(*row)
+    return factory
+
+
+def to_dict(row: Any) -> dict:
+    return asdict(row)
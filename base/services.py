@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from base.logger import AuraCityLogger
+
+
+@dataclass
+class AuraCityServiceDefinition:
+    name: str
+    factory: Callable[["AuraCityServiceRegistry"], Any]
+    start: Optional[Callable[[Any], Awaitable[Any]]] = None
+    stop: Optional[Callable[[Any], Awaitable[Any]]] = None
+
+
+class AuraCityServiceRegistry:
+    """Baut jeden Dienst genau einmal und teilt ihn zwischen Bot und Cogs.
+
+    Dienste werden in Registrierungsreihenfolge gestartet und in umgekehrter Reihenfolge gestoppt.
+    Factories bekommen die Registry, damit sie ihre Abhängigkeiten über get() auflösen können.
+    """
+
+    def __init__(self) -> None:
+        self.logger = AuraCityLogger("AuraCityServices").get_logger()
+        self._definitions: dict[str, AuraCityServiceDefinition] = {}
+        self._instances: dict[str, Any] = {}
+        self._started: list[str] = []
+
+    def register(self, name: str, factory: Callable[["AuraCityServiceRegistry"], Any],
+                 start: Optional[Callable[[Any], Awaitable[Any]]] = None,
+                 stop: Optional[Callable[[Any], Awaitable[Any]]] = None) -> None:
+        if name in self._definitions:
+            raise ValueError(f"Service '{name}' is already registered")
+        self._definitions[name] = AuraCityServiceDefinition(name, factory, start, stop)
+
+    def get(self, name: str) -> Any:
+        """Gibt die (einzige) Instanz des Dienstes zurück und baut sie beim ersten Zugriff."""
+        if name not in self._instances:
+            definition = self._definitions.get(name)
+            if definition is None:
+                raise KeyError(f"Service '{name}' is not registered")
+            self._instances[name] = definition.factory(self)
+            self.logger.debug(f"🧩 Built service: {name}")
+        return self._instances[name]
+
+    def __getitem__(self, name: str) -> Any:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._definitions
+
+    async def start_all(self) -> None:
+        for name, definition in self._definitions.items():
+            if name in self._started:
+                continue
+            instance = self.get(name)
+            if definition.start is not None:
+                await definition.start(instance)
+                self.logger.debug(f"▶️ Started service: {name}")
+            self._started.append(name)
+
+    async def stop_all(self) -> None:
+        """Stoppt alle gestarteten Dienste rückwärts; ein Fehler hält die übrigen nicht auf."""
+        while self._started:
+            name = self._started.pop()
+            definition = self._definitions[name]
+            if definition.stop is None:
+                continue
+            try:
+                await definition.stop(self._instances[name])
+                self.logger.debug(f"⏹️ Stopped service: {name}")
+            except Exception as e:
+                self.logger.error(f"🚨 Error while stopping service {name}", exc_info=e)
@@ -0,0 +1,94 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class AuraCityLRUCache:
+    """Größenbegrenzter LRU-Cache mit TTL, der auch "nicht gefunden" (None) zwischenspeichert."""
+
+    LOAD_FAILED = object()  # Rückgabe eines Loaders bei Fehlern: wird nie gecacht, get_or_load gibt None zurück
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0, negative_ttl: float = 60.0) -> None:
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        # Wird bei jeder Invalidierung erhöht, damit ein paralleler Ladevorgang keinen veralteten Wert einträgt
+        self._generation = 0
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Gibt (gefunden, Wert) zurück. Abgelaufene Einträge zählen als nicht gefunden."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        if value is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        ttl = self.negative_ttl if value is None else self.ttl
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._generation += 1
+        self.invalidations += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Read-Through: liefert den gecachten Wert oder lädt ihn über den Loader nach.
+
+        None wird nur als echtes "nicht gefunden" gecacht; meldet der Loader LOAD_FAILED, bleibt der Cache unverändert.
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+
+        generation = self._generation
+        value = await loader()
+        if value is self.LOAD_FAILED:
+            return None
+        if generation == self._generation:
+            self.set(key, value)
+        return value
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
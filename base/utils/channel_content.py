@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+from typing import Optional
+from dataclasses import dataclass
+
+import discord
+
+from base.logger import AuraCityLogger
+from base.models import ChannelMessageRow
+
+
+@dataclass(frozen=True)
+class AuraCityChannelContent:
+    key: str  # Schlüssel in channel_messages, bleibt stabil, auch wenn sich Channel oder Inhalt ändern
+    channel_setting: str  # Name der Config-Eigenschaft mit der Channel-ID
+    content: str
+
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.content.encode()).hexdigest()
+
+
+# Angepinnte Info-Nachrichten, je eine pro Channel
+CHANNEL_CONTENT: tuple[AuraCityChannelContent, ...] = (
+    AuraCityChannelContent("rules", "RULES_CHANNEL_ID", "Regeln"),
+    AuraCityChannelContent("gesetze", "GESETZE_CHANNEL_ID", "Gesetze"),
+    AuraCityChannelContent("vorraum", "VORRAUM_CHANNEL_ID", "Vorraum für neue Mitglieder"),
+    AuraCityChannelContent("rechtsanfrage_lsmd", "LSMD_RECHTSANFRAGE_CHANNEL_ID", "Rechtsanfrage LSMD"),
+    AuraCityChannelContent("rechtsanfrage_lspd", "LSPD_RECHTSANFRAGE_CHANNEL_ID", "Rechtsanfrage LSPD"),
+    AuraCityChannelContent("funkcodes", "FUNKCODES_CHANNEL_ID", "Funkcodes"),
+    AuraCityChannelContent("lsmd_beschwerden", "LSMD_BESCHWERDE_CHANNEL_ID", "Beschwerden LSMD"),
+    AuraCityChannelContent("lspd_beschwerden", "LSPD_BESCHWERDE_CHANNEL_ID", "Beschwerden LSPD"),
+)
+
+
+class AuraCityChannelContentReconciler:
+    """Gleicht die angepinnten Info-Nachrichten mit CHANNEL_CONTENT ab, statt sie zu löschen und neu zu posten.
+
+    Message-ID und Inhalts-Hash jeder geposteten Nachricht stehen in channel_messages. Beim Abgleich wird eine
+    Nachricht nur bearbeitet, wenn sich ihr Inhalt geändert hat, und nur neu gepostet, wenn sie fehlt; ein
+    Neustart ohne Änderungen schreibt nichts. Ohne gespeicherten Eintrag wird eine bereits angepinnte
+    Nachricht des Bots mit gleichem Inhalt übernommen, damit nichts doppelt gepostet wird.
+    """
+
+    def __init__(self, bot: discord.Bot, config, database, content: tuple[AuraCityChannelContent, ...] = CHANNEL_CONTENT) -> None:
+        self.bot = bot
+        self.config = config
+        self.database = database
+        self.content = content
+        self.logger = AuraCityLogger("AuraCityChannelContent").get_logger()
+
+    async def reconcile(self) -> dict[str, int]:
+        """Gleicht alle Channels gleichzeitig ab und gibt zurück, wie viele Nachrichten was erfahren haben."""
+        guild = self.bot.get_guild(int(self.config.GUILD_ID_ACSD))
+        if guild is None:
+            self.logger.error("Guild not found.")
+            return {}
+
+        stored = await self.database.get_channel_messages()
+        results = await asyncio.gather(
+            *(self._reconcile_one(guild, entry, stored.get(entry.key)) for entry in self.content),
+            return_exceptions=True
+        )
+
+        counts = {"unchanged": 0, "adopted": 0, "edited": 0, "created": 0, "failed": 0}
+        for entry, result in zip(self.content, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"🚨 Could not reconcile channel content {entry.key}: {result}")
+                result = "failed"
+            counts[result] += 1
+        self.logger.info(f"📌 Channel content reconciled: {counts}")
+        return counts
+
+    async def _reconcile_one(self, guild: discord.Guild, entry: AuraCityChannelContent,
+                             row: Optional[ChannelMessageRow]) -> str:
+        channel = guild.get_channel(int(getattr(self.config, entry.channel_setting)))
+        if channel is None:
+            raise LookupError(f"channel {entry.channel_setting} not found")
+
+        message = None
+        if row is not None and row.channel_id == channel.id:
+            try:
+                message = await channel.fetch_message(row.message_id)
+            except discord.NotFound:
+                message = None  # Von Hand gelöscht, wird neu gepostet
+        else:
+            message = await self._find_pinned(channel, entry.content)
+            if message is not None:
+                await self._store(entry, message)
+                return "adopted"
+
+        if message is None:
+            message = await channel.send(entry.content)
+            await message.pin()
+            await self._store(entry, message)
+            return "created"
+
+        result = "unchanged"
+        if row.content_hash != entry.content_hash or message.content != entry.content:
+            await message.edit(content=entry.content)
+            await self._store(entry, message)
+            result = "edited"
+        if not message.pinned:
+            await message.pin()
+        return result
+
+    async def _find_pinned(self, channel: discord.TextChannel, content: str) -> Optional[discord.Message]:
+        for message in await channel.pins():
+            if message.author == self.bot.user and message.content == content:
+                return message
+        return None
+
+    async def _store(self, entry: AuraCityChannelContent, message: discord.Message) -> None:
+        await self.database.set_channel_message(entry.key, message.channel.id, message.id, entry.content_hash)
@@ -0,0 +1,177 @@
+import time
+import asyncio
+from typing import Optional
+from collections import deque
+
+import discord
+
+from base.logger import AuraCityLogger
+from base.utils.players import FiveMPlayer
+
+
+class AuraCityCounterChannel:
+    """Zustand eines Zähler-Channels: aufgelöster Channel, zuletzt gesetzter und gewünschter Name."""
+
+    def __init__(self, key: str, channel_id: int, role_id: int, template: str, renames_per_window: int) -> None:
+        self.key = key
+        self.channel_id = channel_id
+        self.role_id = role_id
+        self.template = template
+        self.channel: Optional[discord.abc.GuildChannel] = None
+        self.applied: Optional[str] = None  # Zuletzt gesetzter (bzw. beim Auflösen vorgefundener) Name
+        self.pending: Optional[str] = None  # Nur der neueste gewünschte Name, ältere werden überschrieben
+        self.renames: deque[float] = deque(maxlen=renames_per_window)  # time.monotonic() der letzten Umbenennungen
+
+    def next_rename_at(self, window: float) -> float:
+        """Frühester Zeitpunkt (monotonic), zu dem das Rename-Bucket eine weitere Umbenennung erlaubt."""
+        if len(self.renames) < self.renames.maxlen:
+            return 0.0
+        return self.renames[0] + window
+
+
+class AuraCityCounterChannelUpdater:
+    """Hält die LSPD/LSMD-Zähler-Channels aktuell, ohne in Discords Rename-Limit zu laufen.
+
+    Discord erlaubt pro Channel nur etwa 2 Umbenennungen in 10 Minuten. Neue Werte überschreiben daher nur den
+    ausstehenden Namen; ein einzelner Worker setzt den jeweils neuesten Wert, sobald das Bucket des Channels es
+    erlaubt, und überspringt Namen, die bereits gesetzt sind. Die Zählung stammt aus den Status-Snapshots.
+    """
+
+    RENAMES_PER_WINDOW = 2
+    RENAME_WINDOW = 600  # Sekunden
+
+    def __init__(self, bot: discord.Bot, config, utilities) -> None:
+        self.bot = bot
+        self.utilities = utilities
+        self.guild_id = int(config.GUILD_ID_ACSD)
+        self.logger = AuraCityLogger("AuraCityCounterChannels").get_logger()
+        self.counters = {
+            "lspd": AuraCityCounterChannel("lspd", int(config.LSPD_COUNTER_CHANNEL_ID), int(config.LSPD_ROLE_ID),
+                                           "🚓 {count}", self.RENAMES_PER_WINDOW),
+            "lsmd": AuraCityCounterChannel("lsmd", int(config.LSMD_COUNTER_CHANNEL_ID), int(config.LSMD_ROLE_ID),
+                                           "🚑 {count}", self.RENAMES_PER_WINDOW),
+        }
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.renames = 0
+        self.merged = 0  # Ausstehende Werte, die durch einen neueren ersetzt wurden, bevor sie gesetzt werden konnten
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def set_count(self, key: str, count: int) -> None:
+        """Merkt den neuen Wert vor; ist er bereits gesetzt, wird nichts getan."""
+        counter = self.counters[key]
+        name = counter.template.format(count=count)
+        if counter.pending is not None:
+            self.merged += 1
+        counter.pending = None if name == counter.applied else name
+        if counter.pending is not None:
+            self._wakeup.set()
+
+    async def on_status(self, _status) -> None:
+        """Listener für FiveMStatusSnapshot: zählt die online Dienstmitglieder aus den Snapshots aller Server neu."""
+        guild = self.bot.get_guild(self.guild_id)
+        if guild is None:
+            return
+        if not self._statuses_complete():
+            return  # players.json fehlgeschlagen: alte Zählung behalten statt auf 0 und zurück umzubenennen
+
+        counts = dict.fromkeys(self.counters, 0)
+        for discord_id in self._online_discord_ids():
+            member = guild.get_member(discord_id)
+            if member is None:
+                continue
+            for key, counter in self.counters.items():
+                if member.get_role(counter.role_id) is not None:
+                    counts[key] += 1
+
+        for key, count in counts.items():
+            self.set_count(key, count)
+
+    def _statuses_complete(self) -> bool:
+        return all(monitor.status_snapshot.current is None or monitor.status_snapshot.current.complete
+                   for monitor in self.utilities.servers.values())
+
+    def _online_discord_ids(self) -> set[int]:
+        discord_ids = set()
+        for monitor in self.utilities.servers.values():
+            status = monitor.status_snapshot.current
+            if status is None or not status.online:
+                continue
+            for payload in status.players:
+                player = FiveMPlayer.from_payload(payload)
+                if player is not None and player.discord_id is not None:
+                    discord_ids.add(player.discord_id)
+        return discord_ids
+
+    def _resolve(self, counter: AuraCityCounterChannel) -> Optional[discord.abc.GuildChannel]:
+        """Löst den Channel einmal auf und cached ihn; der vorgefundene Name gilt als bereits gesetzt."""
+        if counter.channel is None:
+            guild = self.bot.get_guild(self.guild_id)
+            counter.channel = guild.get_channel(counter.channel_id) if guild is not None else None
+            if counter.channel is None:
+                self.logger.error(f"Counter channel {counter.key} ({counter.channel_id}) not found.")
+                return None
+            counter.applied = counter.channel.name
+            if counter.pending == counter.applied:
+                counter.pending = None
+        return counter.channel
+
+    async def run(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            delay = await self._apply_due()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _apply_due(self) -> Optional[float]:
+        """Setzt alle ausstehenden Namen, deren Bucket es erlaubt; gibt die Wartezeit bis zum nächsten zurück."""
+        next_due = None
+        for counter in self.counters.values():
+            if counter.pending is None:
+                continue
+            channel = self._resolve(counter)
+            if channel is None:
+                counter.pending = None
+                continue
+            if counter.pending is None:  # Der aufgelöste Channel hatte den Namen bereits
+                continue
+
+            now = time.monotonic()
+            rename_at = counter.next_rename_at(self.RENAME_WINDOW)
+            if rename_at > now:
+                next_due = rename_at - now if next_due is None else min(next_due, rename_at - now)
+                continue
+
+            name = counter.pending
+            counter.renames.append(now)  # Auch fehlgeschlagene Versuche zählen, um Discord nicht zu fluten
+            try:
+                await channel.edit(name=name)
+                counter.applied = name
+                self.renames += 1
+                if counter.pending == name:
+                    counter.pending = None
+            except discord.NotFound:
+                counter.channel = None  # Beim nächsten Mal neu auflösen
+                self.logger.error(f"Counter channel {counter.key} no longer exists.")
+            except discord.HTTPException as e:
+                self.logger.error(f"Error editing channel: {e}")
+
+            if counter.pending is not None:
+                rename_at = counter.next_rename_at(self.RENAME_WINDOW) - time.monotonic()
+                next_due = rename_at if next_due is None else min(next_due, rename_at)
+        return None if next_due is None else max(next_due, 0.0)
@@ -0,0 +1,174 @@
+import time
+import random
+import asyncio
+from typing import AsyncIterator, Optional
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from base.logger import AuraCityLogger
+
+
+@dataclass(frozen=True)
+class AuraCityRetryPolicy:
+    """Legt fest, ob und wann ein Request wiederholt wird.
+
+    Wiederholt wird nur, bevor eine Antwort an den Aufrufer geht: bei Verbindungsfehlern, Timeouts oder einem
+    Status aus retry_statuses, und nur für idempotente Methoden. Für eigenes Verhalten should_retry/delay
+    in einer Unterklasse überschreiben.
+    """
+    attempts: int = 1  # Versuche insgesamt, 1 = keine Wiederholung
+    backoff: float = 0.5
+    max_backoff: float = 5.0
+    retry_statuses: frozenset[int] = frozenset({502, 503, 504})
+    retry_methods: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def should_retry(self, method: str, attempt: int, status: Optional[int] = None,
+                     error: Optional[BaseException] = None) -> bool:
+        if attempt >= self.attempts or method.upper() not in self.retry_methods:
+            return False
+        return error is not None or status in self.retry_statuses
+
+    def delay(self, attempt: int) -> float:
+        """Exponentielles Backoff mit Jitter vor dem Versuch attempt + 1."""
+        delay = min(self.max_backoff, self.backoff * 2 ** min(attempt - 1, 16))
+        return random.uniform(delay / 2, delay)
+
+
+NO_RETRY = AuraCityRetryPolicy()
+
+
+@dataclass
+class AuraCityHostStats:
+    requests: int = 0
+    errors: int = 0  # Verbindungsfehler, Timeouts und Status >= 500
+    retries: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_latency * 1000, 1),
+        }
+
+
+class AuraCityHttpClient:
+    """Gemeinsamer HTTP-Client des Bots: eine Session, ein Connection-Pool, feste Timeouts und Metriken je Host.
+
+    Wird vom Bot beim Start geöffnet und beim Herunterfahren geschlossen (Service "http"). Alle ausgehenden
+    Requests laufen über request(), das Latenz (bis zu den Antwort-Headern), Fehler und Wiederholungen zählt.
+    """
+
+    def __init__(self, connection_limit: int = 100, connection_limit_per_host: int = 0, keepalive_timeout: float = 60,
+                 dns_cache_ttl: int = 300, total_timeout: float = 30, connect_timeout: float = 5,
+                 retry_policy: AuraCityRetryPolicy = NO_RETRY) -> None:
+        self.logger = AuraCityLogger("AuraCityHttpClient").get_logger()
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self.retry_policy = retry_policy
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.host_stats: dict[str, AuraCityHostStats] = {}
+
+    @classmethod
+    def from_config(cls, config) -> "AuraCityHttpClient":
+        return cls(
+            connection_limit=config.HTTP_CONNECTION_LIMIT,
+            connection_limit_per_host=config.HTTP_CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+            dns_cache_ttl=config.HTTP_DNS_CACHE_TTL,
+            total_timeout=config.HTTP_TIMEOUT,
+            connect_timeout=config.HTTP_CONNECT_TIMEOUT,
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return self.session is not None and not self.session.closed
+
+    async def open(self) -> None:
+        if self.is_open:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        self.logger.debug(f"🌐 HTTP client opened (limit {self.connection_limit}, keep-alive {self.keepalive_timeout}s)")
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+            self.logger.debug(f"🌐 HTTP client closed, stats: {self.stats()}")
+
+    def _stats_for(self, url: str) -> AuraCityHostStats:
+        host = urlsplit(url).netloc or url
+        stats = self.host_stats.get(host)
+        if stats is None:
+            stats = self.host_stats[host] = AuraCityHostStats()
+        return stats
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, retry_policy: Optional[AuraCityRetryPolicy] = None,
+                      **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Wie session.request(), aber mit Metriken und Wiederholungen nach der Retry-Policy.
+
+        Fehler des letzten Versuchs (aiohttp.ClientError, asyncio.TimeoutError) werden an den Aufrufer gereicht.
+        """
+        if not self.is_open:
+            await self.open()
+
+        policy = retry_policy or self.retry_policy
+        stats = self._stats_for(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            stats.requests += 1
+            started = time.perf_counter()
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._record_latency(stats, started)
+                stats.errors += 1
+                if not policy.should_retry(method, attempt, error=e):
+                    raise
+                stats.retries += 1
+                await asyncio.sleep(policy.delay(attempt))
+                continue
+
+            self._record_latency(stats, started)
+            if response.status >= 500:
+                stats.errors += 1
+            if policy.should_retry(method, attempt, status=response.status):
+                response.release()
+                stats.retries += 1
+                await asyncio.sleep(policy.delay(attempt))
+                continue
+            break
+
+        try:
+            yield response
+        finally:
+            response.release()
+
+    @staticmethod
+    def _record_latency(stats: AuraCityHostStats, started: float) -> None:
+        latency = time.perf_counter() - started
+        stats.total_latency += latency
+        stats.max_latency = max(stats.max_latency, latency)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {host: stats.as_dict() for host, stats in self.host_stats.items()}
@@ -0,0 +1,449 @@
+import time
+import heapq
+import asyncio
+import itertools
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Coroutine, Mapping, Optional, Union
+from dataclasses import dataclass, field
+
+import discord
+
+from base.logger import AuraCityLogger
+
+
+class AuraCityPriority(IntEnum):
+    """Kleinere Werte laufen zuerst."""
+    MODERATION = 0  # Bans, Kicks, Rollen
+    INTERACTION = 1  # Antworten an User, Willkommensnachrichten
+    DEFAULT = 2
+    LOG = 3  # Log-Channels
+
+
+class AuraCityTokenBucket:
+    """Token-Bucket einer Route: capacity Aufrufe, aufgefüllt mit capacity/per Tokens pro Sekunde.
+
+    Passt sich an: Rate-Limit-Header (aus 429-Antworten) sperren das Bucket bis zum Reset, blockierte Aufrufe
+    halbieren die Rate, erfolgreiche Aufrufe erhöhen sie wieder schrittweise bis zum Ausgangswert (AIMD).
+    """
+
+    MIN_RATE_FACTOR = 0.125
+
+    def __init__(self, capacity: int, per: float) -> None:
+        self.capacity = capacity
+        self.base_rate = capacity / per
+        self.rate = self.base_rate
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> float:
+        """Nimmt ein Token und gibt 0 zurück, sonst die Wartezeit in Sekunden bis zum nächsten Token."""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    @property
+    def is_idle(self) -> bool:
+        """Voll aufgefüllt und nicht gesperrt, das Bucket kann ohne Zustandsverlust verworfen werden."""
+        now = time.monotonic()
+        self._refill(now)
+        return self.tokens >= self.capacity and now >= self.blocked_until and self.rate == self.base_rate
+
+    def block(self, seconds: float) -> None:
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Übernimmt Discords Rate-Limit-Header (X-RateLimit-*, Retry-After)."""
+        try:
+            limit = headers.get("X-RateLimit-Limit")
+            if limit is not None and int(limit) > 0:
+                self.capacity = int(limit)
+            retry_after = headers.get("Retry-After")
+            reset_after = headers.get("X-RateLimit-Reset-After")
+            remaining = headers.get("X-RateLimit-Remaining")
+            if retry_after is not None:
+                self.block(float(retry_after))
+            elif remaining == "0" and reset_after is not None:
+                self.block(float(reset_after))
+        except ValueError:
+            pass
+
+    def slow_down(self) -> None:
+        self.rate = max(self.base_rate * self.MIN_RATE_FACTOR, self.rate / 2)
+
+    def recover(self) -> None:
+        self.rate = min(self.base_rate, self.rate + self.base_rate * self.MIN_RATE_FACTOR)
+
+
+class AuraCityMergedMessage:
+    """Fabrik für eine Nachricht, an die bis zum Versand weitere Zeilen angehängt werden können."""
+
+    MAX_LENGTH = 2000  # Discords Limit für message.content
+
+    def __init__(self, target: Any, content: str) -> None:
+        self.target = target
+        self.lines = [content]
+        self.length = len(content)
+
+    def append(self, content: str) -> bool:
+        if self.length + 1 + len(content) > self.MAX_LENGTH:
+            return False
+        self.lines.append(content)
+        self.length += 1 + len(content)
+        return True
+
+    def __call__(self) -> Awaitable[Any]:
+        return self.target.send("\n".join(self.lines))
+
+
+@dataclass(order=True)
+class AuraCityOutboundJob:
+    priority: int
+    sequence: int
+    call: Union[Callable[[], Awaitable[Any]], Coroutine] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(default_factory=time.monotonic, compare=False)
+    attempts: int = field(default=0, compare=False)
+
+    @property
+    def retryable(self) -> bool:
+        """Nur Fabriken können nach einem Rate-Limit erneut ausgeführt werden, Coroutine-Objekte nur einmal."""
+        return not asyncio.iscoroutine(self.call)
+
+    async def run(self) -> Any:
+        self.attempts += 1
+        return await (self.call if asyncio.iscoroutine(self.call) else self.call())
+
+
+class AuraCityRoute:
+    def __init__(self, key: str, bucket: AuraCityTokenBucket) -> None:
+        self.key = key
+        self.bucket = bucket
+        self.jobs: list[AuraCityOutboundJob] = []  # Heap nach (Priorität, Reihenfolge)
+        self.busy = False  # Pro Route läuft höchstens ein Aufruf, die Reihenfolge in einem Channel bleibt erhalten
+        self.queued_priority: Optional[int] = None  # Priorität des gültigen Eintrags in der Ready-Queue
+        self.entry = 0  # Kennung des gültigen Eintrags, ältere Einträge werden verworfen
+        self.waiting_until = 0.0  # Wartet auf ein Token, ein Timer stellt die Route danach wieder ein
+        self.merge_job: Optional[AuraCityOutboundJob] = None  # Noch nicht gestartete Log-Nachricht zum Anhängen
+
+
+class AuraCityOutboundScheduler:
+    """Verschickt Discord-Aufrufe über Token-Buckets je Route mit einer festen Anzahl Worker.
+
+    Routen sind z.B. channel:<id>, guild:<id>, webhook:<id> oder user:<id>. Jede Route mit wartenden Aufrufen
+    steht höchstens einmal in einer gemeinsamen PriorityQueue, sortiert nach der Priorität ihres nächsten
+    Aufrufs. Worker nehmen die dringendste Route, holen ein Token aus ihrem Bucket und führen genau einen
+    Aufruf aus; fehlt das Token, wird die Route per Timer wieder eingestellt, ohne einen Worker zu blockieren.
+    So laufen verschiedene Channels parallel und Moderation überholt Log-Nachrichten.
+
+    Die Zahl wartender und laufender Aufrufe ist auf max_pending begrenzt. Ist die Queue voll, warten Aufrufer in submit()
+    auf einen freien Platz; Log-Nachrichten warten nie: sie werden verworfen bzw. von wichtigeren Aufrufen
+    verdrängt. Reine Text-Logs an denselben Channel werden zu einer Nachricht zusammengefasst.
+    """
+
+    # (Aufrufe, Sekunden) je Routen-Typ, angelehnt an Discords Limits
+    ROUTE_LIMITS = {
+        "channel": (5, 5.0),
+        "guild": (10, 10.0),
+        "webhook": (5, 2.0),
+        "user": (5, 5.0),
+    }
+    DEFAULT_LIMIT = (5, 5.0)
+    MAX_RATE_LIMIT_RETRIES = 3
+    SLOW_CALL_SECONDS = 2.0  # Dauert ein Aufruf länger, hat discord.py vermutlich auf ein Rate-Limit gewartet
+    DROPPABLE_PRIORITY = AuraCityPriority.LOG  # Ab dieser Priorität wird bei voller Queue verworfen statt gewartet
+
+    def __init__(self, workers: int = 4, max_pending: int = 1000) -> None:
+        self.logger = AuraCityLogger("AuraCityOutbound").get_logger()
+        self.worker_count = workers
+        self.max_pending = max_pending
+        self._routes: dict[str, AuraCityRoute] = {}
+        self._ready: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._slots = asyncio.Semaphore(max_pending)  # Ein Platz je wartendem oder laufendem Aufruf
+        self._closed = False
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.dropped = 0
+        self.merged = 0
+        self.total_queue_wait = 0.0  # Summe der Zeiten vom Einstellen bis zum Start
+        self.max_queue_wait = 0.0
+        self.total_backpressure_wait = 0.0  # Summe der Zeiten, die Aufrufer auf einen freien Platz gewartet haben
+        self.max_backpressure_wait = 0.0
+
+    async def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker(), name=f"outbound-worker-{i}")
+                             for i in range(self.worker_count)]
+
+    async def close(self) -> None:
+        """Stoppt die Worker; laufende und nicht ausgeführte Aufrufe werden abgebrochen, ihre Coroutines geschlossen."""
+        self._closed = True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for route in self._routes.values():
+            for job in route.jobs:
+                self._discard(job)
+                self._release()  # Weckt wartende Aufrufer, die ihren Aufruf dann ebenfalls verwerfen
+        self._routes.clear()
+
+    @staticmethod
+    def _discard(job: Union[AuraCityOutboundJob, Coroutine]) -> None:
+        call = job.call if isinstance(job, AuraCityOutboundJob) else job
+        if asyncio.iscoroutine(call):
+            call.close()  # Verhindert "coroutine was never awaited"
+        if isinstance(job, AuraCityOutboundJob) and not job.future.done():
+            job.future.cancel()
+
+    def _release(self) -> None:
+        """Gibt den Platz eines Aufrufs frei, der beendet oder verworfen wurde."""
+        self.pending -= 1
+        self._slots.release()
+
+    @staticmethod
+    def route_for(target: Any) -> str:
+        """Routen-Schlüssel für ein Discord-Objekt (Channel, Thread, Guild, Webhook, Member/User)."""
+        if isinstance(target, discord.Webhook):
+            return f"webhook:{target.id}"
+        if isinstance(target, discord.Guild):
+            return f"guild:{target.id}"
+        if isinstance(target, (discord.Member, discord.User)):
+            return f"user:{target.id}"  # DMs laufen über den DM-Channel des Users
+        if isinstance(target, discord.abc.Messageable) or hasattr(target, "id"):
+            return f"channel:{target.id}"
+        return "default"
+
+    def _route(self, key: str) -> AuraCityRoute:
+        route = self._routes.get(key)
+        if route is None:
+            capacity, per = self.ROUTE_LIMITS.get(key.partition(":")[0], self.DEFAULT_LIMIT)
+            route = self._routes[key] = AuraCityRoute(key, AuraCityTokenBucket(capacity, per))
+        return route
+
+    async def submit(self, call: Union[Callable[[], Awaitable[Any]], Coroutine], route: str,
+                     priority: int = AuraCityPriority.DEFAULT) -> asyncio.Future:
+        """Stellt einen Aufruf ein; call ist bevorzugt eine Fabrik (lambda: channel.send(...)).
+
+        Wartet nur, bis ein Platz in der Queue frei ist, nicht auf den Versand. Gibt ein Future mit dem Ergebnis
+        zurück; Fehler werden zusätzlich geloggt, Warten auf das Future ist optional. Verworfene Aufrufe
+        erhalten ein abgebrochenes Future.
+        """
+        return (await self._enqueue(call, route, priority)).future
+
+    async def _enqueue(self, call: Union[Callable[[], Awaitable[Any]], Coroutine], route: str,
+                       priority: int) -> AuraCityOutboundJob:
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(self._consume_exception)
+        job = AuraCityOutboundJob(int(priority), next(self._sequence), call, future)
+        if not await self._acquire(job.priority):
+            self._discard(job)
+            return job
+
+        route_state = self._route(route)
+        heapq.heappush(route_state.jobs, job)
+        self._schedule(route_state)
+        return job
+
+    async def send(self, target: Any, *args, priority: int = AuraCityPriority.DEFAULT, **kwargs) -> asyncio.Future:
+        """target.send(*args, **kwargs) über die Route des Ziels.
+
+        Reine Textnachrichten mit Log-Priorität werden an eine noch wartende Log-Nachricht desselben Ziels
+        angehängt, solange sie in eine Discord-Nachricht passt; beide teilen sich dann ein Future.
+        """
+        route = self.route_for(target)
+        if priority >= self.DROPPABLE_PRIORITY and len(args) == 1 and isinstance(args[0], str) and not kwargs:
+            route_state = self._routes.get(route)
+            merge_job = route_state.merge_job if route_state is not None else None
+            if merge_job is not None and merge_job.priority == priority and merge_job.call.append(args[0]):
+                self.merged += 1
+                return merge_job.future
+
+            job = await self._enqueue(AuraCityMergedMessage(target, args[0]), route, priority)
+            if not job.future.done():
+                self._routes[route].merge_job = job
+            return job.future
+
+        return await self.submit(lambda: target.send(*args, **kwargs), route, priority)
+
+    async def _acquire(self, priority: int) -> bool:
+        """Reserviert einen Platz; False, wenn der Aufruf verworfen werden soll."""
+        if self._closed:
+            return False
+        if self._slots.locked():
+            if self._evict(priority):
+                self.pending += 1  # Der Platz des verdrängten Aufrufs geht direkt über
+                return True
+            if priority >= self.DROPPABLE_PRIORITY:
+                self.dropped += 1
+                return False
+
+            started = time.monotonic()
+            await self._slots.acquire()
+            waited = time.monotonic() - started
+            self.total_backpressure_wait += waited
+            self.max_backpressure_wait = max(self.max_backpressure_wait, waited)
+        else:
+            await self._slots.acquire()
+
+        if self._closed:
+            self._slots.release()
+            return False
+        self.pending += 1
+        return True
+
+    def _evict(self, priority: int) -> bool:
+        """Verwirft den jüngsten wartenden Aufruf der niedrigsten Priorität, sofern sie unter priority liegt."""
+        victim: Optional[tuple[AuraCityRoute, AuraCityOutboundJob]] = None
+        for route in self._routes.values():
+            for job in route.jobs:
+                if job.priority >= self.DROPPABLE_PRIORITY and job.priority > priority and (
+                        victim is None or (job.priority, job.sequence) > (victim[1].priority, victim[1].sequence)):
+                    victim = route, job
+        if victim is None:
+            return False
+
+        route, job = victim
+        route.jobs.remove(job)
+        heapq.heapify(route.jobs)
+        if route.merge_job is job:
+            route.merge_job = None
+        self._discard(job)
+        self.pending -= 1
+        self.dropped += 1
+        return True
+
+    async def moderate(self, guild: discord.Guild, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Bans, Kicks und Rollen über die Route der Guild mit höchster Priorität; wartet auf das Ergebnis."""
+        return await (await self.submit(call, self.route_for(guild), AuraCityPriority.MODERATION))
+
+    @staticmethod
+    def _consume_exception(future: asyncio.Future) -> None:
+        if not future.cancelled():
+            future.exception()  # Bereits geloggt, kein "exception was never retrieved"
+
+    def _schedule(self, route: AuraCityRoute) -> None:
+        if route.busy or not route.jobs or route.waiting_until > time.monotonic():
+            return  # Der Worker bzw. der Timer stellt die Route danach selbst wieder ein
+        priority = route.jobs[0].priority
+        if route.queued_priority is not None and route.queued_priority <= priority:
+            return
+        route.entry += 1
+        route.queued_priority = priority
+        self._ready.put_nowait((priority, next(self._sequence), route.key, route.entry))
+
+    def _wake(self, route: AuraCityRoute) -> None:
+        route.waiting_until = 0.0
+        self._schedule(route)
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, key, entry = await self._ready.get()
+            route = self._routes.get(key)
+            if route is None or entry != route.entry or route.busy or not route.jobs:
+                continue  # Veralteter Eintrag
+            route.queued_priority = None
+
+            wait = route.bucket.try_acquire()
+            if wait > 0:
+                route.waiting_until = time.monotonic() + wait
+                loop.call_later(wait, self._wake, route)
+                continue
+
+            job = heapq.heappop(route.jobs)
+            if route.merge_job is job:
+                route.merge_job = None  # Ab jetzt wird die Nachricht gesendet, nichts mehr anhängen
+            waited = time.monotonic() - job.enqueued_at
+            self.total_queue_wait += waited
+            self.max_queue_wait = max(self.max_queue_wait, waited)
+            route.busy = True
+            requeued = False
+            try:
+                requeued = await self._run(route, job)
+            except asyncio.CancelledError:
+                if not job.future.done():
+                    job.future.cancel()  # close() beendet den Worker mitten im Aufruf, der Aufrufer soll nicht ewig warten
+                raise
+            finally:
+                route.busy = False
+                if not requeued:
+                    self._release()
+                if route.jobs:
+                    self._schedule(route)
+                elif route.bucket.is_idle:
+                    del self._routes[key]  # Leere Routen mit vollem Bucket halten keinen Zustand
+
+    async def _run(self, route: AuraCityRoute, job: AuraCityOutboundJob) -> bool:
+        """Führt einen Aufruf aus; True, wenn er nach einem Rate-Limit wieder eingestellt wurde."""
+        if job.future.done():  # Vom Aufrufer abgebrochen
+            self._discard(job)
+            return False
+
+        started = time.monotonic()
+        try:
+            result = await job.run()
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self.rate_limited += 1
+                route.bucket.update_from_headers(getattr(e.response, "headers", {}) or {})
+                route.bucket.slow_down()
+                if job.retryable and job.attempts < self.MAX_RATE_LIMIT_RETRIES:
+                    heapq.heappush(route.jobs, job)
+                    return True
+            self.failed += 1
+            self.logger.error(f"🚨 Outbound call on {route.key} failed: {e}")
+            job.future.set_exception(e)
+            return False
+        except Exception as e:
+            self.failed += 1
+            self.logger.error(f"🚨 Outbound call on {route.key} failed: {e}", exc_info=e)
+            job.future.set_exception(e)
+            return False
+
+        # discord.py wartet Rate-Limits selbst ab; ein auffällig langsamer Aufruf heißt, das Bucket ist zu großzügig
+        if time.monotonic() - started > self.SLOW_CALL_SECONDS:
+            route.bucket.slow_down()
+        else:
+            route.bucket.recover()
+        self.completed += 1
+        if not job.future.done():
+            job.future.set_result(result)
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        depth = dict.fromkeys((priority.name.lower() for priority in AuraCityPriority), 0)
+        for route in self._routes.values():
+            for job in route.jobs:
+                depth[AuraCityPriority(job.priority).name.lower()] += 1
+        started = self.completed + self.failed
+        return {
+            "routes": len(self._routes),
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "depth": depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "dropped": self.dropped,
+            "merged": self.merged,
+            "avg_queue_wait_ms": round(self.total_queue_wait / started * 1000, 1) if started else 0.0,
+            "max_queue_wait_ms": round(self.max_queue_wait * 1000, 1),
+            "avg_backpressure_wait_ms": round(self.total_backpressure_wait / started * 1000, 1) if started else 0.0,
+            "max_backpressure_wait_ms": round(self.max_backpressure_wait * 1000, 1),
+        }
@@ -0,0 +1,131 @@
+import time
+from typing import Any, Awaitable, Callable, Iterable, Optional
+from dataclasses import dataclass
+
+from base.logger import AuraCityLogger
+
+
+@dataclass(frozen=True, slots=True)
+class FiveMPlayer:
+    identifier: str  # Stabiler Schlüssel über Polls hinweg (bevorzugt license:)
+    name: str
+    server_id: int = 0  # In-Game-ID, nach einem Neustart des Bots unbekannt (0)
+    discord_id: Optional[int] = None
+
+    # Reihenfolge, in der Identifier als Schlüssel bevorzugt werden
+    IDENTIFIER_PRIORITY = ("license:", "license2:", "fivem:", "steam:", "discord:")
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> Optional["FiveMPlayer"]:
+        """Baut einen Spieler aus einem Eintrag von players.json; None, wenn er keinen Identifier hat."""
+        if not isinstance(payload, dict):
+            return None
+        identifiers = [str(identifier) for identifier in payload.get("identifiers") or ()]
+
+        key = next((identifier for prefix in cls.IDENTIFIER_PRIORITY
+                    for identifier in identifiers if identifier.startswith(prefix)), None)
+        if key is None:
+            return None
+
+        discord_identifier = next((identifier for identifier in identifiers if identifier.startswith("discord:")), None)
+        discord_id = discord_identifier.removeprefix("discord:") if discord_identifier else ""
+        return cls(
+            identifier=key,
+            name=str(payload.get("name") or "Unbekannt"),
+            server_id=int(payload.get("id") or 0),
+            discord_id=int(discord_id) if discord_id.isdigit() else None
+        )
+
+
+@dataclass(frozen=True)
+class FiveMPlayerChanges:
+    """Beitritte und Abgänge eines Servers zwischen zwei Polls (Payload von on_fivem_players_changed)."""
+    server: str
+    joined: tuple[FiveMPlayer, ...]
+    left: tuple[FiveMPlayer, ...]
+    online: int
+    timestamp: int
+
+
+class AuraCityPlayerTracker:
+    """Ermittelt Beitritte und Abgänge aus aufeinanderfolgenden Spielerlisten und führt die Sessions.
+
+    Je Server wird der letzte Stand als Dict Identifier -> Spieler gehalten, der Vergleich ist damit O(n) pro Poll.
+    Sessions werden beim Beitritt geöffnet und beim Abgang geschlossen; beim Start werden die offenen Sessions
+    aus der Datenbank als letzter Stand übernommen, damit ein Neustart des Bots keine Sessions zerreißt.
+    """
+
+    def __init__(self, database, servers: Iterable[str]) -> None:
+        self.database = database
+        self.servers = tuple(servers)
+        self.logger = AuraCityLogger("AuraCityPlayerTracker").get_logger()
+        self._online: dict[str, dict[str, FiveMPlayer]] = {}
+        self._listeners: list[Callable[[FiveMPlayerChanges], Awaitable[Any]]] = []
+
+    def add_listener(self, callback: Callable[[FiveMPlayerChanges], Awaitable[Any]]) -> None:
+        """Registriert einen Callback, der bei jeder Änderung der Spielerliste aufgerufen wird."""
+        self._listeners.append(callback)
+
+    async def restore(self) -> None:
+        """Übernimmt die offenen Sessions als letzten Stand; Sessions nicht mehr konfigurierter Server werden beendet."""
+        servers = set(self.servers)
+        stale = set()
+        for session in await self.database.get_open_player_sessions():
+            if session.server not in servers:
+                stale.add(session.server)
+                continue
+            self._online.setdefault(session.server, {})[session.identifier] = FiveMPlayer(
+                identifier=session.identifier,
+                name=session.name,
+                discord_id=session.discord_id
+            )
+
+        for server in stale:
+            await self.database.close_player_sessions(server, int(time.time()))
+            self.logger.debug(f"🎮 Closed open sessions of unconfigured server {server}")
+
+        restored = sum(len(players) for players in self._online.values())
+        self.logger.debug(f"🎮 Restored {restored} open player sessions")
+
+    def online_players(self, server: str) -> list[FiveMPlayer]:
+        return list(self._online.get(server, {}).values())
+
+    async def update(self, server: str, status) -> Optional[FiveMPlayerChanges]:
+        """Listener für FiveMStatusSnapshot: vergleicht die Spielerliste mit dem letzten Stand des Servers."""
+        if not status.complete:
+            return None  # Spielerliste konnte nicht geladen werden, das ist kein Abgang aller Spieler
+
+        current: dict[str, FiveMPlayer] = {}
+        if status.online:
+            for payload in status.players:
+                player = FiveMPlayer.from_payload(payload)
+                if player is not None:
+                    current[player.identifier] = player
+
+        previous = self._online.get(server, {})
+        joined = tuple(player for identifier, player in current.items() if identifier not in previous)
+        left = tuple(player for identifier, player in previous.items() if identifier not in current)
+
+        if not joined and not left:
+            self._online[server] = current
+            return None
+
+        timestamp = int(status.fetched_on.timestamp()) if status.fetched_on else int(time.time())
+        recorded = await self.database.record_player_changes(
+            server,
+            [(player.identifier, player.discord_id, player.name) for player in joined],
+            [player.identifier for player in left],
+            timestamp
+        )
+        if not recorded:
+            return None  # Letzter Stand bleibt, der nächste Poll erfasst dieselben Beitritte und Abgänge erneut
+        self._online[server] = current
+
+        changes = FiveMPlayerChanges(server, joined, left, len(current), timestamp)
+        self.logger.debug(f"🎮 [{server}] {len(joined)} joined, {len(left)} left, {len(current)} online")
+        for listener in self._listeners:
+            try:
+                await listener(changes)
+            except Exception as e:
+                self.logger.error(f"🚨 Error in player change listener: {e}", exc_info=e)
+        return changes
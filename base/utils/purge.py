@@ -0,0 +1,142 @@
+import time
+import asyncio
+from typing import Awaitable, Callable, Optional
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass
+
+import discord
+
+from base.logger import AuraCityLogger
+
+
+@dataclass(frozen=True)
+class AuraCityPurgeFilter:
+    """Filter für /clear; angepinnte Nachrichten werden nie gelöscht."""
+    user_id: Optional[int] = None
+    contains: Optional[str] = None  # Ohne Beachtung der Groß-/Kleinschreibung
+    attachments_only: bool = False
+    after: Optional[datetime] = None
+    before: Optional[datetime] = None
+
+    def matches(self, message: discord.Message) -> bool:
+        if message.pinned:
+            return False
+        if self.user_id is not None and message.author.id != self.user_id:
+            return False
+        if self.attachments_only and not message.attachments:
+            return False
+        if self.contains is not None and self.contains.casefold() not in message.content.casefold():
+            return False
+        return True  # after/before begrenzen bereits channel.history()
+
+
+@dataclass
+class AuraCityPurgeProgress:
+    scanned: int = 0
+    matched: int = 0
+    bulk_deleted: int = 0
+    single_deleted: int = 0
+    failed: int = 0
+    done: bool = False
+
+    @property
+    def deleted(self) -> int:
+        return self.bulk_deleted + self.single_deleted
+
+
+class AuraCityPurgeEngine:
+    """Löscht bis zu amount passende Nachrichten eines Channels mit einem einzigen Durchlauf durch die History.
+
+    channel.history() lädt Seiten zu 100 Nachrichten; Filter werden direkt beim Scannen angewendet. Nachrichten
+    jünger als 14 Tage werden in Blöcken von 100 per Bulk-Delete gelöscht, sobald ein Block voll ist (parallel
+    zum weiteren Scannen). Ältere Nachrichten kann Discord nur einzeln löschen, das läuft mit höchstens
+    SINGLE_DELETE_CONCURRENCY Aufrufen gleichzeitig. on_progress wird höchstens alle PROGRESS_INTERVAL Sekunden
+    und einmal am Ende aufgerufen.
+    """
+
+    BULK_DELETE_SIZE = 100  # Discords Limit für delete_messages
+    BULK_DELETE_MAX_AGE = timedelta(days=14)
+    BULK_DELETE_MARGIN = timedelta(minutes=5)  # Puffer, damit eine Nachricht nicht während des Löschens zu alt wird
+    SINGLE_DELETE_CONCURRENCY = 4
+    PROGRESS_INTERVAL = 2.0
+    MAX_SCANNED = 10_000  # Obergrenze für sehr selektive Filter
+
+    def __init__(self, channel: discord.abc.Messageable, amount: int, purge_filter: AuraCityPurgeFilter = AuraCityPurgeFilter(),
+                 on_progress: Optional[Callable[[AuraCityPurgeProgress], Awaitable[None]]] = None) -> None:
+        self.channel = channel
+        self.amount = amount
+        self.filter = purge_filter
+        self.on_progress = on_progress
+        self.progress = AuraCityPurgeProgress()
+        self.logger = AuraCityLogger("AuraCityPurge").get_logger()
+        self._single_slots = asyncio.Semaphore(self.SINGLE_DELETE_CONCURRENCY)
+        self._tasks: list[asyncio.Task] = []
+        self._last_report = 0.0
+
+    async def run(self) -> AuraCityPurgeProgress:
+        bulk_cutoff = datetime.now(timezone.utc) - self.BULK_DELETE_MAX_AGE + self.BULK_DELETE_MARGIN
+        bulk: list[discord.Message] = []
+
+        try:
+            async for message in self.channel.history(limit=self.MAX_SCANNED, before=self.filter.before,
+                                                      after=self.filter.after, oldest_first=False):
+                self.progress.scanned += 1
+                if self.filter.matches(message):
+                    self.progress.matched += 1
+                    if message.created_at > bulk_cutoff:
+                        bulk.append(message)
+                        if len(bulk) == self.BULK_DELETE_SIZE:
+                            self._tasks.append(asyncio.create_task(self._delete_bulk(bulk)))
+                            bulk = []
+                    else:
+                        self._tasks.append(asyncio.create_task(self._delete_single(message)))
+                    if self.progress.matched >= self.amount:
+                        break
+                await self._report()
+
+            if bulk:
+                self._tasks.append(asyncio.create_task(self._delete_bulk(bulk)))
+            await asyncio.gather(*self._tasks)
+        finally:
+            for task in self._tasks:
+                task.cancel()
+
+        self.progress.done = True
+        await self._report(force=True)
+        return self.progress
+
+    async def _delete_bulk(self, messages: list[discord.Message]) -> None:
+        try:
+            await self.channel.delete_messages(messages)
+            self.progress.bulk_deleted += len(messages)
+        except discord.NotFound:
+            # Bereits (teilweise) gelöscht, der Rest einzeln
+            await asyncio.gather(*(self._delete_single(message) for message in messages))
+        except discord.HTTPException as e:
+            self.progress.failed += len(messages)
+            self.logger.error(f"🚨 Bulk delete of {len(messages)} messages failed: {e}")
+        await self._report()
+
+    async def _delete_single(self, message: discord.Message) -> None:
+        async with self._single_slots:
+            try:
+                await message.delete()
+                self.progress.single_deleted += 1
+            except discord.NotFound:
+                pass  # Bereits gelöscht
+            except discord.HTTPException as e:
+                self.progress.failed += 1
+                self.logger.error(f"🚨 Deleting message {message.id} failed: {e}")
+        await self._report()
+
+    async def _report(self, force: bool = False) -> None:
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < self.PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        try:
+            await self.on_progress(self.progress)
+        except Exception as e:
+            self.logger.warning(f"Could not report purge progress: {e}")
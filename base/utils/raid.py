@@ -0,0 +1,179 @@
+import time
+import asyncio
+from typing import Optional
+from collections import deque
+
+import discord
+
+from base.logger import AuraCityLogger
+from base.utils.outbound import AuraCityPriority
+
+
+class AuraCityRaidMode:
+    """Erkennt Beitrittswellen und verarbeitet Beitritte dann gesammelt.
+
+    Normal behandelt Events.on_member_join jeden Beitritt einzeln. Kommen mehr als join_threshold Beitritte
+    innerhalb von join_window Sekunden, schaltet sich der Raid-Modus ein: Beitritte werden batch_window Sekunden
+    gepuffert und dann gemeinsam verarbeitet, mit einer Abfrage und einem Insert für alle User, je einer
+    Willkommens-, Willkommen-zurück- und Log-Nachricht und Bot-Bans über guild.bulk_ban mit begrenzter Parallelität, als
+    Moderationsaufrufe über den Outbound-Scheduler. Der Modus endet, sobald die Beitrittsrate wieder unter der
+    Schwelle liegt und der Puffer leer ist.
+    """
+
+    BULK_BAN_SIZE = 200  # Discords Limit für guild.bulk_ban
+    MESSAGE_LENGTH = 2000
+    BAN_REASON = "Bot wurde aus dem Server verbannt."
+
+    def __init__(self, bot: discord.Bot, config, database, outbound, crash_report_handler) -> None:
+        self.bot = bot
+        self.config = config
+        self.database = database
+        self.outbound = outbound
+        self.crash_report_handler = crash_report_handler
+        self.logger = AuraCityLogger("AuraCityRaidMode").get_logger()
+        self.join_threshold = config.RAID_JOIN_THRESHOLD
+        self.join_window = config.RAID_JOIN_WINDOW
+        self.batch_window = config.RAID_BATCH_WINDOW
+        self._ban_slots = asyncio.Semaphore(config.RAID_BAN_CONCURRENCY)
+        self._joins: deque[float] = deque()  # time.monotonic() der Beitritte im aktuellen join_window
+        self._buffer: list[discord.Member] = []
+        self._flush_task: Optional[asyncio.Task] = None  # Einzige Flush-Schleife, gesetzt bis sie endet
+        self._closing = asyncio.Event()
+        self.active = False
+        self.batches = 0
+
+    async def close(self) -> None:
+        """Verarbeitet einen noch gepufferten Batch, damit keine Beitritte in der Datenbank fehlen."""
+        self._closing.set()  # Weckt die Flush-Schleife, sie verarbeitet den Puffer sofort und endet
+        if self._flush_task is not None:
+            await self._flush_task
+        await self.flush()
+
+    def _join_rate(self) -> int:
+        """Anzahl der Beitritte in den letzten join_window Sekunden."""
+        now = time.monotonic()
+        while self._joins and self._joins[0] <= now - self.join_window:
+            self._joins.popleft()
+        return len(self._joins)
+
+    def handle_join(self, member: discord.Member) -> bool:
+        """Zählt den Beitritt; True, wenn er gepuffert wurde und der Aufrufer ihn nicht selbst verarbeiten soll."""
+        self._joins.append(time.monotonic())
+        rate = self._join_rate()
+        if not self.active:
+            if rate <= self.join_threshold:
+                return False
+            self.active = True
+            self.logger.warning(f"🛡️ Raid mode enabled: {rate} joins in {self.join_window}s.")
+
+        self._buffer.append(member)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        return True
+
+    async def _flush_loop(self) -> None:
+        """Verarbeitet alle batch_window Sekunden einen Batch, bis die Rate wieder sinkt oder close() aufgerufen wird."""
+        try:
+            while not self._closing.is_set():
+                try:
+                    await asyncio.wait_for(self._closing.wait(), timeout=self.batch_window)
+                except asyncio.TimeoutError:
+                    pass
+                await self.flush()
+                if not self._buffer and self._join_rate() <= self.join_threshold:
+                    self.active = False
+                    self.logger.warning("🛡️ Raid mode disabled, join rate is back to normal.")
+                    break
+        finally:
+            self._flush_task = None  # Erst nach dem letzten Flush, sonst startet handle_join eine zweite Schleife
+
+    async def flush(self) -> None:
+        """Verarbeitet alle gepufferten Beitritte als einen Batch."""
+        batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        self.batches += 1
+
+        try:
+            bots = [member for member in batch if member.bot]
+            humans = [member for member in batch if not member.bot]
+
+            known = await self.database.get_users_many(member.id for member in humans)
+            new = [member for member in humans if member.id not in known]
+            returning = [member for member in humans if member.id in known]
+            await self.database.add_users_many((member.id, member.discriminator) for member in new)
+
+            banned = await self._ban_bots(bots)
+            await self._announce(new, returning, bots, banned)
+            self.logger.info(f"🛡️ Raid batch: {len(new)} new, {len(returning)} returning, {banned}/{len(bots)} bots banned.")
+        except Exception as e:
+            await self.crash_report_handler.save_error(e)
+            self.logger.error(f"🚨 Error processing raid batch of {len(batch)} joins: {e}")
+
+    async def _ban_bots(self, bots: list[discord.Member]) -> int:
+        """Bannt Bots per bulk_ban je Guild in Blöcken von 200, höchstens RAID_BAN_CONCURRENCY Aufrufe gleichzeitig."""
+        by_guild: dict[discord.Guild, list[discord.Member]] = {}
+        for member in bots:
+            by_guild.setdefault(member.guild, []).append(member)
+
+        chunks = [
+            (guild, members[start:start + self.BULK_BAN_SIZE])
+            for guild, members in by_guild.items()
+            for start in range(0, len(members), self.BULK_BAN_SIZE)
+        ]
+        results = await asyncio.gather(*(self._ban_chunk(guild, members) for guild, members in chunks))
+        return sum(results)
+
+    async def _ban_chunk(self, guild: discord.Guild, members: list[discord.Member]) -> int:
+        async with self._ban_slots:
+            try:
+                banned, _ = await self.outbound.moderate(guild, lambda: guild.bulk_ban(*members, reason=self.BAN_REASON))
+                return len(banned)
+            except discord.HTTPException as e:
+                self.logger.warning(f"Bulk ban failed ({e}), banning {len(members)} bots one by one.")
+
+        results = await asyncio.gather(*(self._ban_one(guild, member) for member in members))
+        return sum(results)
+
+    async def _ban_one(self, guild: discord.Guild, member: discord.Member) -> int:
+        async with self._ban_slots:
+            try:
+                await self.outbound.moderate(guild, lambda: member.ban(reason=self.BAN_REASON))
+                return 1
+            except discord.HTTPException as e:
+                self.logger.error(f"Could not ban bot {member}: {e}")
+                return 0
+
+    async def _announce(self, new: list[discord.Member], returning: list[discord.Member],
+                        bots: list[discord.Member], banned: int) -> None:
+        """Je Batch eine Willkommens-, Willkommen-zurück- und Log-Nachricht (bei vielen Mentions aufgeteilt)."""
+        welcome_channel = self.bot.get_channel(self.config.WELCOME_CHANNEL_ID)
+        logs_join_channel = self.bot.get_channel(self.config.JOIN_LOGS_CHANNEL_ID)
+
+        if welcome_channel is not None:
+            for content in self._mention_messages("Willkommen auf dem Server, ", new, "!"):
+                await self.outbound.send(welcome_channel, content, priority=AuraCityPriority.INTERACTION)
+            # Rückkehrer wie in Events.on_member_join gesondert begrüßen
+            for content in self._mention_messages("Willkommen zurück, ", returning, "!"):
+                await self.outbound.send(welcome_channel, content, priority=AuraCityPriority.INTERACTION)
+
+        if logs_join_channel is not None:
+            summary = (f"Raid mode: {len(new) + len(returning) + len(bots)} joins "
+                       f"({len(new)} first time, {len(returning)} returning, {banned}/{len(bots)} bots banned): ")
+            for content in self._mention_messages(summary, new + returning + bots, ""):
+                await self.outbound.send(logs_join_channel, content, priority=AuraCityPriority.LOG)
+
+    def _mention_messages(self, prefix: str, members: list[discord.Member], suffix: str) -> list[str]:
+        messages: list[str] = []
+        current: list[str] = []
+        length = len(prefix) + len(suffix)
+        for member in members:
+            mention = member.mention
+            if current and length + len(mention) + 2 > self.MESSAGE_LENGTH:
+                messages.append(prefix + ", ".join(current) + suffix)
+                current, length = [], len(prefix) + len(suffix)
+            current.append(mention)
+            length += len(mention) + 2
+        if current:
+            messages.append(prefix + ", ".join(current) + suffix)
+        return messages
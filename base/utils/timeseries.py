@@ -0,0 +1,249 @@
+import os
+import mmap
+import time
+from typing import Any, Mapping, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class PlayerCountStats:
+    start: float
+    end: float
+    resolution: str
+    samples: int
+    min: int
+    max: int
+    avg: float
+    percentiles: dict[int, float] = field(default_factory=dict)
+
+
+class AuraCityRing:
+    """Ringpuffer fester Größe über einem Ausschnitt des Memory-Maps.
+
+    Jeder Eintrag besteht aus 5 int64: [bucket_start, min, max, sum, count]. Die Position (head) und die
+    Anzahl der belegten Einträge liegen im Header der Datei, damit der Ring Neustarts übersteht.
+    """
+
+    RECORD_SIZE = 5
+
+    def __init__(self, name: str, resolution: int, capacity: int, data: memoryview, offset: int,
+                 header: memoryview, header_index: int) -> None:
+        self.name = name
+        self.resolution = resolution  # Sekunden pro Bucket, 0 = Rohdaten
+        self.capacity = capacity
+        self._data = data
+        self._offset = offset
+        self._header = header
+        self._header_index = header_index
+
+    @property
+    def _head(self) -> int:
+        return self._header[self._header_index]
+
+    @property
+    def length(self) -> int:
+        return self._header[self._header_index + 1]
+
+    def _position(self, logical_index: int) -> int:
+        """Physische int64-Position des logischen Eintrags (0 = ältester)."""
+        oldest = (self._head - self.length) % self.capacity
+        return self._offset + ((oldest + logical_index) % self.capacity) * self.RECORD_SIZE
+
+    def bucket_start(self, logical_index: int) -> int:
+        return self._data[self._position(logical_index)]
+
+    def record(self, bucket: int, value: int) -> None:
+        data = self._data
+        if self.length:
+            last = self._position(self.length - 1)
+            last_bucket = data[last]
+            if self.resolution and last_bucket == bucket:
+                data[last + 1] = min(data[last + 1], value)
+                data[last + 2] = max(data[last + 2], value)
+                data[last + 3] += value
+                data[last + 4] += 1
+                return
+            if bucket < last_bucket:
+                return  # Verspätete Werte werden verworfen, der Ring bleibt chronologisch sortiert
+
+        position = self._offset + self._head * self.RECORD_SIZE
+        data[position] = bucket
+        data[position + 1] = value
+        data[position + 2] = value
+        data[position + 3] = value
+        data[position + 4] = 1
+        self._header[self._header_index] = (self._head + 1) % self.capacity
+        self._header[self._header_index + 1] = min(self.length + 1, self.capacity)
+
+    def oldest_bucket(self) -> Optional[int]:
+        return self.bucket_start(0) if self.length else None
+
+    def last(self) -> Optional[tuple[int, ...]]:
+        if not self.length:
+            return None
+        position = self._position(self.length - 1)
+        return tuple(self._data[position:position + self.RECORD_SIZE])
+
+    def find(self, start: float) -> int:
+        """Logischer Index des ersten Buckets, der bei start oder später beginnt (binäre Suche)."""
+        low, high = 0, self.length
+        while low < high:
+            middle = (low + high) // 2
+            if self.bucket_start(middle) < start:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def records(self, start: float, end: float):
+        """Einträge im Bereich [start, end) als (bucket_start, min, max, sum, count)."""
+        index = self.find(start)
+        while index < self.length:
+            position = self._position(index)
+            if self._data[position] >= end:
+                return
+            yield tuple(self._data[position:position + self.RECORD_SIZE])
+            index += 1
+
+
+class AuraCityPlayerCountSeries:
+    """Zeitreihe der Spieleranzahl mit Rollups (Minute, Stunde, Tag) in einer Memory-Mapped-Datei.
+
+    Jeder Poll wird in O(1) in alle Ringe eingetragen. Abfragen lesen nur die Rollups, nie die Rohdaten,
+    und wählen die feinste Auflösung, die den Zeitraum abdeckt und höchstens MAX_BUCKETS Einträge liest.
+    """
+
+    MAGIC = 0x41435053  # "ACPS"
+    VERSION = 1
+    MAX_BUCKETS = 2000
+    RINGS = (
+        ("raw", 0, 8064),  # 28 Tage bei 5-Minuten-Polls
+        ("minute", 60, 10080),  # 7 Tage
+        ("hour", 3600, 24 * 180),  # 180 Tage
+        ("day", 86400, 365 * 5),  # 5 Jahre
+    )
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.header_size = 2 + 2 * len(self.RINGS)
+        self.total_size = self.header_size + sum(capacity for _, _, capacity in self.RINGS) * AuraCityRing.RECORD_SIZE
+        # Buckets an der lokalen Zeit ausrichten, damit "Tag" und "20 Uhr" der Uhr im Discord entsprechen
+        self.utc_offset = int(datetime.now().astimezone().utcoffset().total_seconds())
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        size_in_bytes = self.total_size * 8
+        new_file = not os.path.exists(path) or os.path.getsize(path) != size_in_bytes
+        with open(path, "a+b") as f:
+            f.truncate(size_in_bytes)
+        self._file = open(path, "r+b")
+        self._mmap = mmap.mmap(self._file.fileno(), size_in_bytes)
+        self._view = memoryview(self._mmap).cast("q")
+        self._header = self._view[:self.header_size]
+
+        if new_file or self._header[0] != self.MAGIC or self._header[1] != self.VERSION:
+            self._view[:] = memoryview(bytearray(size_in_bytes)).cast("q")
+            self._header[0] = self.MAGIC
+            self._header[1] = self.VERSION
+
+        self.rings: dict[str, AuraCityRing] = {}
+        offset = self.header_size
+        for i, (name, resolution, capacity) in enumerate(self.RINGS):
+            self.rings[name] = AuraCityRing(name, resolution, capacity, self._view, offset, self._header, 2 + 2 * i)
+            offset += capacity * AuraCityRing.RECORD_SIZE
+
+    def _bucket(self, timestamp: int, resolution: int) -> int:
+        if not resolution:
+            return timestamp
+        return timestamp - ((timestamp + self.utc_offset) % resolution)
+
+    def record(self, value: int, timestamp: Optional[float] = None) -> None:
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        for ring in self.rings.values():
+            ring.record(self._bucket(timestamp, ring.resolution), int(value))
+
+    async def record_poll(self, statuses: Mapping[str, Any]) -> None:
+        """Poll-Listener von AuraCityUtilities: trägt je Monitor-Durchlauf die Spieleranzahl aller Server zusammen ein.
+
+        Fehlt die Spielerliste eines Servers, wird der Durchlauf ausgelassen; die Teilsumme wäre ein falscher Einbruch.
+        """
+        if not statuses or not all(status.complete for status in statuses.values()):
+            return
+        self.record(sum(status.player_count for status in statuses.values() if status.online))
+
+    def latest(self) -> Optional[tuple[int, int]]:
+        """(Zeitstempel, Wert) des letzten Rohwerts."""
+        record = self.rings["raw"].last()
+        return (record[0], record[1]) if record else None
+
+    def _choose_ring(self, start: float, end: float) -> AuraCityRing:
+        rollups = [ring for ring in self.rings.values() if ring.resolution]
+        for ring in rollups:
+            oldest = ring.oldest_bucket()
+            if oldest is None:
+                continue
+            # Ein Ring, der noch nie übergelaufen ist, enthält alle Daten seit dem ersten Poll
+            covers = oldest <= start or ring.length < ring.capacity
+            if covers and (end - max(start, oldest)) / ring.resolution <= self.MAX_BUCKETS:
+                return ring
+        return rollups[-1]
+
+    def stats(self, start: float, end: float, percentiles: tuple[int, ...] = (50, 95)) -> Optional[PlayerCountStats]:
+        """Min/Max/Durchschnitt/Perzentile im Zeitraum [start, end).
+
+        Min, Max und Durchschnitt sind exakt (bezogen auf ganze Buckets). Perzentile werden aus den
+        Bucket-Durchschnitten gewichtet nach Anzahl der Polls geschätzt.
+        """
+        ring = self._choose_ring(start, end)
+        minimum, maximum, total, count = None, None, 0, 0
+        averages: list[tuple[float, int]] = []
+
+        for _, bucket_min, bucket_max, bucket_sum, bucket_count in ring.records(self._bucket(int(start), ring.resolution), end):
+            if not bucket_count:
+                continue
+            minimum = bucket_min if minimum is None else min(minimum, bucket_min)
+            maximum = bucket_max if maximum is None else max(maximum, bucket_max)
+            total += bucket_sum
+            count += bucket_count
+            averages.append((bucket_sum / bucket_count, bucket_count))
+
+        if not count:
+            return None
+
+        averages.sort()
+        result = {}
+        for percentile in percentiles:
+            threshold = percentile / 100 * count
+            running = 0
+            for value, weight in averages:
+                running += weight
+                if running >= threshold:
+                    result[percentile] = round(value, 2)
+                    break
+
+        return PlayerCountStats(start, end, ring.name, count, minimum, maximum, round(total / count, 2), result)
+
+    def hour_of_day_average(self, start: float, end: float, hour: int) -> Optional[float]:
+        """Durchschnittliche Spieleranzahl zu einer Uhrzeit (z.B. 20 Uhr) über alle Tage im Zeitraum."""
+        ring = self.rings["hour"]
+        total, count = 0, 0
+        for bucket, _, _, bucket_sum, bucket_count in ring.records(self._bucket(int(start), ring.resolution), end):
+            if ((bucket + self.utc_offset) % 86400) // 3600 == hour:
+                total += bucket_sum
+                count += bucket_count
+        return round(total / count, 2) if count else None
+
+    def flush(self) -> None:
+        self._mmap.flush()
+
+    async def close(self) -> None:
+        if self._mmap.closed:
+            return
+        self.flush()
+        self._header.release()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
@@ -1,151 +1,600 @@
 import os
 import json
+import time
+import random
+import hashlib
 import zipfile
-from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Optional
+from dataclasses import dataclass
+from collections import defaultdict
 
 import aiohttp
 import asyncio
 import discord
 import aiofiles
 from base.logger import AuraCityLogger
+from base.utils.http import AuraCityHttpClient
+from base.utils.outbound import AuraCityOutboundScheduler
 from base.config import AuraCityBotConfig
 from datetime import datetime, timedelta
 
-class AuraCityUtilities:
-    SLEEP_INTERVAL_PLAYERS = 300  # 5 Minuten in Sekunden
-    SLEEP_INTERVAL_OTHERS = 86400   # 24 Stunden in Sekunden
-    CHECK_INTERVAL = 5  # Intervall in Sekunden
+try:
+    import orjson  # Optional: deutlich schnelleres Parsen großer Payloads
+except ImportError:
+    orjson = None
+
+@dataclass(frozen=True)
+class FiveMStatus:
+    """Unveränderlicher Stand des FiveM-Servers zu einem Zeitpunkt."""
+    online: bool
+    players: tuple = ()
+    fetched_at: float = 0.0  # time.monotonic()
+    fetched_on: Optional[datetime] = None
+    complete: bool = True  # False, wenn die Spielerliste nicht geladen werden konnte und der Server nicht sicher offline ist
+
+    @property
+    def player_count(self) -> int:
+        return len(self.players)
+
+
+@dataclass
+class FiveMEndpointStats:
+    """Latenz- und Fehlerzähler eines FiveM-Endpunkts."""
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+
+    def record(self, latency: float, ok: bool, timed_out: bool = False) -> None:
+        self.requests += 1
+        self.errors += 0 if ok else 1
+        self.timeouts += 1 if timed_out else 0
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_latency * 1000, 1),
+            "last_ms": round(self.last_latency * 1000, 1),
+        }
 
-    def __init__(self):
-        self.config = AuraCityBotConfig()
-        self.logger = AuraCityLogger("AuraCityBot-Utilities").get_logger()
-        self.session = None  # Initialisiere die Session als None
-        self.last_download_info = None  # Zeitpunkt des letzten Downloads für Info
-        self.last_download_dynamic = None  # Zeitpunkt des letzten Downloads für Dynamic
-        self.user_message_count = defaultdict(list)  # Benutzer-ID zu einer Liste von Nachrichtenzeitstempeln
 
-    async def async_init(self) -> None:
-        """Initialisiere die HTTP-Client-Session."""
-        if self.session is None:
+class FiveMCircuitBreaker:
+    """Sperrt Abrufe, solange der Server als offline gilt.
+
+    Nach jedem Fehlschlag bleibt der Breaker offen, bis eine exponentiell wachsende Wartezeit (mit Jitter,
+    damit Neustarts nicht synchron pollen) abgelaufen ist. Danach wird genau ein Probe-Abruf durchgelassen;
+    gelingt er, schließt sich der Breaker, sonst verdoppelt sich die Wartezeit bis max_delay. Als sicher offline
+    gilt der Server erst nach offline_after Fehlschlägen in Folge; einzelne Timeouts sind nur unvollständige Polls.
+    """
+
+    def __init__(self, base_delay: float = 30.0, max_delay: float = 1800.0, offline_after: int = 3) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.offline_after = offline_after
+        self.failures = 0
+        self.open_until = 0.0  # time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    @property
+    def confirms_offline(self) -> bool:
+        return self.failures >= self.offline_after
+
+    def allow(self) -> bool:
+        return not self.is_open
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self) -> float:
+        """Öffnet den Breaker und gibt die Wartezeit in Sekunden zurück."""
+        self.failures += 1
+        delay = min(self.max_delay, self.base_delay * 2 ** min(self.failures - 1, 16))
+        delay = random.uniform(delay / 2, delay)  # "Equal Jitter"
+        self.open_until = time.monotonic() + delay
+        return delay
+
+
+class FiveMStatusSnapshot:
+    """Gemeinsamer, im Speicher gehaltener Serverstatus mit TTL.
+
+    Alle Leser (Presence, Zähler-Kanäle, Befehle, Monitor) greifen auf denselben Stand zu. Ist er abgelaufen,
+    holt genau ein Aufruf neue Daten; parallele Aufrufer warten auf denselben Request (Single-Flight).
+    """
+
+    def __init__(self, monitor: "FiveMServerMonitor", ttl: float = 60.0) -> None:
+        self.monitor = monitor
+        self.ttl = ttl
+        self._status: Optional[FiveMStatus] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self._listeners: list[Callable[[FiveMStatus], Awaitable[Any]]] = []
+
+    def add_listener(self, callback: Callable[[FiveMStatus], Awaitable[Any]]) -> None:
+        """Registriert einen Callback, der nach jedem erfolgreichen Abruf mit dem neuen Stand aufgerufen wird."""
+        self._listeners.append(callback)
+
+    @property
+    def current(self) -> Optional[FiveMStatus]:
+        """Letzter bekannter Stand, ohne neue Daten zu holen."""
+        return self._status
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        max_age = self.ttl if max_age is None else max_age
+        return self._status is not None and time.monotonic() - self._status.fetched_at < max_age
+
+    async def get(self, max_age: Optional[float] = None) -> FiveMStatus:
+        if self.is_fresh(max_age):
+            return self._status
+        return await self.refresh()
+
+    async def refresh(self) -> FiveMStatus:
+        """Holt neue Daten; läuft bereits ein Abruf, wird dessen Ergebnis geteilt."""
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._fetch())
+            self._inflight.add_done_callback(self._clear_inflight)
+        # shield: bricht ein Aufrufer ab, läuft der Abruf für die anderen weiter
+        return await asyncio.shield(self._inflight)
+
+    def _clear_inflight(self, _task: asyncio.Task) -> None:
+        self._inflight = None
+
+    async def _fetch(self) -> FiveMStatus:
+        if self.monitor.circuit_breaker.allow():
+            # Status und Spielerliste sind unabhängig: parallel abrufen, der Abruf dauert so lange wie der langsamere
+            online, players = await asyncio.gather(
+                self.monitor._request_server_status(),
+                self.monitor._request_players()
+            )
+            # Ein einzelner fehlgeschlagener Abruf ist kein Abgang aller Spieler, erst ein bestätigtes Offline
+            complete = players is not None if online else self.monitor.circuit_breaker.confirms_offline
+            players = players if online and players is not None else []
+        else:
+            online, players = False, []  # Breaker offen, keine Requests bis zum nächsten Probe
+            complete = self.monitor.circuit_breaker.confirms_offline
+        self._status = FiveMStatus(
+            online=online,
+            players=tuple(players),
+            fetched_at=time.monotonic(),
+            fetched_on=datetime.now(),
+            complete=complete
+        )
+        for listener in self._listeners:
             try:
-                self.session = aiohttp.ClientSession()  # Initialisiere die Session im asynchronen Kontext
-                self.logger.debug("HTTP ClientSession initialisiert.")
+                await listener(self._status)
             except Exception as e:
-                self.logger.error(f"Fehler beim Initialisieren der Session: {e}")
-                if self.session is not None:
-                    await self.session.close()
-                    self.session = None
+                self.monitor.logger.error(f"🚨 Error in FiveM status listener: {e}", exc_info=e)
+        return self._status
+
+
+@dataclass
+class FiveMDownloadState:
+    """Validatoren und Inhalt des letzten erfolgreichen Downloads einer URL."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    sha256: Optional[str] = None
+    size: int = 0
+    data: Any = None
+
+
+@dataclass
+class FiveMDownloadResult:
+    ok: bool
+    changed: bool = False
+    data: Any = None  # Nur gesetzt, wenn mit keep_data=True abgerufen
+
+
+class FiveMEndpointDownloader:
+    """Lädt JSON-Endpunkte nur, wenn sich etwas geändert hat.
+
+    Unterstützt der Server ETag/Last-Modified, wird ein Conditional GET gesendet (304 = nichts übertragen).
+    Sonst wird der SHA-256 des Bodys verglichen und bei identischem Inhalt weder geparst noch geschrieben.
+    Dateien werden blockweise in eine Temp-Datei gestreamt, validiert und atomar per Rename ersetzt. Das Streamen
+    spart nur den Text-Puffer der Antwort: zum Validieren wird die Datei vollständig gelesen und geparst, der
+    Spitzenspeicher bleibt also etwa Dateigröße plus geparste Daten.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, monitor: "FiveMServerMonitor", cache_dir: str, pretty_json: bool = False) -> None:
+        self.monitor = monitor
+        self.cache_dir = cache_dir
+        self.pretty_json = pretty_json  # Zusätzlich eingerückt speichern (größer, kostet CPU)
+        self._states: dict[str, FiveMDownloadState] = {}
+
+        self.requests = 0
+        self.not_modified = 0  # 304-Antworten
+        self.unchanged = 0  # 200, aber gleicher Inhalts-Hash
+        self.writes = 0
+        self.writes_avoided = 0
+        self.bytes_downloaded = 0
+        self.bytes_avoided = 0  # Dank 304 nicht übertragene Bytes
+
+    async def fetch(self, url: str, filename: Optional[str] = None, keep_data: bool = True) -> FiveMDownloadResult:
+        """Lädt die URL; mit filename wird der Inhalt nach cache_dir geschrieben (nur bei Änderungen).
+
+        keep_data=False hält die geparsten Daten nicht im Speicher (z.B. für große info/dynamic-Payloads).
+        """
+        state = self._states.setdefault(url, FiveMDownloadState())
+        have_previous = state.sha256 is not None and (not keep_data or state.data is not None)
+
+        headers = {}
+        if have_previous and state.etag:
+            headers["If-None-Match"] = state.etag
+        if have_previous and state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+        self.requests += 1
+        temp_path = None
+        try:
+            async with self.monitor.http.get(url, headers=headers) as response:
+                if response.status == 304 and have_previous:
+                    self.not_modified += 1
+                    self.writes_avoided += 1 if filename else 0
+                    self.bytes_avoided += state.size
+                    return FiveMDownloadResult(ok=True, changed=False, data=state.data)
+
+                if response.status != 200:
+                    self.monitor.logger.error(f"Fehler beim Herunterladen von Daten von {url}: {response.status}")
+                    return FiveMDownloadResult(ok=False)
+
+                digest = hashlib.sha256()
+                size = 0
+                body = bytearray()
+                if filename:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    temp_path = os.path.join(self.cache_dir, f".{filename}.{os.getpid()}.tmp")
+                    async with aiofiles.open(temp_path, "wb") as f:
+                        async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                            digest.update(chunk)
+                            size += len(chunk)
+                            await f.write(chunk)
+                else:
+                    async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                        digest.update(chunk)
+                        size += len(chunk)
+                        body.extend(chunk)
 
-    async def close(self) -> None:
-        """Schließe die HTTP-Client-Session."""
-        if self.session is not None:
-            await self.session.close()  # Schließe die Session, wenn sie nicht mehr benötigt wird
-            self.session = None
-            self.logger.debug("HTTP ClientSession geschlossen.")
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
 
-    async def download_if_online(self) -> None:
-        """Überprüfe, ob der Server online ist und lade JSON-Daten von vordefinierten URLs herunter."""
-        if self.session is None:
-            await self.async_init()  # Stelle sicher, dass die Session initialisiert ist
+            self.bytes_downloaded += size
+            state.etag, state.last_modified = etag, last_modified
 
-        if await self.server_status():
-            await self.download_player_count()  # Lade Spieleranzahl alle 5 Minuten
-            await self.download_info_and_dynamic()  # Lade info und Dynamic alle 24 Stunden
-        else:
-            self.logger.warning("Server ist offline. Herunterladen übersprungen.")
+            sha256 = digest.hexdigest()
+            if have_previous and sha256 == state.sha256:
+                self.unchanged += 1
+                self.writes_avoided += 1 if filename else 0
+                return FiveMDownloadResult(ok=True, changed=False, data=state.data)
 
-    async def download_player_count(self) -> None:
-        """Lade die Spieleranzahl herunter und speichere sie in einer Datei."""
-        await self._download_and_save(self.config.FIVEM_PLAYER_URL, "fivem_players.json")
+            try:
+                if filename:
+                    data = await asyncio.to_thread(self._load_json_file, temp_path)
+                else:
+                    data = self._loads(bytes(body))
+            except ValueError as e:  # json.JSONDecodeError und orjson.JSONDecodeError erben von ValueError
+                self.monitor.logger.error(f"Fehler beim Dekodieren von JSON von {url}: {e}")
+                return FiveMDownloadResult(ok=False)
+
+            if filename:
+                file_path = os.path.join(self.cache_dir, filename)
+                if self.pretty_json:
+                    await asyncio.to_thread(self._dump_pretty, data, temp_path)
+                os.replace(temp_path, file_path)  # Atomar: Leser sehen nie eine halb geschriebene Datei
+                temp_path = None
+                self.writes += 1
+
+            state.sha256, state.size = sha256, size
+            state.data = data if keep_data else None
+            return FiveMDownloadResult(ok=True, changed=True, data=state.data)
+
+        except aiohttp.ClientError as e:
+            self.monitor.logger.error(f"Fehler beim Herunterladen von Daten von {url}: {e}")
+            return FiveMDownloadResult(ok=False)
+        except TimeoutError:
+            raise  # Erbt von OSError, wird aber wie bisher vom Aufrufer als Timeout gezählt
+        except OSError as e:  # Z.B. Platte voll oder fehlende Rechte beim Schreiben der Cache-Datei
+            self.monitor.logger.error(f"Fehler beim Speichern der Daten von {url}: {e}")
+            return FiveMDownloadResult(ok=False)
+        finally:
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass  # Nie angelegt oder bereits entfernt
+
+    @staticmethod
+    def _loads(raw: bytes) -> Any:
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    @classmethod
+    def _load_json_file(cls, path: str) -> Any:
+        """Liest die ganze Datei und parst sie (weder json noch orjson parsen inkrementell)."""
+        with open(path, "rb") as f:
+            return cls._loads(f.read())
+
+    @staticmethod
+    def _dump_pretty(data: Any, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "writes": self.writes,
+            "writes_avoided": self.writes_avoided,
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_avoided": self.bytes_avoided,
+        }
+
+
+@dataclass(frozen=True)
+class FiveMServer:
+    """Definition eines überwachten FiveM-Servers (siehe AuraCityBotConfig.FIVEM_SERVERS)."""
+    name: str
+    server_url: str
+    player_url: str
+    info_url: Optional[str] = None
+    dynamic_url: Optional[str] = None
+
+
+class FiveMServerMonitor:
+    """Zustand und Abrufe eines einzelnen FiveM-Servers.
+
+    Hält Snapshot, Circuit Breaker, Endpunkt-Statistiken und Download-Zustand des Servers. Die HTTP-Session,
+    ihr Connection-Pool (AuraCityHttpClient) und das Limit paralleler Requests werden über AuraCityUtilities geteilt.
+    """
+
+    def __init__(self, utilities: "AuraCityUtilities", server: FiveMServer) -> None:
+        self.utilities = utilities
+        self.server = server
+        self.name = server.name
+        self.logger = utilities.logger
+        self.last_download_info = None  # Zeitpunkt des letzten Downloads für Info
+        self.last_download_dynamic = None  # Zeitpunkt des letzten Downloads für Dynamic
+        self.downloader = FiveMEndpointDownloader(self, os.path.join(utilities.config.FIVEM_CACHE_DIR, server.name),
+                                                  pretty_json=utilities.config.FIVEM_CACHE_PRETTY_JSON)
+        self.status_snapshot = FiveMStatusSnapshot(self, ttl=utilities.STATUS_TTL)
+        self.circuit_breaker = FiveMCircuitBreaker(utilities.BREAKER_BASE_DELAY, utilities.BREAKER_MAX_DELAY,
+                                                   utilities.BREAKER_OFFLINE_AFTER)
+        self.endpoint_stats = {endpoint: FiveMEndpointStats() for endpoint in utilities.ENDPOINT_TIMEOUTS}
+
+    @property
+    def http(self) -> AuraCityHttpClient:
+        return self.utilities.http
+
+    async def poll(self) -> FiveMStatus:
+        """Fragt alle fälligen Endpunkte des Servers parallel ab; bei offenem Circuit Breaker wird nicht angefragt."""
+        if not self.circuit_breaker.allow():
+            self.logger.debug(f"[{self.name}] Circuit Breaker offen nach {self.circuit_breaker.failures} "
+                              f"Fehlschlägen, Abruf übersprungen.")
+            return await self.status_snapshot.get()
+
+        status, _ = await asyncio.gather(
+            self.status_snapshot.refresh(),  # Spielerliste wird beim Snapshot-Abruf gespeichert
+            self.download_info_and_dynamic()  # Lade info und Dynamic alle 24 Stunden
+        )
+        return status
 
     async def download_info_and_dynamic(self) -> None:
-        """Lade info und Dynamic herunter, falls die Zeit dafür reif ist."""
+        """Lade info und Dynamic parallel herunter, falls die Zeit dafür reif ist."""
         now = datetime.now()
+        interval = timedelta(seconds=self.utilities.SLEEP_INTERVAL_OTHERS)
+        downloads = []
 
         # Überprüfe, ob die Downloads für info und Dynamic durchgeführt werden sollten
-        if self.last_download_info is None or now >= self.last_download_info + timedelta(seconds=self.SLEEP_INTERVAL_OTHERS):
-            await self._download_and_save(self.config.FIVEM_INFO_URL, "fivem_info.json")
-            self.last_download_info = now  # Aktualisiere den Zeitpunkt des letzten Downloads
-
-        if self.last_download_dynamic is None or now >= self.last_download_dynamic + timedelta(seconds=self.SLEEP_INTERVAL_OTHERS):
-            await self._download_and_save(self.config.FIVEM_DYNAMIC_URL, "fivem_dynamic.json")
-            self.last_download_dynamic = now  # Aktualisiere den Zeitpunkt des letzten Downloads
-
-    async def _download_and_save(self, url: str, filename: str) -> None:
+        if self.server.info_url and (self.last_download_info is None or now >= self.last_download_info + interval):
+            downloads.append(("info", self.server.info_url, "info.json"))
+        if self.server.dynamic_url and (self.last_download_dynamic is None or now >= self.last_download_dynamic + interval):
+            downloads.append(("dynamic", self.server.dynamic_url, "dynamic.json"))
+
+        results = await asyncio.gather(*(self._download_and_save(endpoint, url, filename)
+                                         for endpoint, url, filename in downloads))
+
+        # Nur erfolgreiche Downloads verschieben den nächsten Versuch um 24 Stunden
+        for (endpoint, _, _), ok in zip(downloads, results):
+            if ok and endpoint == "info":
+                self.last_download_info = now
+            elif ok and endpoint == "dynamic":
+                self.last_download_dynamic = now
+
+    async def _download_and_save(self, endpoint: str, url: str, filename: str) -> bool:
         """Hilfsmethode zum Herunterladen von JSON-Daten von der angegebenen URL und zum Speichern in einer Datei."""
-        try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    try:
-                        data = json.loads(text)
-                    except json.JSONDecodeError as e:
-                        self.logger.error(f"Fehler beim Dekodieren von JSON: {e}. Inhalt: {text[:100]}...")  # Zeige die ersten 100 Zeichen an
-                        return  # Beende die Funktion, wenn das Dekodieren fehlschlägt
-
-                    # Daten speichern
-                    os.makedirs("base/cache", exist_ok=True)  # Stelle sicher, dass das Verzeichnis existiert
-                    file_path = os.path.join("base/cache", filename)
-                    async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
-                        await f.write(json.dumps(data, indent=4))
-                    self.logger.debug(f"{filename} erfolgreich heruntergeladen und gespeichert. [{response.status}]")
-                else:
-                    self.logger.error(f"Fehler beim Herunterladen von Daten von {url}: {response.status}")
-        except aiohttp.ClientError as e:
-            self.logger.error(f"Fehler beim Herunterladen von Daten von {url}: {e}")
-
-    async def server_status(self) -> bool:
-        """Überprüfe den Status des Servers."""
-        if self.session is None:
-            await self.async_init()  # Stelle sicher, dass die Session initialisiert ist
+        result = await self._call_endpoint(endpoint, lambda: self.downloader.fetch(url, filename, keep_data=False))
+        if result.ok:
+            state = "gespeichert" if result.changed else "unverändert, nicht neu geschrieben"
+            self.logger.debug(f"[{self.name}] {filename} erfolgreich heruntergeladen ({state}).")
+        return result.ok
+
+    async def _call_endpoint(self, endpoint: str,
+                             request: Callable[[], Awaitable[FiveMDownloadResult]]) -> FiveMDownloadResult:
+        """Führt einen Endpunkt-Request mit dessen Timeout aus und erfasst Latenz, Fehler und Timeouts.
+
+        Wartet vorher auf einen Platz im gemeinsamen Request-Limit; die Wartezeit zählt nicht zur Latenz.
+        """
+        timeout = self.utilities.ENDPOINT_TIMEOUTS[endpoint]
+        stats = self.endpoint_stats[endpoint]
+        async with self.utilities.request_semaphore:
+            started = time.perf_counter()
+            try:
+                async with asyncio.timeout(timeout):
+                    result = await request()
+            except TimeoutError:
+                stats.record(time.perf_counter() - started, ok=False, timed_out=True)
+                self.logger.error(f"[{self.name}] Timeout beim Abruf des Endpunkts {endpoint} (nach {timeout} Sekunden).")
+                return FiveMDownloadResult(ok=False)
+        stats.record(time.perf_counter() - started, ok=result.ok)
+        return result
+
+    def get_endpoint_stats(self) -> dict[str, dict[str, Any]]:
+        return {endpoint: stats.as_dict() for endpoint, stats in self.endpoint_stats.items()}
+
+    async def _request_server_status(self) -> bool:
+        """Fragt den Serverstatus direkt per HTTP ab (nur vom Snapshot verwendet) und führt den Circuit Breaker."""
+        result = await self._call_endpoint("status", self._fetch_server_status)
+        if result.ok:
+            if self.circuit_breaker.failures:
+                self.logger.info(f"[{self.name}] Server ist wieder online (nach {self.circuit_breaker.failures} Fehlschlägen).")
+            self.circuit_breaker.record_success()
+        else:
+            delay = self.circuit_breaker.record_failure()
+            self.logger.warning(f"[{self.name}] Server nicht erreichbar, nächster Versuch frühestens in {delay:.0f} Sekunden.")
+        return result.ok
 
+    async def _fetch_server_status(self) -> FiveMDownloadResult:
         try:
-            async with self.session.get(self.config.FIVEM_SERVER_URL) as response:
+            async with self.http.get(self.server.server_url) as response:
                 if response.status == 200:
-                    return True
+                    return FiveMDownloadResult(ok=True)
                 else:
-                    self.logger.error(f"Serverstatus ist nicht 200: {response.status}")
-                    return False
+                    self.logger.error(f"[{self.name}] Serverstatus ist nicht 200: {response.status}")
+                    return FiveMDownloadResult(ok=False)
         except aiohttp.ClientError:
-            return False
+            return FiveMDownloadResult(ok=False)
 
-    async def get_player_count(self) -> int:
-        """Hole die Anzahl der online Spieler."""
-        if not await self.server_status():
-            return 0  # Gebe 0 zurück, wenn der Server offline ist
+    async def _request_players(self) -> Optional[list]:
+        """Fragt die Spielerliste per HTTP ab (nur vom Snapshot verwendet) und speichert sie bei Änderungen.
+
+        Gibt None zurück, wenn die Liste nicht geladen werden konnte (im Unterschied zu einem leeren Server).
+        """
+        result = await self._call_endpoint("players", lambda: self.downloader.fetch(self.server.player_url, "players.json"))
+        if not result.ok:
+            return None
+        data = result.data
+        if not isinstance(data, list):
+            self.logger.error(f"[{self.name}] Unerwartetes Datenformat erhalten.")
+            return None
+        return data
 
-        try:
-            async with self.session.get(self.config.FIVEM_PLAYER_URL) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    try:
-                        data = json.loads(text)
-                        if isinstance(data, list):
-                            return len(data)  # Gebe die Anzahl der Spieler zurück
-                        else:
-                            self.logger.error("Unerwartetes Datenformat erhalten.")
-                            return 0
-                    except json.JSONDecodeError as e:
-                        self.logger.error(f"Fehler beim Dekodieren von JSON: {e}")
-                        return 0  # Gebe 0 zurück im Fehlerfall
-                else:
-                    self.logger.error(f"Fehler beim Abrufen der Spieldaten: {response.status}")
-                    return 0  # Gebe 0 zurück im Statusfehlerfall
-        except aiohttp.ClientError as e:
-            self.logger.error(f"Fehler beim Abrufen der Spieleranzahl: {e}")
-            return 0  # Gebe 0 zurück bei Ausnahme
 
-    async def players_online(self) -> str:
-        count = await self.get_player_count()
-        if count == 0:
-            if await self.server_status():
+class AuraCityUtilities:
+    SLEEP_INTERVAL_PLAYERS = 300  # 5 Minuten in Sekunden
+    SLEEP_INTERVAL_OTHERS = 86400   # 24 Stunden in Sekunden
+    CHECK_INTERVAL = 5  # Intervall in Sekunden
+    STATUS_TTL = 60  # Sekunden, die ein Status-Snapshot als aktuell gilt
+    # Timeout je Endpunkt in Sekunden; ein hängender Endpunkt blockiert so nie den Monitor oder die Presence
+    ENDPOINT_TIMEOUTS = {"status": 5, "players": 10, "info": 30, "dynamic": 30}
+    BREAKER_BASE_DELAY = 30  # Erste Wartezeit nach einem Offline-Ergebnis
+    BREAKER_MAX_DELAY = 1800  # Maximal 30 Minuten zwischen zwei Probes
+    BREAKER_OFFLINE_AFTER = 3  # Fehlschläge in Folge, ab denen der Server als offline gilt und Sessions enden
+
+    def __init__(self, config: Optional[AuraCityBotConfig] = None, http: Optional[AuraCityHttpClient] = None,
+                 outbound: Optional[AuraCityOutboundScheduler] = None):
+        self.config = config or AuraCityBotConfig()
+        self.outbound = outbound  # Ohne Scheduler (z.B. im Benchmark) gehen Moderationsaufrufe direkt an Discord
+        self.logger = AuraCityLogger("AuraCityBot-Utilities").get_logger()
+        # Der Bot teilt seinen HTTP-Client (Service "http"); ohne ihn (z.B. im Benchmark) wird ein eigener erzeugt
+        self._owns_http = http is None
+        self.http = http or AuraCityHttpClient(connection_limit=self.config.FIVEM_MAX_CONCURRENT_REQUESTS)
+        self.user_message_count = defaultdict(list)  # Benutzer-ID zu einer Liste von Nachrichtenzeitstempeln
+        # Begrenzt die gleichzeitigen FiveM-Requests über alle Server, egal wie viele überwacht werden
+        self.request_semaphore = asyncio.Semaphore(self.config.FIVEM_MAX_CONCURRENT_REQUESTS)
+        self.servers: dict[str, FiveMServerMonitor] = {
+            definition["name"]: FiveMServerMonitor(self, FiveMServer(**definition))
+            for definition in self.config.FIVEM_SERVERS
+        }
+        self.primary_server = next(iter(self.servers.values()))  # Der erste konfigurierte Server
+        self._poll_listeners: list[Callable[[dict[str, FiveMStatus]], Awaitable[Any]]] = []
+
+    def add_poll_listener(self, callback: Callable[[dict[str, FiveMStatus]], Awaitable[Any]]) -> None:
+        """Registriert einen Callback, der einmal je Monitor-Durchlauf mit dem Stand aller Server aufgerufen wird.
+
+        Anders als die Snapshot-Listener wird er nicht von erzwungenen Refreshes (Befehle, Zähler) ausgelöst.
+        """
+        self._poll_listeners.append(callback)
+
+    @property
+    def status_snapshot(self) -> FiveMStatusSnapshot:
+        """Snapshot des ersten konfigurierten Servers."""
+        return self.primary_server.status_snapshot
+
+    async def close(self) -> None:
+        """Schließt den HTTP-Client, falls er nicht vom Bot geteilt, sondern hier erzeugt wurde."""
+        if self._owns_http:
+            await self.http.close()
+
+    def get_server(self, server: Optional[str] = None) -> FiveMServerMonitor:
+        """Monitor des Servers mit diesem Namen, ohne Namen der erste konfigurierte Server."""
+        if server is None:
+            return self.primary_server
+        if server not in self.servers:
+            raise KeyError(f"FiveM-Server '{server}' ist nicht konfiguriert")
+        return self.servers[server]
+
+    async def download_if_online(self) -> None:
+        """Fragt alle Server in einem Durchlauf parallel ab; das gemeinsame Request-Limit begrenzt die Last."""
+        statuses = await asyncio.gather(*(monitor.poll() for monitor in self.servers.values()))
+        for listener in self._poll_listeners:
+            try:
+                await listener(dict(zip(self.servers, statuses)))
+            except Exception as e:
+                self.logger.error(f"🚨 Error in FiveM poll listener: {e}", exc_info=e)
+
+        online = [monitor.name for monitor, status in zip(self.servers.values(), statuses) if status.online]
+        offline = [monitor.name for monitor, status in zip(self.servers.values(), statuses) if not status.online]
+        if offline:
+            self.logger.warning(f"Server offline: {', '.join(offline)}. Herunterladen übersprungen.")
+        if online:
+            self.logger.debug(f"Download-Statistik: {self.get_download_stats()}")
+            self.logger.debug(f"Endpunkt-Statistik: {self.get_endpoint_stats()}")
+
+    async def download_player_count(self, server: Optional[str] = None) -> FiveMStatus:
+        """Aktualisiere den Snapshot; players.json wird dabei nur bei Änderungen neu geschrieben."""
+        return await self.get_server(server).status_snapshot.refresh()
+
+    def get_download_stats(self) -> dict[str, dict[str, int]]:
+        return {name: monitor.downloader.stats() for name, monitor in self.servers.items()}
+
+    def get_endpoint_stats(self) -> dict[str, dict[str, dict[str, Any]]]:
+        return {name: monitor.get_endpoint_stats() for name, monitor in self.servers.items()}
+
+    async def get_statuses(self) -> dict[str, FiveMStatus]:
+        """Aktueller Stand aller Server (aus den Snapshots, abgelaufene werden parallel erneuert)."""
+        statuses = await asyncio.gather(*(monitor.status_snapshot.get() for monitor in self.servers.values()))
+        return dict(zip(self.servers, statuses))
+
+    async def server_status(self, server: Optional[str] = None) -> bool:
+        """Überprüfe den Status eines Servers; ohne Namen, ob mindestens ein Server online ist."""
+        if server is not None:
+            return (await self.get_server(server).status_snapshot.get()).online
+        return any(status.online for status in (await self.get_statuses()).values())
+
+    async def get_player_count(self, server: Optional[str] = None) -> int:
+        """Hole die Anzahl der online Spieler eines Servers; ohne Namen die Summe über alle Server."""
+        if server is not None:
+            return (await self.get_server(server).status_snapshot.get()).player_count
+        return sum(status.player_count for status in (await self.get_statuses()).values())
+
+    async def players_online(self, server: Optional[str] = None) -> str:
+        if server is not None or len(self.servers) == 1:
+            status = await self.get_server(server).status_snapshot.get()
+            if not status.online:
+                return "Server ist offline."
+            if status.player_count == 0:
                 return "Keine Spieler online."
-            return "Server ist offline."
-        return f"{count} Spieler online."
+            return f"{status.player_count} Spieler online."
 
+        statuses = await self.get_statuses()
+        online = [status for status in statuses.values() if status.online]
+        if not online:
+            return "Alle Server sind offline."
+        players = sum(status.player_count for status in online)
+        return f"{players} Spieler online ({len(online)}/{len(statuses)} Server)."
 
     async def monitor_server_and_download(self):
-        """Überwache den Serverstatus und versuche, Daten herunterzuladen, wenn er online ist."""
+        """Überwache alle Server in einem einzigen Task und lade Daten herunter, wenn sie online sind."""
         while True:
             await self.download_if_online()
             await asyncio.sleep(self.SLEEP_INTERVAL_PLAYERS)  # Verwende die Konstante für Schlafintervall der Spieler
@@ -164,9 +613,14 @@ class AuraCityUtilities:
             AuraCityLogger("AuraCityBot-Utilities").get_logger().error(f"Fehler beim Zipping der Datei: {e}")
             return ""
 
+    async def _moderate(self, guild: discord.Guild, call: Callable[[], Awaitable[Any]]) -> Any:
+        if self.outbound is None:
+            return await call()
+        return await self.outbound.moderate(guild, call)
+
     async def ban_bot(self, user: discord.Member) -> None:
         """Bans the bot from the server."""
-        await user.ban(reason="Bot wurde aus dem Server verbannt.")
+        await self._moderate(user.guild, lambda: user.ban(reason="Bot wurde aus dem Server verbannt."))
         self.logger.debug(f"Bot {user} wurde aus dem Server verbannt.")
 
     async def send_dm(self, user: discord.Member, content: str) -> None:
@@ -186,7 +640,7 @@ class AuraCityUtilities:
             del self.user_message_count[user_id]  # Clear their message count after kicking
             return
 
-        await user.kick(reason="Spam detected: More than 5 messages in a short time.")
+        await self._moderate(user.guild, lambda: user.kick(reason="Spam detected: More than 5 messages in a short time."))
         self.logger.debug(f"User {user} was kicked for spamming.")
 
         await self.send_dm(user, "Du wurdest wegen Spamming gekickt. Wenn du dich beruhigt hast, komm auf den Server zurück: Link")
@@ -218,118 +672,7 @@ class AuraCityUtilities:
 
         return False
 
-    async def handle_status_lspd(self, bot: discord.Bot, count: int):
-        """Handle the status of the LSPD channel."""
-        guild = bot.get_guild(int(self.config.GUILD_ID_ACSD))
-
-        if guild is None:
-            self.logger.error("Guild not found.")
-            return
-
-        channel = guild.get_channel(int(self.config.LSPD_COUNTER_CHANNEL_ID))
-
-        if channel is None:
-            self.logger.error("Channel not found.")
-            return
-
-        name = f"🚓 {count}"
-        try:
-            await channel.edit(name=name)
-        except discord.HTTPException as e:
-            self.logger.error(f"Error editing channel: {e}")
-
-    async def handle_status_lsmd(self, bot: discord.Bot, count: int):
-        """Handle the status of the LSMD channel."""
-        guild = bot.get_guild(int(self.config.GUILD_ID_ACSD))
-
-        if guild is None:
-            self.logger.error("Guild not found.")
-            return
-
-        channel = guild.get_channel(int(self.config.LSMD_COUNTER_CHANNEL_ID))
-
-        if channel is None:
-            self.logger.error("Channel not found.")
-            return
-
-        name = f"🚑 {count}"
-        try:
-            await channel.edit(name=name)
-        except discord.HTTPException as e:
-            self.logger.error(f"Error editing channel: {e}")
-
-
-    async def handle_channel_content(self, bot: discord.Bot):
-        guild = bot.get_guild(int(self.config.GUILD_ID_ACSD))
-        if guild is None:
-            self.logger.error("Guild not found.")
-            return
-
-        # Abrufen der Kanäle
-        channels = {
-            "rules_channel": guild.get_channel(int(self.config.RULES_CHANNEL_ID)),
-            "gesetze_channel": guild.get_channel(int(self.config.GESETZE_CHANNEL_ID)),
-            "vorraum_channel": guild.get_channel(int(self.config.VORRAUM_CHANNEL_ID)),
-            "rechtsanfrage_lsmd_channel": guild.get_channel(int(self.config.LSMD_RECHTSANFRAGE_CHANNEL_ID)),
-            "rechtsanfrage_lspd_channel": guild.get_channel(int(self.config.LSPD_RECHTSANFRAGE_CHANNEL_ID)),
-            "funkcodes_channel": guild.get_channel(int(self.config.FUNKCODES_CHANNEL_ID)),
-            "lsmd_bescherden_channel": guild.get_channel(int(self.config.LSMD_BESCHWERDE_CHANNEL_ID)),
-            "lspd_bescherden_channel": guild.get_channel(int(self.config.LSPD_BESCHWERDE_CHANNEL_ID))
-        }
-
-        if any(channel is None for channel in channels.values()):
-            self.logger.error("One or more channels not found. Please check the environment variables.")
-            return
-
-        # Nachrichten gleichzeitig löschen
-        await asyncio.gather(*(channel.purge(limit=30) for channel in channels.values()))
-
-        # Nachrichten gleichzeitig senden
-        messages = await asyncio.gather(
-            channels["rules_channel"].send("Regeln"),
-            channels["gesetze_channel"].send("Gesetze"),
-            channels["vorraum_channel"].send("Vorraum für neue Mitglieder"),
-            channels["rechtsanfrage_lsmd_channel"].send("Rechtsanfrage LSMD"),
-            channels["rechtsanfrage_lspd_channel"].send("Rechtsanfrage LSPD"),
-            channels["funkcodes_channel"].send("Funkcodes"),
-            channels["lsmd_bescherden_channel"].send("Beschwerden LSMD"),
-            channels["lspd_bescherden_channel"].send("Beschwerden LSPD")
-        )
-
-        # Nachrichten gleichzeitig pinnen
-        await asyncio.gather(*(message.pin() for message in messages))
-
-class AuraCityRateLimitQueue:
-    def __init__(self, rate_limit_per_second: int, batch_size: int = 1):
-        self.queue: deque[asyncio.Task] = deque()
-        self.processing = False
-        self.rate_limit_per_second = rate_limit_per_second  # Anzahl der erlaubten Anfragen pro Sekunde
-        self.batch_size = batch_size  # Optional: Anzahl der Aufrufe, die in einem Batch verarbeitet werden können
-
-    async def process_queue(self):
-        if self.processing:
-            return  # Verhindere, dass die Verarbeitung doppelt startet
-
-        self.processing = True
-        try:
-            while self.queue:
-                # Verarbeite die Anfragen in Batches, falls gewünscht
-                for _ in range(min(self.batch_size, len(self.queue))):
-                    task = self.queue.popleft()
-                    await task  # Führe die nächste Aufgabe aus
-
-                # Warte nach jedem Batch, um die Rate-Limits einzuhalten
-                await asyncio.sleep(1 / self.rate_limit_per_second)
-
-        finally:
-            self.processing = False
-
-    def add_to_queue(self, coroutine: asyncio.Task) -> None:
-        """Fügt eine neue Aufgabe zur Warteschlange hinzu"""
-        self.queue.append(coroutine)
-        asyncio.create_task(self.process_queue())  # Starte die Verarbeitung im Hintergrund
-
 class AuraCityUtils:
-    def __init__(self):
-        self.rate_limit_queue = AuraCityRateLimitQueue(rate_limit_per_second=1, batch_size=5)
-        self.AuraCityUtilities = AuraCityUtilities()
+    def __init__(self, config: Optional[AuraCityBotConfig] = None, http: Optional[AuraCityHttpClient] = None,
+                 outbound: Optional[AuraCityOutboundScheduler] = None):
+        self.AuraCityUtilities = AuraCityUtilities(config, http, outbound)
@@ -0,0 +1,289 @@
+"""Benchmark für AuraCityDatabase mit synthetischen Daten.
+
+Läuft komplett offline gegen eine temporäre SQLite-Datei. Daten und Abfragefolge werden aus einem festen
+Seed erzeugt, damit Läufe vergleichbar sind; mit --repeat wird der Median mehrerer Läufe berichtet.
+
+    python -m benchmarks.database_benchmark --users 100000 --output bench.json
+    python -m benchmarks.database_benchmark --users 100000 --baseline bench.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import sqlite3
+import argparse
+import platform
+import tempfile
+import statistics
+from typing import Any, Awaitable, Callable
+
+from base.database import AuraCityDatabase
+
+BENCHMARK_LOGGERS = ("AuraCityDatabase", "AuraCityDatabaseConnection")
+USER_ID_OFFSET = 100_000_000_000_000_000  # Snowflake-ähnliche IDs
+
+
+class BenchmarkConfig:
+    """Minimale Konfiguration statt AuraCityBotConfig, damit keine .env-Dateien nötig sind."""
+
+    def __init__(self, directory: str, pool_size: int, write_behind: bool) -> None:
+        self.DATABASE_PATH = os.path.join(directory, "benchmark.db")
+        self.DATABASE_BACKUP_PATH = os.path.join(directory, "backups", "benchmark")
+        self.DATABASE_POOL_SIZE = pool_size
+        self.DATABASE_WRITE_BEHIND = write_behind
+        self.DATABASE_WRITE_BATCH_INTERVAL_MS = 5
+        self.DATABASE_WRITE_BATCH_SIZE = 200
+        self.DATABASE_WRITE_QUEUE_SIZE = 5000
+        self.DATABASE_CACHE_SIZE = 10000
+        self.DATABASE_CACHE_TTL = 300.0
+        self.DATABASE_BACKUP_PAGES_PER_STEP = 256
+        self.DATABASE_BACKUP_KEEP_DAILY = 7
+        self.DATABASE_BACKUP_KEEP_WEEKLY = 4
+        self.DATABASE_BACKUP_KEEP_MONTHLY = 12
+
+
+class SyntheticDataset:
+    def __init__(self, users: int, seed: int) -> None:
+        self.users = users
+        self.seed = seed
+        self.user_ids = [USER_ID_OFFSET + i for i in range(users)]
+        rng = random.Random(seed)
+        self.banned_ids = rng.sample(self.user_ids, max(1, users // 100))
+        self.blacklisted_ids = rng.sample(self.user_ids, max(1, users // 200))
+        self.deregistration_rows = [
+            (rng.choice(self.user_ids), f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00",
+             rng.randint(1, 10), "Urlaub", "Bin im Urlaub")
+            for _ in range(users * 2)
+        ]
+        self.complaint_rows = [
+            (rng.choice(self.user_ids), "Beschwerde", rng.choice(("LSPD", "LSMD")), "Text der Beschwerde")
+            for _ in range(users // 2)
+        ]
+
+    async def seed_database(self, database: AuraCityDatabase) -> None:
+        async with database.pool.writer() as conn:
+            await conn.executemany("INSERT INTO users (discord_id, discriminator) VALUES (?, '0')",
+                                   ((user_id,) for user_id in self.user_ids))
+            await conn.executemany("INSERT INTO bans (discord_id, reason) VALUES (?, 'Regelverstoß')",
+                                   ((user_id,) for user_id in self.banned_ids))
+            await conn.executemany("INSERT INTO blacklist (discord_id, reason) VALUES (?, 'Regelverstoß')",
+                                   ((user_id,) for user_id in self.blacklisted_ids))
+            await conn.executemany(
+                "INSERT INTO deregistrations (discord_id, time_stamp, deregistration_count, reason, message) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self.deregistration_rows
+            )
+            await conn.executemany("INSERT INTO complaints (discord_id, message, category, complaint) VALUES (?, ?, ?, ?)",
+                                   self.complaint_rows)
+            await conn.commit()
+            await conn.execute("ANALYZE")
+            await conn.commit()
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def measure(operations: list[Callable[[], Awaitable[Any]]], concurrency: int) -> dict[str, float]:
+    """Führt die Operationen aus und misst Latenz je Operation sowie den Gesamtdurchsatz."""
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(operation: Callable[[], Awaitable[Any]]) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            result = operation()
+            if hasattr(result, "__aiter__"):
+                async for _ in result:
+                    pass
+            else:
+                await result
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        for operation in operations:
+            await run(operation)
+    else:
+        await asyncio.gather(*(run(operation) for operation in operations))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50), 4),
+        "p95_ms": round(percentile(latencies, 0.95), 4),
+        "p99_ms": round(percentile(latencies, 0.99), 4),
+        "ops_per_sec": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def build_workloads(database: AuraCityDatabase, dataset: SyntheticDataset, operations: int,
+                    rng: random.Random) -> dict[str, Callable[[], list[Callable[[], Awaitable[Any]]]]]:
+    """Je öffentliche Methode eine Fabrik, die eine deterministische Liste von Aufrufen erzeugt."""
+    next_id = iter(range(USER_ID_OFFSET + dataset.users, USER_ID_OFFSET + dataset.users * 10))
+
+    def lookups(method: Callable[[int], Awaitable[Any]], hit_ids: list[int]) -> list[Callable[[], Awaitable[Any]]]:
+        # Drei Viertel Treffer, ein Viertel unbekannte IDs
+        ids = [rng.choice(hit_ids) if rng.random() < 0.75 else rng.choice(dataset.user_ids) + dataset.users * 20
+               for _ in range(operations)]
+        return [lambda discord_id=discord_id: method(discord_id) for discord_id in ids]
+
+    def deletes(method: Callable[[int], Awaitable[Any]], ids: list[int]) -> list[Callable[[], Awaitable[Any]]]:
+        sample = rng.sample(ids, min(len(ids), operations))
+        return [lambda discord_id=discord_id: method(discord_id) for discord_id in sample]
+
+    return {
+        "add_user": lambda: [lambda discord_id=next(next_id): database.add_user(discord_id, "0") for _ in range(operations)],
+        "get_user": lambda: lookups(database.get_user, dataset.user_ids),
+        "get_user_dict": lambda: lookups(database.get_user_dict, dataset.user_ids),
+        "get_users_many": lambda: [lambda ids=rng.sample(dataset.user_ids, min(500, dataset.users)): database.get_users_many(ids)
+                                   for _ in range(max(1, operations // 50))],
+        "add_users_many": lambda: [lambda users=[(next(next_id), "0") for _ in range(500)]: database.add_users_many(users)
+                                   for _ in range(max(1, operations // 50))],
+        "add_ban": lambda: [lambda discord_id=rng.choice(dataset.user_ids): database.add_ban(discord_id, "Benchmark")
+                            for _ in range(operations)],
+        "get_ban": lambda: lookups(database.get_ban, dataset.banned_ids),
+        "add_blacklist": lambda: [lambda discord_id=rng.choice(dataset.user_ids): database.add_blacklist(discord_id, "Benchmark")
+                                  for _ in range(operations)],
+        "get_blacklist": lambda: lookups(database.get_blacklist, dataset.blacklisted_ids),
+        "add_deregistration": lambda: [
+            lambda discord_id=rng.choice(dataset.user_ids): database.add_deregistration(
+                discord_id, "2026-06-01 12:00:00", 1, "Benchmark", "Benchmark")
+            for _ in range(operations)
+        ],
+        "get_deregistration": lambda: lookups(database.get_deregistration, [row[0] for row in dataset.deregistration_rows]),
+        "iter_deregistrations": lambda: [lambda discord_id=rng.choice(dataset.user_ids): database.iter_deregistrations(discord_id)
+                                         for _ in range(operations)],
+        "add_complaint": lambda: [
+            lambda discord_id=rng.choice(dataset.user_ids): database.add_complaint(discord_id, "Benchmark", "LSPD", "Benchmark")
+            for _ in range(operations)
+        ],
+        "get_complaint": lambda: lookups(database.get_complaint, [row[0] for row in dataset.complaint_rows]),
+        "iter_complaints": lambda: [lambda discord_id=rng.choice(dataset.user_ids): database.iter_complaints(discord_id)
+                                    for _ in range(operations)],
+        "delete_ban": lambda: deletes(database.delete_ban, dataset.banned_ids),
+        "delete_blacklist": lambda: deletes(database.delete_blacklist, dataset.blacklisted_ids),
+        "delete_complaint": lambda: deletes(database.delete_complaint, [row[0] for row in dataset.complaint_rows]),
+        "delete_deregistration": lambda: deletes(database.delete_deregistration, [row[0] for row in dataset.deregistration_rows]),
+        "delete_user": lambda: deletes(database.delete_user, dataset.user_ids),
+    }
+
+
+async def run_once(args: argparse.Namespace, dataset: SyntheticDataset) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory(prefix="auracity-bench-") as directory:
+        database = AuraCityDatabase(BenchmarkConfig(directory, args.pool_size, args.write_behind))
+        for name in BENCHMARK_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+        await database.create_database()
+        await dataset.seed_database(database)
+
+        rng = random.Random(args.seed)
+        workloads = build_workloads(database, dataset, args.operations, rng)
+        selected = args.methods or list(workloads)
+
+        try:
+            for mode, concurrency in (("single", 1), ("concurrent", args.concurrency)):
+                for name in selected:
+                    for cache in (database.user_cache, database.ban_cache, database.blacklist_cache):
+                        cache.clear()
+                    results[f"{name}/{mode}"] = await measure(workloads[name](), concurrency)
+                    print(f"  {name:<24} {mode:<10} {results[f'{name}/{mode}']}", file=sys.stderr)
+        finally:
+            await database.close_connection()
+
+    return results
+
+
+def median_results(runs: list[dict[str, dict[str, float]]]) -> dict[str, dict[str, float]]:
+    return {
+        key: {metric: round(statistics.median(run[key][metric] for run in runs), 4) for metric in runs[0][key]}
+        for key in runs[0]
+    }
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float) -> list[str]:
+    """Vergleicht p95 und Durchsatz mit der Baseline und gibt alle Regressionen zurück."""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if previous["p95_ms"] > 0 and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{key}: p95 {previous['p95_ms']} ms -> {current['p95_ms']} ms")
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {previous['ops_per_sec']} -> {current['ops_per_sec']} ops/s")
+    return regressions
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark für die AuraCity-Datenbankschicht")
+    parser.add_argument("--users", type=int, default=100_000, help="Anzahl synthetischer User")
+    parser.add_argument("--operations", type=int, default=1000, help="Aufrufe pro Methode und Modus")
+    parser.add_argument("--concurrency", type=int, default=32, help="Gleichzeitige Aufrufe im concurrent-Modus")
+    parser.add_argument("--pool-size", type=int, default=4, help="Reader-Verbindungen im Pool")
+    parser.add_argument("--write-behind", action="store_true", help="Write-Behind-Queue aktivieren")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--repeat", type=int, default=3, help="Anzahl Läufe, berichtet wird der Median")
+    parser.add_argument("--methods", nargs="*", help="Nur diese Methoden messen")
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", help="JSON-Datei eines früheren Laufs zum Vergleich")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Erlaubte Abweichung zur Baseline (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+async def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    dataset = SyntheticDataset(args.users, args.seed)
+
+    runs = []
+    for i in range(args.repeat):
+        print(f"Run {i + 1}/{args.repeat} with {args.users} users...", file=sys.stderr)
+        runs.append(await run_once(args, dataset))
+
+    report = {
+        "meta": {
+            "users": args.users,
+            "operations": args.operations,
+            "concurrency": args.concurrency,
+            "pool_size": args.pool_size,
+            "write_behind": args.write_behind,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "results": median_results(runs),
+    }
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline.", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
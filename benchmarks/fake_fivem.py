@@ -0,0 +1,207 @@
+"""Lokaler Ersatz für einen FiveM-Server zum Testen des Monitorings ohne Live-Server.
+
+Liefert /players.json, /info.json und /dynamic.json (auch unter /<server>/..., damit mehrere Server über einen
+Port simuliert werden können). Spielerzahl, Latenz, Fehlerquote, Spieler-Wechsel und Ausfallzeiten sind
+einstellbar. ETag/If-None-Match wird wie bei einem echten Webserver unterstützt.
+
+    python -m benchmarks.fake_fivem --port 30120 --players 2000 --latency-ms 50 --error-rate 0.01 --downtime 60:120
+
+Danach z.B. FIVEM_SERVER_URL=http://127.0.0.1:30120/info.json und FIVEM_PLAYER_URL=http://127.0.0.1:30120/players.json.
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+from typing import Optional
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+
+@dataclass
+class FakeFiveMSettings:
+    players: int = 2000
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0  # Anteil der Requests, die mit 500 beantwortet werden
+    churn: float = 0.0  # Anteil der Spieler, der pro Abruf von players.json ausgetauscht wird
+    downtime: list[tuple[float, float]] = field(default_factory=list)  # Fenster in Sekunden ab Start
+    downtime_mode: str = "503"  # "503" antwortet mit Fehler, "hang" antwortet gar nicht (testet Timeouts)
+    seed: int = 1337
+
+
+class FakeFiveMServer:
+    def __init__(self, settings: FakeFiveMSettings) -> None:
+        self.settings = settings
+        self.rng = random.Random(settings.seed)
+        self.started_at = time.monotonic()
+        self.next_player_id = 0
+        self.players: dict[str, list[dict]] = {}  # Je simuliertem Server
+        self.payloads: dict[str, tuple[bytes, str]] = {}  # Serialisierte players.json und ETag je Server
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+
+        self.info = self._encode({
+            "server": "FXServer-master SERVER v1.0.0.0 linux",
+            "enhancedHostSupport": True,
+            "resources": [f"resource_{i}" for i in range(300)],
+            "vars": {"sv_maxClients": str(max(settings.players, 64)), "sv_projectName": "AuraCity"},
+            "version": 0,
+        })
+        self.dynamic = self._encode({
+            "clients": settings.players,
+            "gametype": "Roleplay",
+            "hostname": "AuraCity",
+            "mapname": "San Andreas",
+            "sv_maxclients": str(max(settings.players, 64)),
+        })
+
+    @staticmethod
+    def _encode(data) -> tuple[bytes, str]:
+        body = json.dumps(data).encode()
+        return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+    def _new_player(self) -> dict:
+        self.next_player_id += 1
+        player_id = self.next_player_id
+        return {
+            "endpoint": "127.0.0.1",
+            "id": player_id,
+            "identifiers": [
+                f"license:{player_id:040x}",
+                f"steam:{0x110000100000000 + player_id:x}",
+                f"discord:{100_000_000_000_000_000 + player_id}",
+                f"fivem:{player_id}",
+            ],
+            "name": f"Spieler_{player_id}",
+            "ping": self.rng.randint(10, 150),
+        }
+
+    def _players_payload(self, server: str) -> tuple[bytes, str]:
+        players = self.players.get(server)
+        if players is None:
+            players = self.players[server] = [self._new_player() for _ in range(self.settings.players)]
+        elif self.settings.churn and players:
+            for _ in range(max(1, int(len(players) * self.settings.churn))):
+                players[self.rng.randrange(len(players))] = self._new_player()
+            self.payloads.pop(server, None)
+
+        if server not in self.payloads:
+            self.payloads[server] = self._encode(players)
+        return self.payloads[server]
+
+    def _in_downtime(self) -> bool:
+        elapsed = time.monotonic() - self.started_at
+        return any(start <= elapsed < end for start, end in self.settings.downtime)
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        settings = self.settings
+
+        if self._in_downtime():
+            if settings.downtime_mode == "hang":
+                await asyncio.Event().wait()  # Antwortet nie, der Client muss per Timeout abbrechen
+            return web.Response(status=503)
+
+        delay = settings.latency_ms + (self.rng.uniform(-settings.jitter_ms, settings.jitter_ms) if settings.jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if settings.error_rate and self.rng.random() < settings.error_rate:
+            self.errors += 1
+            return web.Response(status=500)
+
+        server = request.match_info.get("server", "default")
+        endpoint = request.match_info["endpoint"]
+        if endpoint == "players.json":
+            body, etag = self._players_payload(server)
+        elif endpoint == "info.json":
+            body, etag = self.info
+        elif endpoint == "dynamic.json":
+            body, etag = self.dynamic
+        else:
+            return web.Response(status=404)
+
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+    async def handle_stats(self, _request: web.Request) -> web.Response:
+        return web.json_response({"requests": self.requests, "errors": self.errors, "not_modified": self.not_modified})
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/_stats", self.handle_stats)
+        app.router.add_get("/{endpoint}", self.handle)
+        app.router.add_get("/{server}/{endpoint}", self.handle)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 30120) -> web.AppRunner:
+        runner = web.AppRunner(self.create_app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+
+def parse_downtime(value: str) -> tuple[float, float]:
+    start, _, end = value.partition(":")
+    return float(start), float(end)
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Lokaler FiveM-Ersatzserver")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=30120)
+    parser.add_argument("--players", type=int, default=2000, help="Spieler pro simuliertem Server")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil der Requests mit HTTP 500")
+    parser.add_argument("--churn", type=float, default=0.0, help="Anteil der Spieler, der pro Abruf wechselt")
+    parser.add_argument("--downtime", type=parse_downtime, action="append", default=[],
+                        help="Ausfallfenster START:ENDE in Sekunden ab Start (mehrfach möglich)")
+    parser.add_argument("--downtime-mode", choices=("503", "hang"), default="503")
+    parser.add_argument("--seed", type=int, default=1337)
+    return parser.parse_args(argv)
+
+
+def settings_from_args(args: argparse.Namespace) -> FakeFiveMSettings:
+    return FakeFiveMSettings(
+        players=args.players,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        churn=args.churn,
+        downtime=args.downtime,
+        downtime_mode=args.downtime_mode,
+        seed=args.seed,
+    )
+
+
+async def serve(settings: FakeFiveMSettings, host: str, port: int, ready: Optional[object] = None) -> None:
+    """Startet den Server und läuft bis zum Abbruch; ready (z.B. multiprocessing.Event) wird nach dem Start gesetzt."""
+    runner = await FakeFiveMServer(settings).start(host, port)
+    if ready is not None:
+        ready.set()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def run_server(settings: FakeFiveMSettings, host: str, port: int, ready: Optional[object] = None) -> None:
+    """Einstiegspunkt für einen eigenen Prozess (multiprocessing.Process)."""
+    try:
+        asyncio.run(serve(settings, host, port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    arguments = parse_args(sys.argv[1:])
+    print(f"Fake FiveM server on http://{arguments.host}:{arguments.port} with {arguments.players} players", file=sys.stderr)
+    run_server(settings_from_args(arguments), arguments.host, arguments.port)
@@ -0,0 +1,194 @@
+"""Benchmark für das FiveM-Monitoring gegen den lokalen Ersatzserver (benchmarks.fake_fivem).
+
+Der Ersatzserver läuft in einem eigenen Prozess, damit CPU-Zeit und Speicher nur den Poller messen. Gemessen
+werden Polls pro Sekunde (ein Poll = ein Durchlauf von download_if_online über alle Server), CPU-Zeit pro Poll
+und der Spitzenverbrauch an Speicher während eines Polls sowie die Lesezugriffe auf den Status-Snapshot.
+
+    python -m benchmarks.fivem_benchmark --players 2000 --output fivem.json
+    python -m benchmarks.fivem_benchmark --players 2000 --baseline fivem.json
+"""
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import multiprocessing
+from typing import Any, Awaitable, Callable
+
+from base.utils.utilities import AuraCityUtilities
+from benchmarks.database_benchmark import measure, median_results, compare
+from benchmarks.fake_fivem import FakeFiveMSettings, run_server
+
+BENCHMARK_LOGGERS = ("AuraCityBot-Utilities",)
+
+
+class BenchmarkConfig:
+    """Minimale Konfiguration statt AuraCityBotConfig, damit keine .env-Dateien nötig sind."""
+
+    def __init__(self, directory: str, port: int, servers: int, max_concurrent_requests: int) -> None:
+        base_url = f"http://127.0.0.1:{port}"
+        self.FIVEM_SERVERS = [
+            {
+                "name": f"server{i}",
+                "server_url": f"{base_url}/server{i}/info.json",
+                "player_url": f"{base_url}/server{i}/players.json",
+                "info_url": f"{base_url}/server{i}/info.json",
+                "dynamic_url": f"{base_url}/server{i}/dynamic.json",
+            }
+            for i in range(servers)
+        ]
+        self.FIVEM_MAX_CONCURRENT_REQUESTS = max_concurrent_requests
+        self.FIVEM_CACHE_DIR = directory
+        self.FIVEM_CACHE_PRETTY_JSON = False
+
+
+def build_workloads(utilities: AuraCityUtilities, operations: int) -> dict[str, Callable[[], list[Callable[[], Awaitable[Any]]]]]:
+    async def full_poll() -> None:
+        # Wie der erste Poll nach dem Start bzw. einmal am Tag: auch info und dynamic sind fällig
+        for monitor in utilities.servers.values():
+            monitor.last_download_info = monitor.last_download_dynamic = None
+        await utilities.download_if_online()
+
+    return {
+        "poll": lambda: [utilities.download_if_online for _ in range(operations)],
+        "poll_full": lambda: [full_poll for _ in range(max(1, operations // 5))],
+        "players_online": lambda: [utilities.players_online for _ in range(operations * 10)],
+        "server_status": lambda: [utilities.server_status for _ in range(operations * 10)],
+    }
+
+
+async def measure_resources(operations: list[Callable[[], Awaitable[Any]]]) -> dict[str, float]:
+    """CPU-Zeit je Operation (ohne Tracing) und Spitzenspeicher während der Operationen (mit tracemalloc)."""
+    cpu_started = time.process_time()
+    for operation in operations:
+        await operation()
+    cpu_ms = (time.process_time() - cpu_started) * 1000 / len(operations)
+
+    sample = operations[:max(1, min(len(operations), 10))]  # tracemalloc bremst stark, wenige Läufe reichen
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for operation in sample:
+            await operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"cpu_ms_per_op": round(cpu_ms, 4), "peak_mem_kb": round((peak - baseline) / 1024, 1)}
+
+
+async def run_once(args: argparse.Namespace, port: int) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory(prefix="auracity-fivem-bench-") as directory:
+        utilities = AuraCityUtilities(BenchmarkConfig(directory, port, args.servers, args.max_concurrent_requests))
+        for name in BENCHMARK_LOGGERS:
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+        try:
+            await utilities.download_if_online()  # Aufwärmen: Verbindungen aufbauen, Cache-Dateien anlegen
+            workloads = build_workloads(utilities, args.operations)
+            selected = args.methods or list(workloads)
+
+            for name in selected:
+                results[name] = await measure(workloads[name](), 1)
+                results[name].update(await measure_resources(workloads[name]()))
+                print(f"  {name:<16} {results[name]}", file=sys.stderr)
+        finally:
+            await utilities.close()
+
+    return results
+
+
+def start_fake_server(args: argparse.Namespace) -> multiprocessing.Process:
+    settings = FakeFiveMSettings(
+        players=args.players,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        churn=args.churn,
+        seed=args.seed,
+    )
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=run_server, args=(settings, "127.0.0.1", args.port, ready), daemon=True)
+    process.start()
+    if not ready.wait(timeout=10):
+        process.terminate()
+        raise RuntimeError("Fake FiveM server did not start")
+    return process
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark für das AuraCity-FiveM-Monitoring")
+    parser.add_argument("--players", type=int, default=2000, help="Spieler pro Server")
+    parser.add_argument("--servers", type=int, default=1, help="Anzahl simulierter Server")
+    parser.add_argument("--operations", type=int, default=50, help="Polls pro Messung")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latenz des Ersatzservers")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil der Requests mit HTTP 500")
+    parser.add_argument("--churn", type=float, default=0.02, help="Anteil der Spieler, der pro Abruf wechselt")
+    parser.add_argument("--max-concurrent-requests", type=int, default=16)
+    parser.add_argument("--port", type=int, default=30199)
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--repeat", type=int, default=3, help="Anzahl Läufe, berichtet wird der Median")
+    parser.add_argument("--methods", nargs="*", help="Nur diese Messungen ausführen")
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", help="JSON-Datei eines früheren Laufs zum Vergleich")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Erlaubte Abweichung zur Baseline (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+async def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    server = start_fake_server(args)
+
+    try:
+        runs = []
+        for i in range(args.repeat):
+            print(f"Run {i + 1}/{args.repeat} with {args.servers} server(s) x {args.players} players...", file=sys.stderr)
+            runs.append(await run_once(args, args.port))
+    finally:
+        server.terminate()
+        server.join()
+
+    report = {
+        "meta": {
+            "players": args.players,
+            "servers": args.servers,
+            "operations": args.operations,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "churn": args.churn,
+            "max_concurrent_requests": args.max_concurrent_requests,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+        },
+        "results": median_results(runs),
+    }
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline.", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
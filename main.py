@@ -1,3 +1,4 @@
+import signal
 import discord
 import asyncio
 import threading
@@ -10,9 +11,23 @@ class AuraCity(AuraCityBot):
         self.config.DEV_MODE = True
         self.logger = AuraCityLogger(self.__class__.__name__).get_logger()
 
+    def install_signal_handlers(self) -> None:
+        """stop.sh/restart.sh (screen -X quit) und kill beenden den Bot sauber über close()."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGHUP):
+            try:
+                loop.add_signal_handler(sig, self._close_on_signal)
+            except (NotImplementedError, AttributeError):
+                pass  # Windows kennt keine Signal-Handler im Event-Loop (und kein SIGHUP)
+
+    def _close_on_signal(self) -> None:
+        self.logger.info("Received stop signal, shutting down...")
+        self._close_task = asyncio.create_task(self.close())  # Referenz halten, sonst kann der Task verworfen werden
+
     async def start_bot(self):
         try:
             self.load_cogs("base/cogs")
+            self.install_signal_handlers()
             await self.start(self.config.TOKEN)  # Start bot asynchronously
         except discord.LoginFailure:
             token = self.config.TOKEN
@@ -23,6 +38,9 @@ class AuraCity(AuraCityBot):
             else:
                 self.logger.error("No token provided. Please provide a valid token.")
                 return
+        finally:
+            # Auch bei Ctrl+C (Abbruch von main()) Dienste stoppen: Write-Queue flushen, HTTP-Client schließen
+            await self.close()
 
 
 async def main():
@@ -12,11 +12,20 @@ echo -e "${GREEN}INFO${NC}: Attempting to restart the AuraCityBotV2..."
 echo -e "${GREEN}INFO${NC}: Checking for existing AuraCityBotV2 screen session..."
 if screen -list | grep -q "AuraCityBotV2"; then
   echo -e "${GREEN}INFO${NC}: Stopping the AuraCityBotV2 screen session..."
-  screen -S AuraCityBotV2 -X quit
-  # shellcheck disable=SC2181
-  if [ $? -ne 0 ]; then
-    echo -e "${RED}ERROR${NC}: Failed to stop AuraCityBotV2 screen session. Exiting..."
-    exit 1
+  # Ctrl+C lets the bot flush queued database writes; the new instance must not start before the old one exited
+  screen -S AuraCityBotV2 -X stuff "^C"
+  for _ in $(seq 1 30); do
+    screen -list | grep -q "AuraCityBotV2" || break
+    sleep 1
+  done
+  if screen -list | grep -q "AuraCityBotV2"; then
+    echo -e "${YELLOW}WARN${NC}: AuraCityBotV2 did not stop within 30 seconds, closing the screen session..."
+    screen -S AuraCityBotV2 -X quit
+    # shellcheck disable=SC2181
+    if [ $? -ne 0 ]; then
+      echo -e "${RED}ERROR${NC}: Failed to stop AuraCityBotV2 screen session. Exiting..."
+      exit 1
+    fi
   fi
   echo -e "${GREEN}INFO${NC}: AuraCityBotV2 screen session stopped successfully."
 else
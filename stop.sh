@@ -16,11 +16,20 @@ if ! screen -list | grep -q "AuraCityBotV2"; then
 fi
 
 # Stop the AuraCityBotV2 screen session
+# Ctrl+C lets the bot shut down its services (flushes queued database writes) before the session ends
 echo -e "${GREEN}INFO${NC}: Stopping the AuraCityBotV2 screen session..."
-screen -S AuraCityBotV2 -X quit
-if [ $? -ne 0 ]; then
-  echo -e "${RED}ERROR${NC}: Failed to stop AuraCityBotV2 screen session. Exiting..."
-  exit 1
+screen -S AuraCityBotV2 -X stuff "^C"
+for _ in $(seq 1 30); do
+  screen -list | grep -q "AuraCityBotV2" || break
+  sleep 1
+done
+if screen -list | grep -q "AuraCityBotV2"; then
+  echo -e "${YELLOW}WARN${NC}: AuraCityBotV2 did not stop within 30 seconds, closing the screen session..."
+  screen -S AuraCityBotV2 -X quit
+  if [ $? -ne 0 ]; then
+    echo -e "${RED}ERROR${NC}: Failed to stop AuraCityBotV2 screen session. Exiting..."
+    exit 1
+  fi
 fi
 
 echo -e "${GREEN}INFO${NC}: AuraCityBotV2 screen session stopped successfully."